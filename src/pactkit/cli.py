@@ -5,8 +5,10 @@ Usage:
     pactkit init -t /tmp/preview  # Preview to custom directory
     pactkit update                # Re-deploy (same as init, idempotent)
     pactkit version               # Show version
+    pactkit serve                 # Keep skill scripts warm for this project (opt-in)
 """
 import argparse
+from pathlib import Path
 
 from pactkit import __version__
 
@@ -69,6 +71,19 @@ def main():
     # pactkit version
     subparsers.add_parser("version", help="Show PactKit version")
 
+    # pactkit serve
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve skill script calls for this project from a warm process (Unix socket)",
+    )
+    serve_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Exit after this many seconds without a request (default: run until stopped)",
+    )
+    serve_parser.add_argument("--stop", action="store_true", help="Stop the server for this project")
+    serve_parser.add_argument("--status", action="store_true", help="Report whether a server is running")
+
     args = parser.parse_args()
 
     if args.command in ("init", "update", "upgrade"):
@@ -78,6 +93,16 @@ def main():
     elif args.command == "version":
         print(f"PactKit v{__version__}")
 
+    elif args.command == "serve":
+        from pactkit import server
+        if args.stop:
+            print(server.stop())
+        elif args.status:
+            running = server.is_running(".")
+            print(f"✅ Running on {server.socket_path(Path.cwd())}" if running else "⚠️ Not running")
+        else:
+            print(server.serve(".", idle_timeout=args.idle_timeout))
+
     else:
         parser.print_help()
 
@@ -55,6 +55,13 @@ VALID_RULES = frozenset({
 
 VALID_STACKS = frozenset({'auto', 'python', 'node', 'go', 'java'})
 
+# Directory names skipped by `visualize` scans (mirrors DEFAULT_EXCLUDES in skills/visualize.py)
+DEFAULT_VISUALIZE_EXCLUDE = (
+    'venv', '_venv', '.venv', '.env', 'env', '__pycache__', '.git', '.claude',
+    'tests', 'docs', 'node_modules', 'site-packages', 'dist', 'build',
+    'vendor', 'target',
+)
+
 # Commands deprecated in v1.2.0 — converted to skills (STORY-011)
 DEPRECATED_COMMANDS = frozenset({
     'project-trace',
@@ -80,6 +87,7 @@ def get_default_config() -> dict:
         'commands': sorted(VALID_COMMANDS),
         'skills': sorted(VALID_SKILLS),
         'rules': sorted(VALID_RULES),
+        'visualize': {'exclude': sorted(DEFAULT_VISUALIZE_EXCLUDE)},
     }
 
 
@@ -208,6 +216,10 @@ def _rewrite_yaml(path: Path, data: dict) -> None:
             lines.append(f'  - {item}')
         lines.append('')
 
+    visualize = data.get('visualize')
+    if isinstance(visualize, dict):
+        lines.extend(_visualize_yaml_lines(visualize))
+
     # Write exclude section if present
     exclude = data.get('exclude', {})
     if exclude and isinstance(exclude, dict):
@@ -224,6 +236,21 @@ def _rewrite_yaml(path: Path, data: dict) -> None:
     path.write_text('\n'.join(lines), encoding='utf-8')
 
 
+def _visualize_yaml_lines(visualize: dict) -> list[str]:
+    """Render the ``visualize`` section (scan settings for the visualize skill)."""
+    lines = [
+        '# Visualize — directory names skipped when scanning source files',
+        'visualize:',
+    ]
+    exclude = visualize.get('exclude')
+    if isinstance(exclude, list):
+        lines.append('  exclude:')
+        for item in exclude:
+            lines.append(f'    - {item}')
+    lines.append('')
+    return lines
+
+
 # ---------------------------------------------------------------------------
 # Validate config
 # ---------------------------------------------------------------------------
@@ -261,6 +288,13 @@ def validate_config(config: dict) -> None:
             elif name not in valid_set:
                 warnings.warn(f"Unknown {key.rstrip('s')}: {name}")
 
+    # Validate visualize section
+    visualize = config.get('visualize', {})
+    if not isinstance(visualize, dict):
+        warnings.warn(f"Config key 'visualize' should be a mapping, got {type(visualize).__name__}")
+    elif not isinstance(visualize.get('exclude', []), list):
+        warnings.warn("Config key 'visualize.exclude' should be a list of directory names")
+
 
 # ---------------------------------------------------------------------------
 # YAML generation
@@ -299,5 +333,6 @@ def generate_default_yaml() -> str:
     for r in cfg['rules']:
         lines.append(f'  - {r}')
 
-    lines.append('')  # trailing newline
+    lines.append('')
+    lines.extend(_visualize_yaml_lines(cfg['visualize']))
     return '\n'.join(lines)
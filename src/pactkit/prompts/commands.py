@@ -124,8 +124,8 @@ allowed-tools: [Read, Write, Edit, Bash, Glob, Grep]
 ## 🎬 Phase 4: Sync & Document
 1.  **Hygiene**: Delete temp files.
 2.  **Update Reality**:
-    - Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize`
-    - Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize --mode class`
+    - Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize --mode all`
+    - *Note*: `--mode all` parses each file once and writes `code_graph.mmd`, `class_graph.mmd` and `call_graph.mmd` (replaces running `visualize` and `visualize --mode class` back to back).
 3.  **Update Board (CRITICAL)**:
     - Mark the tasks in `docs/product/sprint_board.md` as `[x]`.
     - Use `update_task` or manual edit.
@@ -181,6 +181,7 @@ Apply a code quality checklist to all code related to the Story:
 - **Performance**: N+1 queries, CPU hotspots in hot paths, missing cache, unbounded memory growth
 - **Boundary Conditions**: Null/undefined handling, empty collections, off-by-one, division by zero, numeric overflow
 - **Logic Correctness**: Does the implementation match Spec intent? Are edge cases handled?
+- **Import Structure**: Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py cycles`. A non-zero exit means an import cycle or a violation of `docs/architecture/governance/layers.md` — report each as P1 with the suggested cut.
 
 For each finding, assign a severity (P0-P3). Flag issues that may cause silent failures.
 
@@ -222,7 +223,7 @@ Choose the strategy identified in Phase 0:
 1.  **Run Suite**: Execute the specific test file created above (Story E2E test).
 2.  **Run Unit (Incremental)**: Run only unit tests related to changed modules, not the full suite.
     - **Identify changed modules**: `git diff --name-only HEAD` to list modified source files.
-    - **Map to related tests**: Use `test_map_pattern` in `LANG_PROFILES` to find corresponding test files.
+    - **Map to related tests**: Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py impacted --since HEAD`. It maps every changed file and its transitive importers to test files via `test_map_pattern` in `LANG_PROFILES` and prints a pytest argument list. `ALL` means infrastructure changed.
     - **Run incremental**: Execute only the mapped test files.
     - **Fallback**: If no test mapping can be determined, fall back to full `pytest tests/unit/`.
 3.  **Report**: Output structured verdict:
@@ -276,14 +277,15 @@ allowed-tools: [Read, Write, Edit, Bash, Glob]
     - `rm -rf __pycache__ .pytest_cache`
     - `rm -f .DS_Store *.tmp *.log`
 2.  **Update Reality**:
-    - Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize`
-    - Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize --mode class`
+    - Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize --mode all`
+    - *Note*: `--mode all` parses each file once and writes `code_graph.mmd`, `class_graph.mmd` and `call_graph.mmd` (replaces running `visualize` and `visualize --mode class` back to back).
 
 ## 🎬 Phase 2.5: Regression Gate (MANDATORY)
 > **CRITICAL**: Do NOT skip this step. This is the safety net before commit.
 
 ### Step 1: Impact Analysis
 - Run `git diff --name-only HEAD~1` (or vs. branch base) to list all changed files.
+- Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py impacted --since HEAD~1` (same base) to get the test files covering the changed files and everything that transitively imports them. Output `ALL` means infrastructure files changed → full regression.
 - Check if `docs/architecture/graphs/code_graph.mmd` exists.
 
 ### Step 2: Decision Tree (Safe-by-Default)
@@ -293,7 +295,7 @@ Run **incremental tests** only if ALL of the following conditions are true:
 - `code_graph.mmd` exists AND was updated in the current session (not stale)
 - Changed source files ≤ 3 (small, isolated change set)
 - ALL changed source files have direct test mappings via `test_map_pattern` in `LANG_PROFILES`
-- NO changed file is imported by 3+ other modules in `code_graph.mmd`
+- NO changed file is imported by 3+ other modules — check with `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py query --importers <file>` (answers from `code_graph.json`; do not count edges in `code_graph.mmd` by hand)
 - NO test infrastructure files were changed (`conftest.py`, `pytest.ini`, `pyproject.toml [tool.pytest]`)
 - NO version change in `pactkit.yaml` (version bump implies broader impact)
 
@@ -27,14 +27,15 @@ Generate project code relationship graphs (Mermaid format), supporting three ana
 > **Script location**: Use the base directory from the skill invocation header to resolve script paths. Classic deployment: `~/.claude/skills/pactkit-visualize/scripts/visualize.py`
 
 ## Prerequisites
-- The project must have Python source files (`.py`) to generate meaningful graphs
+- The project must have source files for a supported stack: Python (`.py`), TS/JS (`.ts`, `.tsx`, `.js`, `.jsx`, `.mjs`, `.cjs`), Go (`.go`) or Java (`.java`)
+- Class and call modes analyse Python only; file mode graphs imports across all supported stacks
 - The `docs/architecture/graphs/` directory is automatically created by `init_arch`
 
 ## Command Reference
 
 ### visualize -- Generate code dependency graph
 ```
-python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize [--mode file|class|call] [--entry <func>] [--focus <module>]
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize [--mode file|class|call|all|profile] [--entry <func>]... [--callers] [--max-depth N] [--focus <module>] [--depth N] [--direction in|out|both] [--collapse-depth N] [--shard] [--pstats FILE] [--top N] [--no-cache] [--jobs N|auto] [--stats] [--stats-json PATH]
 ```
 
 | Parameter | Description | Default |
@@ -42,8 +43,110 @@ python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py visualize [--mod
 | `--mode file` | File-level dependency graph (inter-module import relationships) | Default |
 | `--mode class` | Class diagram (including inheritance) | - |
 | `--mode call` | Function-level call graph | - |
-| `--entry <func>` | BFS transitive chain tracing from specified function (requires `--mode call`) | - |
-| `--focus <module>` | Focus on call relationships of specified module (requires `--mode call`) | - |
+| `--mode all` | File, class and call graphs from a single parse of each file | - |
+| `--mode profile` | Call graph weighted by a cProfile run (requires `--pstats`): nodes and edges labelled and colour-banded by cumulative time; dotted edges were seen at runtime but not in the static graph | - |
+| `--entry <func>` | BFS transitive chain tracing from specified function (requires `--mode call`; repeatable) | - |
+| `--callers` | Trace who reaches `--entry` instead of what it calls | - |
+| `--max-depth <N>` | Stop `--entry` tracing after N call hops | unbounded |
+| `--focus <module>` | Restrict the graph to matching files. File and class modes parse only what they render (the import neighbourhood, or the matching files), so focus queries stay fast on large repos | - |
+| `--depth <N>` | With `--focus` in file mode: include modules up to N import hops away | `1` |
+| `--direction <d>` | With `--focus` in file mode: follow imports `out`, importers `in`, or `both` | `both` |
+| `--collapse-depth <N>` | File mode: one node per N-component package prefix (`src/` dropped), edges labelled with summed import counts | - |
+| `--shard` | File mode: also write `shards/<package>.mmd` per package prefix (depth from `--collapse-depth`, default 1) plus `shards/index.mmd` | - |
+| `--pstats <FILE>` | Profile mode: `cProfile`/`pstats` dump, e.g. from `python -m cProfile -o prof.out -m pytest`. Functions are matched by trailing path, name and definition line, so dumps from another checkout map too | - |
+| `--top <N>` | Profile mode: keep only the N heaviest caller-to-callee edges (the hottest paths) | all |
+| `--no-cache` | Re-parse every file and skip the on-disk extraction cache | - |
+| `--stats` | Print phase timings (discovery, read, parse, resolve, render), cache hits/misses, parse failures with paths, graph size and peak RSS. File mode parses import statements only, so use `--mode all` for a full syntax check | - |
+| `--stats-json <PATH>` | Write the same statistics as JSON (`-` for stdout), e.g. to track them in CI | - |
+| `--trace-memory` | Add the `tracemalloc` peak to the statistics. Tracing slows the timed phases several times over, so leave it off when comparing timings | - |
+| `--jobs <N>` | Parse changed files across N worker processes; `auto` stays serial for small repos | `auto` |
+
+Source discovery uses `git ls-files` inside a git work tree; otherwise it walks the tree, pruning excluded and `.gitignore`d directories before entering them. Skipped directory names come from `visualize.exclude` in `pactkit.yaml` (project `.claude/pactkit.yaml`, then `~/.claude/pactkit.yaml`), defaulting to `venv`, `node_modules`, `build`, `dist`, `tests`, `docs` and similar.
+
+Non-Python imports are resolved without extra dependencies: relative TS/JS specifiers (`import`, `export ... from`, `require()`, `import()`) by path, Go import paths against the nearest `go.mod` module path (an edge to every file in the imported package), and Java `import`/`import static`/wildcard imports against each file's `package` declaration. Bare npm packages, the standard library and third-party modules are left out of the graph.
+
+Extracted imports, classes and call edges are cached per file in `.claude/pactkit_cache/visualize.json` (keyed on path, mtime, size and content hash), so re-runs only re-parse changed files.
+
+If the user runs `pactkit serve` in the project root, every command here (except `watch`, `flame` and `importtime`) is transparently answered by that warm process, which keeps the cache in memory. Nothing changes in how the script is called.
+
+### query -- Answer dependency questions from code_graph.json
+```
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py query --importers <module>
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py query --imports <module>
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py query --fan-in-top <N>
+```
+- Reads `docs/architecture/graphs/code_graph.json` (written next to `code_graph.mmd` by file mode); never re-parses sources
+- `<module>` matches a path (`src/pkg/a.py`), dotted module (`pkg.a`) or path fragment
+- `--importers` / `--imports` print one path per line; `--fan-in-top` prints `path | fan_in`
+
+### impacted -- Select tests affected by a change
+```
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py impacted --since <rev>
+```
+- Takes changed and untracked files from `git diff --name-only <rev>`, walks the reverse-import closure, and maps every file in it to tests via `test_map_pattern`
+- Prints a space-separated pytest argument list (empty when nothing maps), or `ALL` when infrastructure files (`conftest.py`, `pyproject.toml`, `requirements*.txt`, ...) changed; exits 1 with a `❌` line when `git diff` fails (e.g. an unknown `--since`)
+- Errs towards selecting more: a changed module also seeds its packages' `__init__.py` (for `from pkg import mod`), and a deleted Python module seeds every file that imports it by name; a deleted non-Python source prints `ALL`
+
+### diff -- Compare architecture snapshots
+```
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py diff <versionA> [<versionB>|current]
+```
+- Loads `docs/architecture/snapshots/{version}_code_graph.json` (or the `.mmd` when no JSON twin exists), plus the class and call snapshots
+- Reports added/removed modules, import edges, classes, inheritance and call edges, and per-module fan-in changes; Mermaid line order is irrelevant
+- `current` (the default for `versionB`) compares against the live graphs in `docs/architecture/graphs/`
+
+### cycles -- Import cycles and layer order
+```
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py cycles
+```
+- Runs Tarjan's SCC algorithm over the import graph (linear time) and lists every cycle with its member files
+- `Suggested cut` lists DFS back edges inside the cycle (fewest imports first); removing them breaks it
+- Optional `docs/architecture/governance/layers.md`: one list item per layer, top layer first, e.g. `- ui: src/app/ui/*` then `- core: src/app/core/*, src/app/util.py`. A file may import its own layer or layers listed below it
+- Exits 1 when any cycle or layer violation is found, so it can gate a check
+
+### flame -- Folded stacks and an offline flamegraph
+```
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py flame -- -m pytest tests/unit -q
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py flame --pstats prof.out
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py flame --folded stacks.folded
+```
+- Takes exactly one source. `-- <python args>` runs the command (a script or `-m module`; a leading `python` and bare `pytest` are accepted) in a child interpreter under `sys.setprofile` and records exact stacks, including threads and C calls
+- `--pstats` rebuilds stacks from a `cProfile` dump. pstats only keeps caller-to-callee totals, so time is split among callers in proportion to their calls (the gprof approximation); recursion is cut and branches under 0.1% are folded into their parent
+- Writes `flame.folded` (one `frame;frame;... microseconds` line per stack, usable by other flamegraph tools) and `flame.svg` (self-contained, hover a frame for its time); no external tools are needed
+- A nonzero exit from the traced command is reported with a warning; the stacks cover the run up to that point
+
+### importtime -- What a command spends on imports
+```
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py importtime [--top N] [--no-cache] -- <command>
+```
+- Runs `<command>` with `PYTHONPROFILEIMPORTTIME=1` (the environment form of `python -X importtime`, so console scripts such as `pactkit --help` work too); `-m module`, `-c code` and `script.py` run under the current interpreter
+- Parses the import tree from stderr and joins self and cumulative times onto the file graph nodes. Each import's cost is charged to the module that triggered it first. Unscanned submodules count towards their package, and third-party or stdlib packages collapse into one `(ext)` node with everything they import
+- Writes `importtime_graph.mmd` (nodes and edges colour-banded by share of total import time; dotted edges are runtime imports missing from the static graph, e.g. submodules loaded by a package) and `importtime.md`, a ranked table of the N most expensive import edges, which is also printed. The top rows are the candidates for lazy imports
+- A nonzero exit is reported with a warning; timings cover the imports up to that point
+
+### index / find-def / find-refs / callers -- Symbol lookups from a SQLite index
+```
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py index [--no-cache] [--jobs N|auto]
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py find-def <name>
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py find-refs <name>
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py callers <name> [--depth N]
+```
+- `index` keeps modules, classes, functions and methods (with line spans), imports and call sites in `.claude/pactkit_cache/index.sqlite` (stdlib `sqlite3`). Only files whose mtime or size changed are re-indexed, and unchanged content is taken from the extraction cache
+- The queries refresh the index first, which is one `stat` per file when nothing changed, then answer from indexed columns
+- `<name>` is a bare or dotted name: `login`, `Auth.login`, `auth.Auth.login` or a module such as `app.auth`
+- `find-def` prints `path:start-end  kind qualified.name` (modules as `path  module name`)
+- `find-refs` prints every call site whose callee ends with the name (`path:line  caller -> callee`, including `obj.login()`), plus files that import it
+- `callers` resolves call sites the same way as `--mode call --callers` and prints `path:line  caller -> function`. `--depth N` adds callers of callers, indented by hop
+- Python only for symbols and calls; other stacks contribute modules and imports
+
+### watch -- Keep graphs live during a session
+```
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py watch [--mode file|class|call|all] [--interval 0.3] &
+python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py watch --stop
+```
+- Polls file mtimes (no extra dependencies), keeps extracted facts in memory and re-parses only touched files
+- Rewrites only the `.mmd` files whose content changed
+- Stops when `.claude/pactkit_cache/visualize_watch.pid` is removed (`watch --stop` removes it)
 
 ### init_arch -- Initialize architecture directory
 ```
@@ -62,16 +165,26 @@ python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py list_rules
 
 | Mode | Output Path | Mermaid Type |
 |------|-------------|-------------|
-| `--mode file` | `docs/architecture/graphs/code_graph.mmd` | graph TD |
+| `--mode file` | `docs/architecture/graphs/code_graph.mmd` (+ `code_graph.json`) | graph TD |
 | `--mode class` | `docs/architecture/graphs/class_graph.mmd` | classDiagram |
 | `--mode call` | `docs/architecture/graphs/call_graph.mmd` | graph TD |
+| `--mode all` | `code_graph.mmd` + `class_graph.mmd` + `call_graph.mmd` | (all three) |
+| `--mode profile` | `docs/architecture/graphs/profile_graph.mmd` | graph TD |
 | `--focus` | `docs/architecture/graphs/focus_graph.mmd` | graph TD |
+| `flame` | `docs/architecture/graphs/flame.folded` + `flame.svg` | folded stacks / SVG |
+| `importtime` | `docs/architecture/graphs/importtime_graph.mmd` + `importtime.md` | graph TD + table |
+| `index` | `.claude/pactkit_cache/index.sqlite` | SQLite (queried by `find-def`, `find-refs`, `callers`) |
+| `--shard` | `docs/architecture/graphs/shards/index.mmd` + one `.mmd` per package | graph TD |
+
+For large repos, read `shards/index.mmd` (or `code_graph.mmd` written with `--collapse-depth`) first and open only the package shards you need. `code_graph.json` always stays file-level.
 
 ## Usage Scenarios
 - `/project-plan`: Run `visualize` to understand current project state before making design decisions
 - `/project-act`: Run `visualize --focus <module>` to understand dependencies of the modification target
 - `/project-doctor`: Run `visualize` to check whether architecture graphs can be generated correctly
-- `/project-trace`: Run `visualize --mode call --entry <func>` to trace call chains
+- `/project-trace`: Run `find-def <func>` / `callers <func>` for exact locations, then `visualize --mode call --entry <func>` to trace call chains; add `--callers --max-depth 3` to find who reaches a function
+- Performance work: profile the slow path (`python -m cProfile -o prof.out ...`), then `visualize --mode profile --pstats prof.out --top 20` to see where the time goes, or `flame -- -m pytest <tests>` for a flamegraph of the run
+- Slow startup: `visualize importtime -- <cli> --help` ranks the import edges that dominate startup; make the top ones lazy
 """
 
 SKILL_BOARD_MD = """---
@@ -128,7 +241,7 @@ python3 ~/.claude/skills/pactkit-board/scripts/board.py update_version 1.0.0
 ```
 python3 ~/.claude/skills/pactkit-board/scripts/board.py snapshot "v1.0.0"
 ```
-- Saves current architecture graphs to `docs/architecture/snapshots/{version}_*.mmd`
+- Saves current architecture graphs to `docs/architecture/snapshots/{version}_*.mmd`, plus `code_graph.json` when present
 
 ### fix_board -- Relocate misplaced stories to correct sections
 ```
@@ -234,7 +347,11 @@ Deep code analysis and execution path tracing via static analysis.
 ## Protocol
 
 ### 1. Feature Discovery
-- Use `Grep` to locate entry points (API route, CLI arg, Event handler).
+- Locate symbols with the index (the `pactkit-visualize` script, `~/.claude/skills/pactkit-visualize/scripts/visualize.py`). Each query refreshes `.claude/pactkit_cache/index.sqlite` incrementally first:
+  - `find-def <name>`: `path:start-end` of the function, method, class or module (`login`, `Auth.login`, `app.auth`)
+  - `find-refs <name>`: call sites and importing files
+  - `callers <name> [--depth N]`: functions whose calls resolve to it
+- Use `Grep` only for what the index does not hold: string literals, config keys, routes, non-Python symbols.
 - Map core files involved — don't read everything yet.
 
 ### 2. Call Graph Analysis
@@ -242,6 +359,7 @@ Deep code analysis and execution path tracing via static analysis.
 - Read `docs/architecture/graphs/call_graph.mmd` to see all reachable functions.
 
 ### 3. Deep Tracing
+- Read only the line spans that `find-def` reports instead of whole files.
 - Follow call chain file by file, recording data transformations.
 - Note how data structures change (e.g., `dict` -> `UserObj` -> `JSON`).
 
@@ -450,6 +568,7 @@ Version release management — update versions, snapshot architecture, create Gi
 - Run `visualize` (all three modes: file, class, call).
 - Run `snapshot "$VERSION"` via pactkit-board skill.
 - Result: graphs saved to `docs/architecture/snapshots/{version}_*.mmd`.
+- Review the architectural delta: `visualize diff <previous version> $VERSION` via pactkit-visualize skill.
 
 ### 3. Git Operations
 - Run `archive` via pactkit-board skill.
@@ -621,7 +621,7 @@ allowed-tools: [Read, Write, Edit, Bash, Glob, Grep]
 ## ✅ Phase 2: Verify
 1.  **Run Tests (Incremental)**: Run only tests related to changed modules to confirm no existing functionality is broken.
     - **Identify changed modules**: `git diff --name-only HEAD` to list modified source files.
-    - **Map to related tests**: Use `test_map_pattern` in `LANG_PROFILES` to find corresponding test files.
+    - **Map to related tests**: Run `python3 ~/.claude/skills/pactkit-visualize/scripts/visualize.py impacted --since HEAD` (uses `test_map_pattern` in `LANG_PROFILES` plus transitive importers; `ALL` means run everything).
     - **Run incremental**: Execute only the mapped test files (e.g., `pytest tests/unit/test_foo.py -q`).
     - **Fallback**: If no mapping can be determined, fall back to the full test suite (`pytest tests/ -q`).
 2.  **On Failure**: If tests fail:
@@ -0,0 +1,211 @@
+"""PactKit serve — a long-lived local server for the skill scripts.
+
+``pactkit serve`` listens on a Unix domain socket named after the project
+directory. The deployed ``board.py``, ``visualize.py`` and ``scaffold.py``
+scripts check for that socket on start-up (see ``_serve_forward`` in
+``pactkit.skills._SHARED_HEADER``). When it is there, they send their argv and
+print the reply instead of running in-process. Each script is loaded once, so
+module-level state such as the visualize extraction cache stays in memory
+between calls.
+
+Requests are handled one at a time. That keeps ``os.chdir``/``sys.argv``
+swapping safe and gives the same write ordering as sequential CLI calls.
+"""
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import stat
+import sys
+import traceback
+from pathlib import Path
+
+from pactkit.skills import load_script
+
+SCRIPTS = ('board', 'visualize', 'scaffold')
+
+# Commands that stay in-process: long-running, or they hand the terminal to child processes.
+NOT_FORWARDED = {
+    'visualize': frozenset({'watch', 'flame', 'importtime'}),
+    'scaffold': frozenset({'git_start'}),
+}
+
+
+def socket_path(root: Path | str) -> Path:
+    """Socket for *root*; must match the path computed by ``_serve_forward``."""
+    name = f'pactkit-{os.getuid()}-{hashlib.sha1(str(root).encode()).hexdigest()[:12]}.sock'
+    return Path(os.environ.get('XDG_RUNTIME_DIR') or '/tmp') / name
+
+
+def _owned_socket(path: Path) -> bool | None:
+    """None when *path* is absent; otherwise whether it is a socket owned by this user.
+
+    Clients and the server both refuse anything else, so another user who pre-creates the
+    name in a shared ``/tmp`` can neither answer for us nor get a file of theirs unlinked.
+    """
+    try:
+        st = path.lstat()
+    except FileNotFoundError:
+        return None
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def _is_main_block(node: ast.stmt) -> bool:
+    return (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name) and node.test.left.id == '__name__'
+            and isinstance(node.test.comparators[0], ast.Constant)
+            and node.test.comparators[0].value == '__main__')
+
+
+class _Script:
+    """One skill script: module body executed once, CLI block compiled for reuse."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.source = load_script(f'{name}.py')
+        self.digest = hashlib.sha1(self.source.encode('utf-8')).hexdigest()
+        tree = ast.parse(self.source)
+        main = [node for node in tree.body if _is_main_block(node)]
+        body = [node for node in tree.body if not _is_main_block(node)]
+        filename = f'<pactkit serve: {name}.py>'
+        self.namespace = {'__name__': f'pactkit_serve_{name}', '__file__': filename}
+        exec(compile(ast.Module(body=body, type_ignores=[]), filename, 'exec'), self.namespace)
+        self.cli = compile(ast.Module(body=main[-1].body, type_ignores=[]), filename, 'exec')
+
+    def run(self, argv: list[str], cwd: str) -> dict:
+        """Run the CLI block as ``python <name>.py *argv`` in *cwd* and capture its output."""
+        out, err = io.StringIO(), io.StringIO()
+        saved_argv, saved_cwd = sys.argv, os.getcwd()
+        code = 0
+        try:
+            os.chdir(cwd)
+            sys.argv = [f'{self.name}.py', *argv]
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    exec(self.cli, self.namespace)
+                except SystemExit as ex:
+                    if isinstance(ex.code, int) or ex.code is None:
+                        code = ex.code or 0
+                    else:
+                        print(ex.code, file=sys.stderr)
+                        code = 1
+                except Exception:
+                    traceback.print_exc()
+                    code = 1
+        finally:
+            sys.argv = saved_argv
+            os.chdir(saved_cwd)
+        return {'stdout': out.getvalue(), 'stderr': err.getvalue(), 'code': code}
+
+
+# ---------------------------------------------------------------------------
+# Server loop
+# ---------------------------------------------------------------------------
+
+def _handle(request: dict, root: Path, scripts: dict) -> dict:
+    """Reply to one request; ``{'fallback': True}`` tells the client to run in-process."""
+    name = request.get('script')
+    argv = request.get('argv') or []
+    if name not in SCRIPTS or request.get('cwd') != str(root):
+        return {'fallback': True}
+    if argv and argv[0] in NOT_FORWARDED.get(name, ()):
+        return {'fallback': True}
+    if name not in scripts:
+        scripts[name] = _Script(name)
+    script = scripts[name]
+    if request.get('digest') != script.digest:
+        return {'fallback': True}  # deployed script is from another PactKit version
+    return script.run(argv, str(root))
+
+
+def _recv_all(conn: socket.socket) -> bytes:
+    return b''.join(iter(lambda: conn.recv(65536), b''))
+
+
+def _request(path: Path, payload: dict, timeout: float | None = None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(path))
+        s.sendall(json.dumps(payload).encode())
+        s.shutdown(socket.SHUT_WR)
+        return json.loads(_recv_all(s))
+
+
+def is_running(root: Path | str) -> bool:
+    """True when a server answers on the socket for *root*."""
+    path = socket_path(Path(root).resolve())
+    if not _owned_socket(path):
+        return False
+    try:
+        return _request(path, {'op': 'ping'}, timeout=2).get('ok', False)
+    except (OSError, ValueError):
+        return False
+
+
+def stop(root: Path | str = '.') -> str:
+    """Ask the server for *root* to exit."""
+    path = socket_path(Path(root).resolve())
+    try:
+        if not _owned_socket(path):
+            raise OSError(path)
+        _request(path, {'op': 'stop'}, timeout=5)
+    except (OSError, ValueError):
+        return '⚠️ No pactkit serve running for this directory'
+    return '✅ pactkit serve stopped'
+
+
+def serve(root: Path | str = '.', idle_timeout: float | None = None, ready=None) -> str:
+    """Serve script requests for *root* until stopped, interrupted or idle for *idle_timeout* seconds.
+
+    *ready*, if given, is called once the socket accepts connections.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return '❌ pactkit serve needs Unix domain sockets'
+    root = Path(root).resolve()
+    path = socket_path(root)
+    owned = _owned_socket(path)
+    if owned is False:
+        return f'❌ {path} exists but is not a socket owned by you; remove it or set XDG_RUNTIME_DIR'
+    if owned:
+        if is_running(root):
+            return f'⚠️ pactkit serve already running for {root} ({path})'
+        path.unlink()  # stale socket from a server that did not exit cleanly
+    scripts = {}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as srv:
+        srv.bind(str(path))
+        try:
+            os.chmod(path, 0o600)
+            srv.listen(16)
+            srv.settimeout(idle_timeout)
+            print(f'✅ pactkit serve: {root} on {path}', flush=True)
+            if ready:
+                ready()
+            while True:
+                try:
+                    conn, _ = srv.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    conn.settimeout(30)
+                    try:
+                        request = json.loads(_recv_all(conn))
+                    except (OSError, ValueError):
+                        continue
+                    if request.get('op') == 'ping':
+                        reply = {'ok': True, 'root': str(root)}
+                    elif request.get('op') == 'stop':
+                        conn.sendall(json.dumps({'ok': True}).encode())
+                        break
+                    else:
+                        reply = _handle(request, root, scripts)
+                    with contextlib.suppress(OSError):
+                        conn.sendall(json.dumps(reply).encode())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(OSError):
+                path.unlink()
+    return '✅ pactkit serve stopped'
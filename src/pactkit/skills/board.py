@@ -181,6 +181,8 @@ def snapshot_graph(version):
         if src.exists():
             shutil.copy2(src, snap_dir / f'{version}_{name}')
             count += 1
+    twin = graphs_dir / 'code_graph.json'  # lets `visualize diff` skip Mermaid parsing
+    if twin.exists(): shutil.copy2(twin, snap_dir / f'{version}_code_graph.json')
     return f'✅ Snapshot {version}: {count} graphs saved'
 
 # --- LIST ---
@@ -2,7 +2,16 @@
 """Standalone version for IDE support. Deployed with _SHARED_HEADER."""
 import argparse
 import ast
+import bisect
+import hashlib
+import json
 import os
+import re
+import subprocess
+import sys
+import time
+from array import array
+from collections import deque
 from pathlib import Path
 
 
@@ -23,17 +32,127 @@ def init_architecture():
     return '✅ Init: Structure Complete'
 
 # --- SCAN HELPERS (shared across modes) ---
-def _scan_files(root):
-    excludes = {'venv', '_venv', '.venv', '.env', 'env', '__pycache__', '.git', '.claude', 'tests', 'docs', 'node_modules', 'site-packages', 'dist', 'build'}
+# Directory names never scanned; override with `visualize: exclude:` in pactkit.yaml
+DEFAULT_EXCLUDES = ('venv', '_venv', '.venv', '.env', 'env', '__pycache__', '.git', '.claude', 'tests', 'docs', 'node_modules', 'site-packages', 'dist', 'build',
+                    'vendor', 'target')
+# Source suffix -> stack; stacks and primary suffixes mirror file_ext in LANG_PROFILES
+_LANG_BY_SUFFIX = {'.py': 'python', '.ts': 'node', '.tsx': 'node', '.mts': 'node', '.cts': 'node', '.js': 'node', '.jsx': 'node',
+                   '.mjs': 'node', '.cjs': 'node', '.go': 'go', '.java': 'java'}
+_SOURCE_SUFFIXES = tuple(_LANG_BY_SUFFIX)
+
+def _config_excludes(root):
+    # visualize.exclude from pactkit.yaml (project .claude/ first, then ~/.claude/).
+    # Parsed with regexes so the deployed script keeps working without PyYAML.
+    for path in (root / '.claude' / 'pactkit.yaml', Path.home() / '.claude' / 'pactkit.yaml'):
+        try: text = path.read_text(encoding='utf-8')
+        except OSError: continue
+        text = re.sub(r'[ \t]+#.*', '', re.sub(r'^[ \t]*#.*\n?', '', text, flags=re.M))  # YAML comments: line and inline
+        block = re.search(r'^visualize:[ \t]*\n((?:[ \t]+\S.*\n?|[ \t]*\n)*)', text, re.M)
+        if not block: continue
+        m = re.search(r'^([ \t]+)exclude:[ \t]*(\[.*\])?[ \t]*\n?((?:\1[ \t]*- .*\n?)*)', block.group(1), re.M)
+        if not m: continue
+        raw = m.group(2)[1:-1].split(',') if m.group(2) else [ln.split('-', 1)[1] for ln in m.group(3).splitlines() if ln.strip()]
+        return {item.strip().strip('\'"') for item in raw if item.strip()}
+    return None
+
+def _git_files(root, suffixes):
+    # Fast path: let git list tracked + untracked-but-not-ignored files. None outside a work tree.
+    globs = [f'*{suffix}' for suffix in suffixes]
+    try:
+        out = subprocess.run(['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard', '--', *globs],
+                             cwd=root, capture_output=True)
+    except OSError: return None
+    if out.returncode != 0: return None
+    rels = sorted(set(out.stdout.decode('utf-8', 'surrogateescape').split('\0')) - {''})
+    return [root / rel for rel in rels if (root / rel).is_file()]  # --cached still lists deleted files
+
+def _gitignore_regex(pattern):
+    # gitignore glob -> regex: * and ? stop at '/', **/ and /** cross directories, [...] passes through
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**/', i): out.append('(?:.*/)?'); i += 3; continue
+        if pattern.startswith('**', i): out.append('.*'); i += 2; continue
+        if c == '*': out.append('[^/]*')
+        elif c == '?': out.append('[^/]')
+        elif c == '\\' and i + 1 < n: out.append(re.escape(pattern[i + 1])); i += 1
+        elif c == '[':
+            k = i + 2 if pattern[i + 1:i + 2] in ('!', '^') else i + 1
+            j = pattern.find(']', k + 1)  # a ']' right after '[' or '[!' is literal
+            if j < 0: out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j].replace('\\', '\\\\')
+                out.append('[' + ('^' + body[1:] if body[:1] in ('!', '^') else body) + ']')
+                i = j
+        else: out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+def _gitignore_rules(d, rel_dir):
+    # [(compiled regex, anchored, dir_only, negated)] from d/.gitignore. Anchored patterns (a '/' anywhere
+    # but at the end) match the root-relative path, the rest match the bare name at any depth below d.
+    rules = []
+    try: lines = (d / '.gitignore').read_text(encoding='utf-8').splitlines()
+    except OSError: return rules
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'): continue
+        negated = line.startswith('!')
+        if negated: line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if line.startswith('**/') and '/' not in line[3:]: line = line[3:]
+        anchored = '/' in line
+        regex = _gitignore_regex(line.lstrip('/'))
+        if anchored and rel_dir: regex = re.escape(rel_dir + '/') + regex
+        rules.append((re.compile(regex, re.S), anchored, dir_only, negated))
+    return rules
+
+def _is_ignored(rel, name, is_dir, rules):
+    ignored = False
+    for regex, anchored, dir_only, negated in rules:
+        if dir_only and not is_dir: continue
+        if regex.fullmatch(rel if anchored else name): ignored = not negated
+    return ignored
+
+def _walk_files(root, excludes, suffixes):
+    # os.walk that prunes excluded and .gitignored directories before descending into them.
+    found = []  # (rel, path)
+    rules_by_dir = {root: _gitignore_rules(root, '')}
+    for dirpath, dirnames, filenames in os.walk(root):
+        d = Path(dirpath)
+        rules = rules_by_dir.pop(d, [])
+        rel_dir = '' if d == root else d.relative_to(root).as_posix()
+        keep = []
+        for name in sorted(dirnames):
+            rel = f'{rel_dir}/{name}' if rel_dir else name
+            if name in excludes or _is_ignored(rel, name, True, rules): continue
+            keep.append(name)
+            rules_by_dir[d / name] = rules + _gitignore_rules(d / name, rel)
+        dirnames[:] = keep
+        for name in sorted(filenames):
+            if not name.endswith(suffixes): continue
+            rel = f'{rel_dir}/{name}' if rel_dir else name
+            if not _is_ignored(rel, name, False, rules): found.append((rel, d / name))
+    return [p for _, p in sorted(found)]  # same order as the git fast path
+
+def _discover_files(root, excludes=None, suffixes=_SOURCE_SUFFIXES):
+    if excludes is None: excludes = _config_excludes(root)
+    if excludes is None: excludes = set(DEFAULT_EXCLUDES)
+    files = _git_files(root, suffixes)
+    if files is None: return _walk_files(root, excludes, suffixes)
+    return [p for p in files if not any(part in excludes for part in p.relative_to(root).parts[:-1])]
+
+def _scan_files(root, excludes=None):
     all_files = []
     module_index = {}
     file_to_node = {}
 
-    for p in root.rglob('*.py'):
-        if any(part in excludes for part in p.parts): continue
+    for p in _discover_files(root, excludes):
         all_files.append(p)
         node_id = str(p.relative_to(root)).replace(os.sep, '_').replace('.', '_').replace('-', '_')
         file_to_node[p] = node_id
+        if p.suffix != '.py': continue  # other stacks resolve by path/package in _build_import_graph
         try:
             rel_path = p.relative_to(root)
             module_name = str(rel_path.with_suffix('')).replace(os.sep, '.')
@@ -50,83 +169,680 @@ def _scan_files(root):
         except: pass
     return all_files, module_index, file_to_node
 
-# --- MODE: FILE (original, v19.7) ---
-def _build_file_graph(root, all_files, module_index, file_to_node, focus):
-    nodes = []
-    edges = []
-    for f in all_files:
-        nid = file_to_node[f]
-        rel_str = str(f.relative_to(root))
-        nodes.append(f'    {nid}["{f.name}"]')
-        nodes.append(f'    click {nid} href "{rel_str}"')
-    for p in all_files:
-        consumer_id = file_to_node[p]
+# --- EXTRACTION (per-file facts, shared across modes) ---
+def _extract_source(source):
+    # Parse once and collect everything the graph modes need from one file.
+    try: tree = ast.parse(source)
+    except Exception as e:  # reported by --stats; the file still appears as a node
+        return {'imports': [], 'classes': [], 'funcs': [], 'error': f'{type(e).__name__}: {e}'}
+    v = _FactsVisitor()
+    v.visit(tree)
+    return {'imports': v.imports, 'classes': v.classes, 'funcs': v.funcs}
+
+class _FactsVisitor(ast.NodeVisitor):
+    # One depth-first pass per module, so every node is visited once and facts come out in source order.
+    # classes: [name, bases, methods, line, end line]; funcs: [qualified name, callees, line, callee lines,
+    # end line] for every function, method and nested function (Outer.method.helper). Each call goes to its innermost
+    # function; decorators and defaults belong to the enclosing scope, module-level calls to none. A bare call to a
+    # function nested in an enclosing function is recorded under its qualified name (helper() -> Outer.helper).
+    _dispatch = {}  # {node class: visit method}, shared by all instances
+
+    def __init__(self):
+        self.imports, self.classes, self.funcs = [], [], []
+        self.scope = []  # [(name, is_class)] from the module down
+        self.func = None  # funcs entry receiving calls
+        self.local_defs = []  # [(qualified function name, names of functions defined in its body)]
+
+    def visit(self, node):
+        # NodeVisitor.visit without the per-node getattr; generic_visit below skips iter_fields
+        method = self._dispatch.get(node.__class__)
+        if method is None:
+            method = getattr(type(self), 'visit_' + node.__class__.__name__, type(self).generic_visit)
+            self._dispatch[node.__class__] = method
+        return method(self, node)
+
+    def generic_visit(self, node):
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST): self.visit(item)
+            elif isinstance(value, ast.AST): self.visit(value)
+
+    def visit_Import(self, node):
+        self.imports.extend(name.name for name in node.names)
+
+    def visit_ImportFrom(self, node):
+        if node.module: self.imports.append(node.module)
+
+    def visit_ClassDef(self, node):
+        bases = [b.id if isinstance(b, ast.Name) else b.attr for b in node.bases if isinstance(b, (ast.Name, ast.Attribute))]
+        methods = []
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                prefix = '+' if not item.name.startswith('_') else '-'
+                args = [a.arg for a in item.args.args if a.arg != 'self']
+                methods.append(f"{prefix}{item.name}({', '.join(args)})")
+        self.classes.append([node.name, bases, methods, node.lineno, node.end_lineno])
+        for child in node.decorator_list + node.bases + node.keywords: self.visit(child)
+        self._visit_body(node, (node.name, True), self.func)
+
+    def visit_FunctionDef(self, node):
+        for child in node.decorator_list: self.visit(child)
+        self.visit(node.args)
+        if node.returns: self.visit(node.returns)
+        entry = [_qualified(self.scope, node.name), [], node.lineno, [], node.end_lineno]
+        self.funcs.append(entry)
+        self.local_defs.append((entry[0], _local_defs(node.body)))
+        self._visit_body(node, (node.name, False), entry)
+        self.local_defs.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _visit_body(self, node, scope, func):
+        outer = self.func
+        self.scope.append(scope)
+        self.func = func
+        for child in node.body: self.visit(child)
+        self.func = outer
+        self.scope.pop()
+
+    def visit_Call(self, node):
+        if self.func is not None:
+            callee = _callee_name(node.func, self.scope)
+            if isinstance(node.func, ast.Name):
+                callee = next((f'{q}.{callee}' for q, names in reversed(self.local_defs) if callee in names), callee)
+            if callee:
+                self.func[1].append(callee)
+                self.func[3].append(node.lineno)
+        self.generic_visit(node)
+
+def _qualified(scope, name): return '.'.join([n for n, _ in scope] + [name])
+
+def _local_defs(body):
+    # Functions a function body defines for itself, including under if/for/with/try/match; not inside classes
+    names, todo = set(), list(body)
+    while todo:
+        node = todo.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)): names.add(node.name)
+        elif not isinstance(node, ast.ClassDef):
+            todo.extend(c for c in ast.iter_child_nodes(node) if isinstance(c, (ast.stmt, ast.excepthandler, ast.match_case)))
+    return names
+
+def _callee_name(func, scope):
+    # f() -> f, obj.f() -> obj.f, self.f() -> EnclosingClass.f
+    if isinstance(func, ast.Name): return func.id
+    if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)): return None
+    if func.value.id == 'self':
+        cls = next((n for n, is_class in reversed(scope) if is_class), None)
+        if cls: return f'{cls}.{func.attr}'
+    return f'{func.value.id}.{func.attr}'
+
+# File mode only needs imports: find import statements by line, parse just those, and fall back to
+# _extract_source whenever the text is ambiguous. Strings and comments are lexed first so an
+# `import x` line inside a docstring is never taken for code.
+_PY_IMPORT_LINE_RE = re.compile(r'^[ \t]*(?:import|from)\b', re.M)
+_PY_INLINE_IMPORT_RE = re.compile(r'[;:][ \t]*(?:import|from)\b')  # `try: import x`, `a = 1; import b`
+_PY_LITERAL_RE = re.compile(r'#[^\n]*|"""(?:\\[\s\S]|[^\\])*?"""|' r"'''(?:\\[\s\S]|[^\\])*?'''|" r'"(?:\\[\s\S]|[^"\\\n])*"|' r"'(?:\\[\s\S]|[^'\\\n])*'")
+
+def _extract_imports(source):
+    # Same imports, in the same order, as _extract_source(source)['imports'] for any file that parses.
+    # Facts are marked imports_only so class and call modes re-parse them.
+    if 'import' not in source: return {'imports': [], 'classes': [], 'funcs': [], 'imports_only': True}
+    literals = [m.span() for m in _PY_LITERAL_RE.finditer(source)]
+    starts = [a for a, _ in literals]
+    def in_literal(pos):
+        k = bisect.bisect_right(starts, pos) - 1
+        return k >= 0 and pos < literals[k][1]
+    if any(not in_literal(m.start()) for m in _PY_INLINE_IMPORT_RE.finditer(source)): return _extract_source(source)
+    imports = []
+    for m in _PY_IMPORT_LINE_RE.finditer(source):
+        if in_literal(m.end() - 1): continue
+        end = source.find(nl(), m.end())
+        if end < 0: end = len(source)
+        stmt = source[m.start():end]
+        while end < len(source) and (stmt.rstrip().endswith('\\') or stmt.count('(') > stmt.count(')')):
+            end = source.find(nl(), end + 1)
+            if end < 0: end = len(source)
+            stmt = source[m.start():end]
+        try: body = ast.parse(stmt.strip()).body
+        except SyntaxError: return _extract_source(source)
+        if not body or not all(isinstance(n, (ast.Import, ast.ImportFrom)) for n in body): return _extract_source(source)
+        for n in body:
+            if isinstance(n, ast.Import): imports.extend(name.name for name in n.names)
+            elif n.module: imports.append(n.module)
+    return {'imports': imports, 'classes': [], 'funcs': [], 'imports_only': True}
+
+# Regex extractors for the other LANG_PROFILES stacks: imports only, no parser dependencies.
+# String literals are matched first so `//` and `/*` inside them are kept; comments become blank lines.
+_C_COMMENT_RE = re.compile(r'''("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`[^`]*`)|/\*[\s\S]*?\*/|//[^\n]*''')
+_JS_IMPORT_RE = re.compile(r'''(?:^|[^\w$.])(?:import|export)\s+(?:[\w$*{}\s,]+?\s+from\s*)?['"]([^'"\n]+)['"]''', re.M)
+_JS_REQUIRE_RE = re.compile(r'''(?:^|[^\w$.'"`])(?:require|import)\s*\(\s*['"]([^'"\n]+)['"]\s*\)''')
+_GO_IMPORT_RE = re.compile(r'^import\s*(?:\(([^)]*)\)|((?:[\w.]+\s+)?"[^"\n]+"))', re.M)
+_GO_PATH_RE = re.compile(r'"([^"\n]+)"')
+_JAVA_PACKAGE_RE = re.compile(r'^[ \t]*package\s+([\w.]+)\s*;', re.M)
+_JAVA_IMPORT_RE = re.compile(r'^[ \t]*import\s+(?:static\s+)?([\w.]+(?:\.\*)?)\s*;', re.M)
+
+def _strip_c_comments(source):
+    # JS/TS and Go: drop // and /* */ comments outside string literals, keeping line breaks
+    return _C_COMMENT_RE.sub(lambda m: m.group(1) or nl() * m.group(0).count(nl()), source)
+
+def _extract_js(source):
+    # ES import/export-from, require() and dynamic import(); specifiers are resolved later by path.
+    source = _strip_c_comments(source)
+    imports = _JS_IMPORT_RE.findall(source) + _JS_REQUIRE_RE.findall(source)
+    return {'imports': list(dict.fromkeys(imports)), 'classes': [], 'funcs': []}
+
+def _extract_go(source):
+    imports = []
+    for block, single in _GO_IMPORT_RE.findall(_strip_c_comments(source)):  # `// f()` must not close the block
+        imports.extend(_GO_PATH_RE.findall(block or single))
+    return {'imports': imports, 'classes': [], 'funcs': []}
+
+def _extract_java(source):
+    package = _JAVA_PACKAGE_RE.search(source)
+    return {'imports': _JAVA_IMPORT_RE.findall(source), 'classes': [], 'funcs': [],
+            'package': package.group(1) if package else ''}
+
+_EXTRACTORS = {sfx: {'node': _extract_js, 'go': _extract_go, 'java': _extract_java}[lang]
+               for sfx, lang in _LANG_BY_SUFFIX.items() if lang != 'python'}
+
+def _extract_any(suffix, source, imports_only=False):
+    # Module-level so process pools can pickle it; Python falls through to _extract_source
+    # (or _extract_imports when only the file graph is needed).
+    extractor = _EXTRACTORS.get(suffix)
+    if extractor: return extractor(source)
+    return _extract_imports(source) if imports_only else _extract_source(source)
+
+# --- CACHE (incremental, keyed on path + mtime + size + content hash) ---
+_CACHE_FILE = '.claude/pactkit_cache/visualize.json'
+_CACHE_VERSION = 6  # 2: imports in source order, import-only entries; 3: scoped calls with line numbers; 4: end lines;
+                   # 5: calls to nested functions qualified; 6: JS/Go comments stripped outside strings
+
+_CACHE_MEMO = {}  # {cache path: (mtime_ns, size, entries)}; only pays off in a long-lived process (`pactkit serve`)
+
+def _read_cache(root):
+    path = root / _CACHE_FILE
+    try: st = path.stat()
+    except OSError: return {}
+    memo = _CACHE_MEMO.get(path)
+    if memo and memo[:2] == (st.st_mtime_ns, st.st_size): return memo[2]  # callers never mutate entries
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        if data.get('version') != _CACHE_VERSION: return {}
+        entries = data.get('files', {})
+    except: return {}
+    _CACHE_MEMO[path] = (st.st_mtime_ns, st.st_size, entries)
+    return entries
+
+def _ensure_cache_dir(root):
+    # Like .pytest_cache: the directory ignores itself so it never shows up as a change.
+    d = (root / _CACHE_FILE).parent
+    d.mkdir(parents=True, exist_ok=True)
+    ignore = d / '.gitignore'
+    if not ignore.exists(): ignore.write_text('*' + nl(), encoding='utf-8')
+    return d
+
+def _write_cache(root, entries):
+    path = root / _CACHE_FILE
+    _ensure_cache_dir(root)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps({'version': _CACHE_VERSION, 'files': entries}), encoding='utf-8')
+    os.replace(tmp, path)
+    st = path.stat()
+    _CACHE_MEMO[path] = (st.st_mtime_ns, st.st_size, entries)
+
+# --- PARALLEL EXTRACTION ---
+_PARALLEL_MIN_FILES = 200  # below this, pool startup costs more than it saves
+
+def _resolve_jobs(jobs, pending):
+    if jobs in (None, '', 0, '0'): return 1
+    if jobs == 'auto':
+        return 1 if pending < _PARALLEL_MIN_FILES else (os.cpu_count() or 1)
+    try: return max(1, int(jobs))
+    except (TypeError, ValueError): return 1
+
+def _extract_many(sources, jobs=1, suffixes=None, imports_only=False):
+    # Workers receive source text and return plain facts dicts (never AST objects).
+    # ProcessPoolExecutor.map preserves input order, so merging is deterministic.
+    if suffixes is None: suffixes = ['.py'] * len(sources)
+    workers = min(_resolve_jobs(jobs, len(sources)), len(sources))
+    if workers > 1:
         try:
-            tree = ast.parse(p.read_text(encoding='utf-8'))
-            for n in ast.walk(tree):
-                imported_module = None
-                if isinstance(n, ast.Import):
-                    for name in n.names: imported_module = name.name
-                elif isinstance(n, ast.ImportFrom):
-                    if n.module: imported_module = n.module
-                if imported_module:
-                    tf = module_index.get(imported_module)
-                    if not tf:
-                        parts = imported_module.split('.')
-                        for i in range(len(parts), 0, -1):
-                            sub = '.'.join(parts[:i])
-                            if sub in module_index: tf = module_index[sub]; break
-                    if tf and tf != p:
-                        pid = file_to_node.get(tf)
-                        if pid: edges.append((consumer_id, pid))
-        except: pass
+            from concurrent.futures import ProcessPoolExecutor
+            chunk = max(1, len(sources) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                return list(ex.map(_extract_any, suffixes, sources, [imports_only] * len(sources), chunksize=chunk))
+        except Exception: pass  # no usable pool (e.g. exec'd namespace) -> serial
+    return [_extract_any(sfx, src, imports_only) for sfx, src in zip(suffixes, sources)]
+
+def _load_facts(root, all_files, use_cache=True, jobs=1, stats=None, imports_only=False):
+    # Returns {path: facts}. Only files whose stat or content changed are re-parsed;
+    # entries for files that no longer exist are dropped on write-back.
+    # imports_only: file-graph callers accept import-only facts (see _extract_imports).
+    cached = _read_cache(root) if use_cache else {}
+    entries, facts, dirty = _refresh_facts(root, all_files, cached, jobs, stats, imports_only)
+    if use_cache and dirty:
+        started = time.perf_counter()
+        try: _write_cache(root, entries)
+        except OSError: pass
+        _add_phase(stats, 'cache_write', started)
+    return facts
+
+def _refresh_facts(root, all_files, cached, jobs=1, stats=None, imports_only=False):
+    # Reconcile cache entries {rel: entry} with the files on disk.
+    # Returns (entries, {path: facts}, dirty) where dirty means any entry was added, changed or dropped.
+    # Cached import-only facts count as stale unless imports_only is set.
+    started = time.perf_counter()
+    entries = {}
+    facts = {}
+    pending = []  # (path, entry, source) still to be parsed
+    skipped = []  # (rel, reason)
+    undecodable = 0
+    for p in all_files:
+        rel = p.relative_to(root).as_posix()
+        try: st = p.stat()
+        except OSError as ex: skipped.append((rel, f'stat: {ex.strerror}')); continue
+        e = cached.get(rel)
+        if e and not imports_only and e['facts'].get('imports_only'): e = None  # needs a full parse
+        if e and e['mtime'] == st.st_mtime_ns and e['size'] == st.st_size:
+            entries[rel] = e
+            facts[p] = e['facts']
+            continue
+        try: raw = p.read_bytes()
+        except OSError as ex: skipped.append((rel, f'read: {ex.strerror}')); continue
+        digest = hashlib.sha1(raw).hexdigest()
+        entry = {'mtime': st.st_mtime_ns, 'size': st.st_size, 'sha1': digest, 'facts': None}
+        entries[rel] = entry
+        if e and e['sha1'] == digest:
+            entry['facts'] = facts[p] = e['facts']
+            continue
+        try: source = raw.decode('utf-8')
+        except UnicodeDecodeError as ex:
+            undecodable += 1
+            entry['facts'] = facts[p] = {'imports': [], 'classes': [], 'funcs': [], 'error': f'UnicodeDecodeError: {ex.reason}'}
+            continue
+        facts[p] = None  # placeholder keeps all_files order
+        pending.append((p, entry, source))
+    _add_phase(stats, 'read', started)
+    started = time.perf_counter()
+    extracted = _extract_many([src for _, _, src in pending], jobs, [p.suffix for p, _, _ in pending], imports_only)
+    for (p, entry, _), f in zip(pending, extracted):
+        entry['facts'] = facts[p] = f
+    _add_phase(stats, 'parse', started)
+    dirty = len(entries) != len(cached) or any(e is not cached.get(rel) for rel, e in entries.items())
+    if stats is not None:  # accumulates: lazy focus calls this once per hop
+        misses = len(pending) + undecodable
+        failures = [{'path': p.relative_to(root).as_posix(), 'error': f['error']} for p, f in facts.items() if f and 'error' in f]
+        counts = stats['files']
+        counts['scanned'] += len(all_files)
+        counts['skipped'] += len(skipped)
+        counts['cache_hits'] += len(entries) - misses
+        counts['cache_misses'] += misses
+        counts['parse_failures'] += len(failures)
+        stats['skipped'] += [{'path': rel, 'reason': reason} for rel, reason in skipped]
+        stats['parse_failures'] += failures
+    return entries, facts, dirty
+
+# --- GRAPH CORE (interned file ids, array-backed adjacency) ---
+class _CSR:
+    # Compressed rows: node i's neighbours are targets[offsets[i]:offsets[i + 1]], with parallel
+    # import counts. .get() mirrors dict.get so _neighbourhood and _tarjan_scc accept it as-is.
+    __slots__ = ('offsets', 'targets', 'counts')
+
+    def __init__(self, offsets, targets, counts):
+        self.offsets, self.targets, self.counts = offsets, targets, counts
+
+    def __len__(self): return len(self.offsets) - 1
+
+    def __iter__(self): return iter(range(len(self)))
+
+    def get(self, i, default=()):
+        if not 0 <= i < len(self): return default
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def items(self, i):
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[lo:hi], self.counts[lo:hi])
+
+    def transpose(self):
+        # Counting sort by target; rows stay in source order, like the forward rows.
+        n, size = len(self), len(self.targets)
+        offsets = array('I', [0]) * (n + 1)
+        for t in self.targets: offsets[t + 1] += 1
+        for i in range(n): offsets[i + 1] += offsets[i]
+        fill = array('I', offsets)
+        targets, counts = array('I', [0]) * size, array('I', [0]) * size
+        for src in range(n):
+            for k in range(self.offsets[src], self.offsets[src + 1]):
+                dst = self.targets[k]
+                slot = fill[dst]
+                fill[dst] += 1
+                targets[slot], counts[slot] = src, self.counts[k]
+        return _CSR(offsets, targets, counts)
+
+class _ImportGraph:
+    # Node i is files[i] with Mermaid id ids[i]; memory grows with distinct edges, not import statements.
+    __slots__ = ('files', 'ids', 'fwd', '_rev')
+
+    def __init__(self, files, ids, fwd):
+        self.files, self.ids, self.fwd, self._rev = files, ids, fwd, None
+
+    @property
+    def rev(self):
+        if self._rev is None: self._rev = self.fwd.transpose()
+        return self._rev
+
+    def edges(self):
+        # (src, dst, import count) in file order, each distinct edge once.
+        for i in self.fwd:
+            for j, n in self.fwd.items(i): yield i, j, n
+
+def _build_import_graph(all_files, module_index, file_to_node, facts, stats=None):
+    # Resolve every file's imports into an _ImportGraph. Targets are deduplicated per file as they
+    # resolve (Go packages and Java wildcards count once per target file), then appended to the arrays.
+    started = time.perf_counter()
+    index = {p: i for i, p in enumerate(all_files)}
+    offsets, targets, counts = array('I', [0]), array('I'), array('I')
+    foreign = None
+    for p in all_files:
+        lang = _LANG_BY_SUFFIX.get(p.suffix, 'python')
+        if lang != 'python' and foreign is None: foreign = _foreign_index(all_files, facts)
+        out = {}
+        for imported_module in (facts.get(p) or {}).get('imports', []):
+            if lang != 'python': resolved = _resolve_foreign(lang, p, imported_module, foreign)
+            else:
+                tf = _resolve_python(imported_module, module_index)
+                resolved = [tf] if tf else []
+            for tf in resolved:
+                j = index.get(tf) if tf != p else None
+                if j is not None: out[j] = out.get(j, 0) + 1
+        targets.extend(out)
+        counts.extend(out.values())
+        offsets.append(len(targets))
+    _add_phase(stats, 'resolve', started)
+    if stats is not None: stats['graph'].update(nodes=len(all_files), edges=len(targets), imports=sum(counts))
+    return _ImportGraph(all_files, [file_to_node[p] for p in all_files], _CSR(offsets, targets, counts))
+
+def _resolve_python(name, module_index):
+    # Longest dotted prefix that names a scanned module (from a.b import c -> a.b).
+    tf = module_index.get(name)
+    if tf: return tf
+    parts = name.split('.')
+    for i in range(len(parts) - 1, 0, -1):
+        tf = module_index.get('.'.join(parts[:i]))
+        if tf: return tf
+    return None
+
+def _foreign_index(all_files, facts):
+    # Lookup tables for non-Python imports, built once per resolve from the scanned files.
+    node, node_dirs, go, java, java_pkgs = {}, {}, {}, {}, {}
+    go_mods = {}  # {dir: (module path, go.mod dir) or None}
+    for p in all_files:
+        lang = _LANG_BY_SUFFIX.get(p.suffix)
+        if lang == 'node':
+            node[str(p)] = p
+            node.setdefault(str(p.with_suffix('')), p)
+            if p.stem == 'index': node_dirs.setdefault(str(p.parent), p)
+        elif lang == 'go' and not p.name.endswith('_test.go'):
+            mod = _go_module(p.parent, go_mods)
+            if not mod: continue
+            rel = p.parent.relative_to(mod[1]).as_posix()
+            go.setdefault(mod[0] if rel == '.' else f'{mod[0]}/{rel}', []).append(p)
+        elif lang == 'java':
+            pkg = (facts.get(p) or {}).get('package', '')
+            java[f'{pkg}.{p.stem}' if pkg else p.stem] = p
+            java_pkgs.setdefault(pkg, []).append(p)
+    for d, p in node_dirs.items(): node.setdefault(d, p)  # ./foo prefers foo.ts over foo/index.ts
+    return {'node': node, 'go': go, 'java': java, 'java_pkgs': java_pkgs}
+
+def _go_module(d, memo):
+    # (module path, go.mod dir) of the nearest go.mod at or above d.
+    if d in memo: return memo[d]
+    mod = None
+    try: m = re.search(r'^module\s+(\S+)', (d / 'go.mod').read_text(encoding='utf-8'), re.M)
+    except OSError: m = None
+    if m: mod = (m.group(1).strip('"'), d)
+    elif d.parent != d: mod = _go_module(d.parent, memo)
+    memo[d] = mod
+    return mod
+
+def _resolve_foreign(lang, p, spec, index):
+    # Target files for one import; bare npm packages, stdlib and third-party modules resolve to nothing.
+    if lang == 'node':
+        if not spec.startswith('.'): return []
+        base = os.path.normpath(os.path.join(p.parent, spec))
+        tf = index['node'].get(base) or index['node'].get(os.path.splitext(base)[0])
+        return [tf] if tf else []
+    if lang == 'go': return index['go'].get(spec, [])
+    if spec.endswith('.*'):
+        if spec[:-2] in index['java_pkgs']: return index['java_pkgs'][spec[:-2]]
+        spec = spec[:-2]  # import static a.b.Cls.*
+    parts = spec.split('.')
+    for i in range(len(parts), 0, -1):  # import static a.b.Cls.member -> a.b.Cls
+        tf = index['java'].get('.'.join(parts[:i]))
+        if tf: return [tf]
+    return []
+
+# --- MODE: FILE (original, v19.7) ---
+def _build_file_graph(root, graph, focus, depth=1, direction='both'):
+    files, ids = graph.files, graph.ids
+    def node_lines(i):
+        return [f'    {ids[i]}["{files[i].name}"]', f'    click {ids[i]} href "{files[i].relative_to(root)}"']
 
     final_lines = ['graph TD']
     if focus:
-        target_ids = set()
-        for f, nid in file_to_node.items():
-            if focus in str(f.relative_to(root)): target_ids.add(nid)
-        if not target_ids:
-            return None, f"❌ Focus target '{focus}' not found. (Scanned {len(all_files)} files)"
-        relevant_ids = set(target_ids)
-        relevant_edges = []
-        for src, dst in edges:
-            if src in target_ids or dst in target_ids:
-                relevant_edges.append(f'    {src} --> {dst}')
-                relevant_ids.add(src); relevant_ids.add(dst)
-        for line in nodes:
-            if any(rid in line for rid in relevant_ids): final_lines.append(line)
-        final_lines.extend(relevant_edges)
+        seeds = [i for i, f in enumerate(files) if focus in str(f.relative_to(root))]
+        if not seeds:
+            return None, f"❌ Focus target '{focus}' not found. (Scanned {len(files)} files)"
+        rev = graph.rev if direction != 'out' else None
+        dist, hood_edges = _neighbourhood(graph.fwd, rev, seeds, depth, direction)
+        for i in sorted(dist): final_lines.extend(node_lines(i))
+        for src, dst in hood_edges: final_lines.append(f'    {ids[src]} --> {ids[dst]}')
         dest = root / 'docs/architecture/graphs/focus_graph.mmd'
     else:
-        final_lines.extend(nodes)
-        for src, dst in edges: final_lines.append(f'    {src} --> {dst}')
+        for i in range(len(files)): final_lines.extend(node_lines(i))
+        for src, dst, _ in graph.edges(): final_lines.append(f'    {ids[src]} --> {ids[dst]}')
         dest = root / 'docs/architecture/graphs/code_graph.mmd'
     return dest, nl().join(final_lines)
 
+def _build_file_json(root, graph):
+    # Machine-readable twin of code_graph.mmd: nodes with paths and fan-in/out, edges with import counts.
+    fwd, ids = graph.fwd, graph.ids
+    fan_in = [0] * len(ids)
+    for t in fwd.targets: fan_in[t] += 1
+    nodes = []
+    for i, f in enumerate(graph.files):
+        rel = f.relative_to(root)
+        nodes.append({'id': ids[i], 'path': rel.as_posix(), 'module': _module_name(rel),
+                      'fan_in': fan_in[i], 'fan_out': fwd.offsets[i + 1] - fwd.offsets[i]})
+    data = {
+        'version': 1,
+        'nodes': nodes,
+        'edges': [{'source': ids[src], 'target': ids[dst], 'count': n} for src, dst, n in graph.edges()],
+    }
+    return root / 'docs/architecture/graphs/code_graph.json', json.dumps(data, indent=1)
+
+def _module_name(rel):
+    # Dotted module for a root-relative path; a leading src/ is dropped and packages use their directory.
+    mod = rel.parent if rel.name == '__init__.py' else rel.with_suffix('')
+    parts = mod.parts[1:] if mod.parts[:1] == ('src',) else mod.parts
+    return '.'.join(parts)
+
+# --- COLLAPSE / SHARD (bounded output for large repos) ---
+def _package_groups(root, graph, depth):
+    # (group names, group index per file): each file joins the first `depth` components of its module.
+    names, index, group_of = [], {}, []
+    for f in graph.files:
+        name = '.'.join(_module_name(f.relative_to(root)).split('.')[:depth]) or f.stem
+        if name not in index: index[name] = len(names); names.append(name)
+        group_of.append(index[name])
+    return names, group_of
+
+def _group_id(name): return 'pkg_' + re.sub(r'\W', '_', name)
+
+def _build_collapsed_graph(root, graph, depth, dest=None, links=None):
+    # One node per package prefix; edge labels are summed import counts, intra-package edges dropped.
+    names, group_of = _package_groups(root, graph, depth)
+    sizes = [0] * len(names)
+    for g in group_of: sizes[g] += 1
+    weights = {}
+    for src, dst, n in graph.edges():
+        a, b = group_of[src], group_of[dst]
+        if a != b: weights[(a, b)] = weights.get((a, b), 0) + n
+    lines = ['graph TD']
+    for g, name in enumerate(names):
+        lines.append(f'    {_group_id(name)}["{name} ({sizes[g]} files)"]')
+        if links: lines.append(f'    click {_group_id(name)} href "{links[g]}"')
+    for (a, b), n in weights.items(): lines.append(f'    {_group_id(names[a])} -->|{n}| {_group_id(names[b])}')
+    return dest or root / 'docs/architecture/graphs/code_graph.mmd', nl().join(lines)
+
+def _build_shards(root, graph, depth=1):
+    # One .mmd per package prefix (its files, internal edges, and summed edges to neighbouring
+    # packages as boundary nodes) plus index.mmd, the collapsed graph linking to each shard.
+    shard_dir = root / 'docs/architecture/graphs/shards'
+    names, group_of = _package_groups(root, graph, depth)
+    files, ids = graph.files, graph.ids
+    members = [[] for _ in names]
+    for i, g in enumerate(group_of): members[g].append(i)
+    links = [re.sub(r'[^\w.-]', '_', name) + '.mmd' for name in names]
+    out = [_build_collapsed_graph(root, graph, depth, shard_dir / 'index.mmd', links)]
+    rev = graph.rev
+    for g, name in enumerate(names):
+        lines = ['graph TD', f'    %% shard: {name} (see index.mmd)']
+        for i in members[g]:
+            lines.append(f'    {ids[i]}["{files[i].name}"]')
+            lines.append(f'    click {ids[i]} href "{files[i].relative_to(root)}"')
+        boundary, edges = {}, []
+        for i in members[g]:
+            for j, n in graph.fwd.items(i):
+                if group_of[j] == g: edges.append(f'    {ids[i]} --> {ids[j]}')
+                else: boundary[(i, group_of[j], 'out')] = boundary.get((i, group_of[j], 'out'), 0) + n
+            for j, n in rev.items(i):
+                if group_of[j] != g: boundary[(i, group_of[j], 'in')] = boundary.get((i, group_of[j], 'in'), 0) + n
+        for h in dict.fromkeys(h for _, h, _ in boundary):
+            lines.append(f'    {_group_id(names[h])}[["{names[h]}"]]')
+            lines.append(f'    click {_group_id(names[h])} href "{links[h]}"')
+        lines.extend(edges)
+        for (i, h, way), n in boundary.items():
+            a, b = (ids[i], _group_id(names[h])) if way == 'out' else (_group_id(names[h]), ids[i])
+            lines.append(f'    {a} -->|{n}| {b}')
+        out.append((shard_dir / links[g], nl().join(lines)))
+    return out
+
+def _neighbourhood(fwd, rev, seeds, depth=1, direction='both'):
+    # Exact k-hop BFS over adjacency maps. Returns ({node: hops}, [traversed edges]);
+    # cost is proportional to the edges visited, not to the size of the graph.
+    dist = {s: 0 for s in seeds}
+    hood_edges = {}
+    frontier = list(dist)
+    for hop in range(1, depth + 1):
+        nxt = []
+        for n in frontier:
+            if direction in ('out', 'both'):
+                for m in fwd.get(n, ()):
+                    hood_edges[(n, m)] = None
+                    if m not in dist: dist[m] = hop; nxt.append(m)
+            if direction in ('in', 'both'):
+                for m in rev.get(n, ()):
+                    hood_edges[(m, n)] = None
+                    if m not in dist: dist[m] = hop; nxt.append(m)
+        if not nxt: break
+        frontier = nxt
+    return dist, list(hood_edges)
+
+# --- LAZY FOCUS (parse the neighbourhood, not the repo) ---
+def _fact_loader(root, use_cache=True, jobs=1, stats=None, imports_only=False):
+    # (facts, load, flush): load(paths) fills facts for just those files; flush() writes new cache
+    # entries back while keeping the entries of every file that was never loaded.
+    cached = _read_cache(root) if use_cache else {}
+    entries, facts = {}, {}
+    def load(paths):
+        todo = [p for p in paths if p not in facts]
+        if not todo: return
+        got, parsed, _ = _refresh_facts(root, todo, cached, jobs, stats, imports_only)
+        entries.update(got)
+        facts.update(parsed)
+    def flush():
+        if not use_cache or all(e is cached.get(rel) for rel, e in entries.items()): return
+        started = time.perf_counter()
+        try: _write_cache(root, {**cached, **entries})
+        except OSError: pass
+        _add_phase(stats, 'cache_write', started)
+    return facts, load, flush
+
+def _import_names(root, all_files, module_index, facts):
+    # {path: [bytes]}: text an import of that file must contain once it resolves to it -- its dotted
+    # Python module names, TS/JS file stem (or directory for index files), Go import path or Java package.
+    names = {}
+    for name, p in module_index.items():
+        if name != '.': names.setdefault(p, []).append(name.encode())
+    go_mods = {}
+    for p in all_files:
+        lang = _LANG_BY_SUFFIX.get(p.suffix)
+        if lang == 'node':
+            names[p] = [p.stem.encode()] + ([p.parent.name.encode()] if p.stem == 'index' else [])
+        elif lang == 'go':
+            mod = _go_module(p.parent, go_mods)
+            if not mod: continue
+            rel = p.parent.relative_to(mod[1]).as_posix()
+            names[p] = [(mod[0] if rel == '.' else f'{mod[0]}/{rel}').encode()]
+        elif lang == 'java':
+            names[p] = [((facts.get(p) or {}).get('package') or p.stem).encode()]
+    return names
+
+def _importer_candidates(all_files, facts, targets, names, stats=None):
+    # Unloaded files whose raw bytes mention an import name of any target -- the only files that can
+    # import one. Specifiers like '..' reach an index file without spelling its directory, so files
+    # below a targeted TS/JS index directory are always candidates.
+    started = time.perf_counter()
+    needles = sorted({n for p in targets for n in names.get(p, ())})
+    dirs = tuple(str(p.parent) + os.sep for p in targets if p.stem == 'index' and _LANG_BY_SUFFIX.get(p.suffix) == 'node')
+    pattern = re.compile(b'|'.join(re.escape(n) for n in needles)) if needles else None
+    found, searched = [], 0
+    for p in all_files:
+        if p in facts: continue
+        if dirs and str(p).startswith(dirs): found.append(p); continue
+        if pattern is None: continue
+        searched += 1
+        try: raw = p.read_bytes()
+        except OSError: found.append(p); continue  # let _refresh_facts record it as skipped
+        if pattern.search(raw): found.append(p)
+    _add_phase(stats, 'read', started)
+    if stats is not None: stats['files']['prefiltered'] = stats['files'].get('prefiltered', 0) + searched
+    return found
+
+def _lazy_file_focus(root, all_files, module_index, file_to_node, focus, depth, direction, facts, load, stats=None):
+    # File-mode --focus, hop by hop: parse the frontier (its imports are the out-edges) and, for
+    # in-edges, only the files the byte prefilter flags. Every node within depth - 1 hops has all of
+    # its edges resolved, so the rendered neighbourhood is the one the full graph would give.
+    seed_ids = [i for i, p in enumerate(all_files) if focus in str(p.relative_to(root))]
+    if not seed_ids: return None, f"❌ Focus target '{focus}' not found. (Scanned {len(all_files)} files)"
+    seeds = [all_files[i] for i in seed_ids]
+    load(seeds)
+    java = [p for p in all_files if p.suffix == '.java']
+    if java: load(java)  # Java imports resolve through every file's package declaration
+    names = _import_names(root, all_files, module_index, facts) if direction != 'out' else {}
+    frontier = seeds
+    for hop in range(1, depth + 1):
+        if direction != 'out': load(_importer_candidates(all_files, facts, frontier, names, stats))
+        if hop == depth: break
+        graph = _build_import_graph(all_files, module_index, file_to_node, facts)
+        dist, _ = _neighbourhood(graph.fwd, graph.rev if direction != 'out' else None, seed_ids, hop, direction)
+        frontier = [all_files[i] for i, d in dist.items() if d == hop]
+        if not frontier: break
+        load(frontier)
+    graph = _build_import_graph(all_files, module_index, file_to_node, facts, stats)
+    return _build_file_graph(root, graph, focus, depth, direction)
+
 # --- MODE: CLASS (classDiagram) ---
-def _build_class_graph(root, all_files, focus):
+def _build_class_graph(root, all_files, facts, focus):
     classes = []  # (file, class_name, bases, methods)
 
     for p in all_files:
-        try:
-            tree = ast.parse(p.read_text(encoding='utf-8'))
-            rel = str(p.relative_to(root))
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    bases = []
-                    for b in node.bases:
-                        if isinstance(b, ast.Name): bases.append(b.id)
-                        elif isinstance(b, ast.Attribute): bases.append(b.attr)
-                    methods = []
-                    for item in node.body:
-                        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                            prefix = '+' if not item.name.startswith('_') else '-'
-                            args = [a.arg for a in item.args.args if a.arg != 'self']
-                            sig = f"{prefix}{item.name}({', '.join(args)})"
-                            methods.append(sig)
-                    classes.append((rel, node.name, bases, methods))
-        except: pass
+        rel = str(p.relative_to(root))
+        for cname, bases, methods, *_ in facts.get(p, {}).get('classes', []):
+            classes.append((rel, cname, bases, methods))
 
     # Filter by focus
     if focus:
@@ -148,68 +864,67 @@ def _build_class_graph(root, all_files, focus):
     return dest, nl().join(lines)
 
 # --- MODE: CALL (function-level call graph) ---
-def _build_call_graph(root, all_files, focus, entry):
+def _build_call_graph(root, all_files, facts, focus, entry, callers=False, max_depth=None):
     # Pass 1: Register all functions/methods
     func_registry = {}  # {qualified_name: file}
     # Pass 2: Build call edges
     call_edges = {}  # {caller_qualified: [callee_qualified]}
 
     for p in all_files:
-        try:
-            tree = ast.parse(p.read_text(encoding='utf-8'))
-            rel = p.stem
-
-            for node in ast.iter_child_nodes(tree):
-                # Top-level functions
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    qname = node.name
-                    func_registry[qname] = rel
-                    callees = _extract_calls(node, current_class=None)
-                    call_edges[qname] = callees
-
-                # Class methods
-                elif isinstance(node, ast.ClassDef):
-                    for item in node.body:
-                        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                            qname = f'{node.name}.{item.name}'
-                            func_registry[qname] = rel
-                            callees = _extract_calls(item, current_class=node.name)
-                            call_edges[qname] = callees
-        except: pass
+        rel = p.stem
+        for qname, callees, *_ in facts.get(p, {}).get('funcs', []):
+            func_registry[qname] = rel
+            call_edges[qname] = callees
 
-    # Pass 3: Resolve short names to qualified names where possible
-    all_func_names = set(func_registry.keys())
+    # Pass 3: Resolve short names to qualified names via a suffix index (built once)
+    callee_index = _build_callee_index(func_registry)
+    ambiguous = {}  # {callee: [candidates]} -- reported as Mermaid comments
+    resolved_memo = {}
+    def resolve(callee):
+        if callee not in resolved_memo:
+            resolved_memo[callee] = _resolve_callee(callee, func_registry, callee_index, ambiguous)
+        return resolved_memo[callee]
 
-    # Pass 4: If --entry, do BFS for transitive closure
+    # Pass 4: If --entry, do BFS for transitive closure (callees, or callers with --callers)
     if entry:
-        # Find the entry function (try exact match, then partial)
-        start = None
-        for fn in all_func_names:
-            if fn == entry or fn.endswith(f'.{entry}'): start = fn; break
-        if not start:
-            for fn in all_func_names:
-                if entry in fn: start = fn; break
-        if not start:
-            return root / 'docs/architecture/graphs/call_graph.mmd', f'graph TD{nl()}    ❌_not_found["{entry} not found"]'
-
-        # BFS
-        visited = set()
-        queue = [start]
-        reachable_edges = []
+        entries = [entry] if isinstance(entry, str) else list(entry)
+        reverse = _build_reverse_calls(call_edges, resolve) if callers else {}
+        starts, missing = [], []
+        for e in entries:
+            # Find the entry function (try exact match, then partial)
+            start = _resolve_callee(e, func_registry, callee_index)
+            if not start and callers and e in reverse: start = e
+            if not start:
+                for fn in sorted(func_registry):
+                    if e in fn: start = fn; break
+            if not start: missing.append(e)
+            elif start not in starts: starts.append(start)
+        if not starts:
+            return root / 'docs/architecture/graphs/call_graph.mmd', f'graph TD{nl()}    ❌_not_found["{", ".join(entries)} not found"]'
+
+        # BFS from every entry, sharing one visited map {node: depth}
+        visited = {s: 0 for s in starts}
+        queue = deque(starts)
+        reachable_edges = {}
         while queue:
-            current = queue.pop(0)
-            if current in visited: continue
-            visited.add(current)
+            current = queue.popleft()
+            depth = visited[current]
+            if max_depth is not None and depth >= max_depth: continue
+            if callers:
+                for caller in reverse.get(current, ()):
+                    reachable_edges[(caller, current)] = None
+                    if caller not in visited: visited[caller] = depth + 1; queue.append(caller)
+                continue
             for callee in call_edges.get(current, []):
                 # Resolve callee to qualified name
-                resolved = _resolve_callee(callee, all_func_names)
+                resolved = resolve(callee)
                 if resolved:
-                    reachable_edges.append((current, resolved))
-                    if resolved not in visited: queue.append(resolved)
+                    reachable_edges[(current, resolved)] = None
+                    if resolved not in visited: visited[resolved] = depth + 1; queue.append(resolved)
                 else:
                     # Keep unresolved as leaf node
-                    reachable_edges.append((current, callee))
-                    visited.add(callee)
+                    reachable_edges[(current, callee)] = None
+                    visited.setdefault(callee, depth + 1)
 
         lines = ['graph TD']
         safe = lambda s: s.replace('.', '_')
@@ -217,6 +932,7 @@ def _build_call_graph(root, all_files, focus, entry):
             lines.append(f'    {safe(fn)}["{fn}"]')
         for src, dst in reachable_edges:
             lines.append(f'    {safe(src)} --> {safe(dst)}')
+        for e in missing: lines.append(f'    %% entry not found: {e}')
     else:
         # Full call graph (optionally filtered by focus)
         lines = ['graph TD']
@@ -227,7 +943,7 @@ def _build_call_graph(root, all_files, focus, entry):
         for caller, callees in call_edges.items():
             if focus and focus not in func_registry.get(caller, ''): continue
             for callee in callees:
-                resolved = _resolve_callee(callee, all_func_names) or callee
+                resolved = resolve(callee) or callee
                 relevant.add(caller)
                 relevant.add(resolved)
                 rel_edges.append((caller, resolved))
@@ -237,7 +953,7 @@ def _build_call_graph(root, all_files, focus, entry):
             relevant = set(func_registry.keys())
             for callees in call_edges.values():
                 for c in callees:
-                    resolved = _resolve_callee(c, all_func_names) or c
+                    resolved = resolve(c) or c
                     relevant.add(resolved)
 
         for fn in sorted(relevant): lines.append(f'    {safe(fn)}["{fn}"]')
@@ -245,54 +961,1121 @@ def _build_call_graph(root, all_files, focus, entry):
         if not rel_edges:
             for caller, callees in call_edges.items():
                 for callee in callees:
-                    resolved = _resolve_callee(callee, all_func_names) or callee
+                    resolved = resolve(callee) or callee
                     lines.append(f'    {safe(caller)} --> {safe(resolved)}')
 
+    for callee in sorted(ambiguous):
+        lines.append(f"    %% ambiguous: {callee} -> {', '.join(ambiguous[callee])} (using {ambiguous[callee][0]})")
     dest = root / 'docs/architecture/graphs/call_graph.mmd'
     if focus: dest = root / 'docs/architecture/graphs/focus_graph.mmd'
     return dest, nl().join(lines)
 
-def _extract_calls(func_node, current_class=None):
-    # Extract function/method calls from a function body.
-    callees = []
-    for node in ast.walk(func_node):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name):
-                callees.append(node.func.id)
-            elif isinstance(node.func, ast.Attribute):
-                # self.method() → ClassName.method
-                if isinstance(node.func.value, ast.Name):
-                    if node.func.value.id == 'self' and current_class:
-                        callees.append(f'{current_class}.{node.func.attr}')
-                    else:
-                        callees.append(f'{node.func.value.id}.{node.func.attr}')
-    return callees
-
-def _resolve_callee(callee, all_func_names):
+def _build_reverse_calls(call_edges, resolve):
+    # {callee: {caller: None}} -- resolved callees use their qualified name, others stay raw.
+    reverse = {}
+    for caller, callees in call_edges.items():
+        for callee in callees:
+            target = resolve(callee) or callee
+            reverse.setdefault(target, {})[caller] = None
+    return reverse
+
+def _build_callee_index(func_names, nested=None):
+    # {last name component: sorted qualified names}, so suffix lookups touch only candidates.
+    # Nested functions (Outer.helper) are left out: calls to them are recorded fully qualified, so a
+    # bare helper() elsewhere must not suffix-match them. By default a name is nested when its parent is a function.
+    if nested is None: nested = {fn for fn in func_names if '.' in fn and fn.rsplit('.', 1)[0] in func_names}
+    index = {}
+    for fn in func_names:
+        if fn in nested: continue
+        index.setdefault(fn.rsplit('.', 1)[-1], []).append(fn)
+    for names in index.values(): names.sort()
+    return index
+
+def _resolve_callee(callee, func_names, index, ambiguous=None):
     # Try to resolve a callee string to a known qualified function name.
-    if callee in all_func_names: return callee
-    # Try matching by suffix
-    for fn in all_func_names:
-        if fn.endswith(f'.{callee}') or fn == callee: return fn
+    if callee in func_names: return callee
+    # Try matching by suffix; ties resolve to the first name in sorted order
+    suffix = f'.{callee}'
+    matches = [fn for fn in index.get(callee.rsplit('.', 1)[-1], ()) if fn.endswith(suffix)]
+    if not matches: return None
+    if len(matches) > 1 and ambiguous is not None: ambiguous[callee] = matches
+    return matches[0]
+
+# --- MODE: PROFILE (cProfile/pstats timings on the static call graph) ---
+_PROFILE_BANDS = ((0.5, '#d62728', 4), (0.2, '#ff7f0e', 3), (0.05, '#e6c229', 2), (0.0, '#9e9e9e', 1))  # (share, colour, px)
+
+def _load_pstats(path):
+    # {(filename, line, name): (cc, nc, tt, ct, callers)} as written by cProfile / pstats.dump_stats
+    import pstats
+    return pstats.Stats(str(path)).stats
+
+def _profile_path(filename, funcs):
+    # Profiles usually come from another checkout or CI: match the longest trailing path that was scanned.
+    parts = Path(filename).parts
+    for k in range(len(parts)):
+        rel = '/'.join(parts[k:])
+        if rel in funcs: return rel
     return None
 
+def _build_profile_graph(root, all_files, facts, raw, top=None):
+    funcs = {}  # {rel: {bare name: [(def line, qname)]}} -- pstats keys carry the bare co_name
+    owners = {}  # {qname: {rel}} to keep same-named functions from different files apart
+    static = set()
+    names = {qname for p in all_files for qname, *_ in facts.get(p, {}).get('funcs', [])}
+    index = _build_callee_index(names)
+    for p in all_files:
+        rel = p.relative_to(root).as_posix()
+        for qname, callees, line, *_ in facts.get(p, {}).get('funcs', []):
+            funcs.setdefault(rel, {}).setdefault(qname.rsplit('.', 1)[-1], []).append((line, qname))
+            owners.setdefault(qname, set()).add(rel)
+            for callee in callees: static.add((qname, _resolve_callee(callee, names, index) or callee))
+    for by_name in funcs.values():
+        for defs in by_name.values(): defs.sort()
+
+    paths = {}
+    def node_of(key):
+        # Decorated functions report the first decorator's line, so take the first def at or below it.
+        filename, line, name = key
+        if filename not in paths: paths[filename] = _profile_path(filename, funcs)
+        rel = paths[filename]
+        for def_line, qname in funcs.get(rel, {}).get(name, ()) if rel else ():
+            if def_line >= line: return rel, qname
+        return None
+
+    total = sum(v[2] for v in raw.values()) or 1.0
+    cum, edges, unmapped = {}, {}, 0
+    for key, (_, _, _, ct, callers) in raw.items():
+        node = node_of(key)
+        if node is None: unmapped += 1; continue
+        cum[node] = cum.get(node, 0.0) + ct
+        for caller_key, edge in callers.items():
+            caller = node_of(caller_key)
+            if caller is None or caller == node: continue
+            edges[(caller, node)] = edges.get((caller, node), 0.0) + (edge[3] if isinstance(edge, tuple) else 0.0)
+
+    hot = sorted(cum, key=lambda n: (-cum[n], n))
+    ranked = sorted(edges.items(), key=lambda e: (-e[1], e[0]))
+    if top:
+        # The N heaviest caller -> callee edges trace the hottest paths; with no edges, the N hottest functions.
+        ranked = ranked[:top]
+        keep = {n for edge, _ in ranked for n in edge} or set(hot[:top])
+    else: keep = set(hot)
+    def node_id(node):
+        rel, qname = node
+        return (qname if len(owners[qname]) == 1 else f'{Path(rel).stem}.{qname}').replace('.', '_')
+    def band(seconds): return next(b for b in _PROFILE_BANDS if seconds / total >= b[0])
+
+    lines = ['graph TD', f'    %% {len(cum)} of {len(raw)} profiled functions mapped onto the static call graph'
+                         f' ({unmapped} outside the scanned sources); {total:.3f}s total profiled time',
+             '    %% edges: cumulative seconds of the callee under that caller; dotted = not in the static call graph']
+    for node in hot:
+        if node not in keep: continue
+        _, colour, width = band(cum[node])
+        lines.append(f'    {node_id(node)}["{node[1]}<br/>{cum[node]:.3f}s ({cum[node] / total:.0%})"]')
+        lines.append(f'    style {node_id(node)} stroke:{colour},stroke-width:{width}px')
+    for k, ((caller, callee), seconds) in enumerate(ranked):
+        arrow = '-->' if (caller[1], callee[1]) in static else '-.->'
+        _, colour, width = band(seconds)
+        lines.append(f'    {node_id(caller)} {arrow}|{seconds:.3f}s| {node_id(callee)}')
+        lines.append(f'    linkStyle {k} stroke:{colour},stroke-width:{width}px')
+    return root / 'docs/architecture/graphs/profile_graph.mmd', nl().join(lines)
+
 # --- MAIN VISUALIZE (v20.0 Multi-Mode) ---
-def visualize(target='.', focus=None, mode='file', entry=None):
+def visualize(target='.', focus=None, mode='file', entry=None, use_cache=True, jobs='auto', depth=1, direction='both',
+              callers=False, max_depth=None, collapse_depth=None, shard=False, pstats_file=None, top=None, stats=None,
+              trace_memory=False):
+    # `stats`, when a dict, is filled with phase timings and counters (see _new_stats / _format_stats).
+    # trace_memory adds the tracemalloc peak; tracing slows parsing several times over, so phase timings
+    # are only trustworthy without it. Peak RSS is always recorded and costs nothing.
+    args = (target, focus, mode, entry, use_cache, jobs, depth, direction, callers, max_depth, collapse_depth, shard,
+            pstats_file, top)
+    if stats is None: return _visualize(*args)
+    import tracemalloc
+    stats.update(_new_stats())
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    if tracing: tracemalloc.start()
+    started = time.perf_counter()
+    try: return _visualize(*args, stats=stats)
+    finally:
+        total = time.perf_counter() - started
+        phases = stats['phases']
+        phases['render'] = max(0.0, total - sum(phases.values()))  # builders + writes: everything not timed above
+        phases['total'] = total
+        for name in phases: phases[name] = round(phases[name], 6)
+        stats['peak_rss_bytes'] = _peak_rss()
+        if trace_memory: stats['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        if tracing: tracemalloc.stop()
+
+def _visualize(target, focus, mode, entry, use_cache, jobs, depth, direction, callers, max_depth, collapse_depth, shard,
+               pstats_file=None, top=None, stats=None):
     root = Path(target).resolve()
+    if focus and (collapse_depth or shard): return '❌ --collapse-depth and --shard apply to the full file graph, not --focus'
+    if mode == 'profile':
+        if focus: return '❌ --focus is not supported with --mode profile'
+        if not pstats_file: return '❌ --mode profile needs --pstats FILE (a cProfile / pstats dump)'
+        try: profile = _load_pstats(pstats_file)
+        except Exception as ex: return f'❌ Cannot read profile {pstats_file}: {ex}'
+    started = time.perf_counter()
     all_files, module_index, file_to_node = _scan_files(root)
+    _add_phase(stats, 'discovery', started)
+    if focus and mode in ('file', 'class'):
+        return _visualize_focus(root, all_files, module_index, file_to_node, focus, mode, use_cache, jobs, depth, direction,
+                                stats)
+    facts = _load_facts(root, all_files, use_cache, jobs, stats, imports_only=mode == 'file')
+    _count_facts(stats, facts)
 
+    if mode == 'all':
+        # One extraction pass feeds all three graphs
+        if focus: return '❌ --focus is not supported with --mode all'
+        graphs = _render_graphs(root, ('file', 'class', 'call'), all_files, module_index, file_to_node, facts,
+                                entry=entry, callers=callers, max_depth=max_depth, collapse_depth=collapse_depth, shard=shard,
+                                stats=stats)
+        return _write_graphs(root, graphs)
     if mode == 'class':
-        dest, content = _build_class_graph(root, all_files, focus)
+        dest, content = _build_class_graph(root, all_files, facts, focus)
     elif mode == 'call':
-        dest, content = _build_call_graph(root, all_files, focus, entry)
+        dest, content = _build_call_graph(root, all_files, facts, focus, entry, callers, max_depth)
+    elif mode == 'profile':
+        dest, content = _build_profile_graph(root, all_files, facts, profile, top)
+    else:
+        graphs = _render_graphs(root, ('file',), all_files, module_index, file_to_node, facts,
+                                collapse_depth=collapse_depth, shard=shard, stats=stats)
+        return _write_graphs(root, graphs, quiet_json=True)
+    return _write_graph(dest, content)
+
+def _visualize_focus(root, all_files, module_index, file_to_node, focus, mode, use_cache, jobs, depth, direction,
+                     stats=None):
+    # File and class focus parse only what they render: the import neighbourhood, or the matching files.
+    # Call focus still needs every function to resolve callees, so it takes the full path.
+    facts, load, flush = _fact_loader(root, use_cache, jobs, stats, imports_only=mode == 'file')
+    if mode == 'class':
+        load([p for p in all_files if focus in str(p.relative_to(root))])
+        dest, content = _build_class_graph(root, all_files, facts, focus)
     else:
-        dest, content = _build_file_graph(root, all_files, module_index, file_to_node, focus)
-        if dest is None: return content  # error message
+        dest, content = _lazy_file_focus(root, all_files, module_index, file_to_node, focus, depth, direction, facts, load,
+                                         stats)
+    flush()
+    _count_facts(stats, facts)
+    if dest is None: return content  # error message
+    return _write_graph(dest, content)
+
+def _count_facts(stats, facts):
+    if stats is None: return
+    stats['graph'].update(classes=sum(len(f.get('classes', ())) for f in facts.values() if f),
+                          functions=sum(len(f.get('funcs', ())) for f in facts.values() if f))
+
+def _render_graphs(root, modes, all_files, module_index, file_to_node, facts, entry=None, callers=False, max_depth=None,
+                   collapse_depth=None, shard=False, stats=None):
+    # Unfocused [(dest, content)] for each requested mode, in file/class/call order.
+    graphs = []
+    if 'file' in modes:
+        graph = _build_import_graph(all_files, module_index, file_to_node, facts, stats)
+        if collapse_depth: graphs.append(_build_collapsed_graph(root, graph, collapse_depth))
+        else: graphs.append(_build_file_graph(root, graph, None))
+        graphs.append(_build_file_json(root, graph))
+        if shard: graphs.extend(_build_shards(root, graph, collapse_depth or 1))
+    if 'class' in modes: graphs.append(_build_class_graph(root, all_files, facts, None))
+    if 'call' in modes: graphs.append(_build_call_graph(root, all_files, facts, None, entry, callers, max_depth))
+    return graphs
 
+def _write_graphs(root, graphs, quiet_json=False):
+    # Writes every graph; shards are summarised in one line and stale shard files removed.
+    shard_dir = root / 'docs/architecture/graphs/shards'
+    msgs, shards = [], set()
+    for dest, content in graphs:
+        msg = _write_graph(dest, content)
+        if dest.parent == shard_dir: shards.add(dest)
+        elif not (quiet_json and dest.suffix == '.json'): msgs.append(msg)
+    if shards:
+        for stale in shard_dir.glob('*.mmd'):
+            if stale not in shards: stale.unlink()
+        msgs.append(f'✅ Shards: {len(shards) - 1} packages + index.mmd in {shard_dir}')
+    return nl().join(msgs)
+
+def _write_graph(dest, content):
     if not dest.parent.exists(): dest.parent.mkdir(parents=True, exist_ok=True)
     dest.write_text(content, encoding='utf-8')
     return f'✅ Graph: {dest}'
 
+# --- STATS (--stats / --stats-json) ---
+_STAT_PHASES = ('discovery', 'read', 'parse', 'cache_write', 'resolve', 'render', 'total')
+
+def _new_stats():
+    return {'phases': {}, 'files': {'scanned': 0, 'skipped': 0, 'parse_failures': 0, 'cache_hits': 0, 'cache_misses': 0},
+            'graph': {'nodes': 0, 'edges': 0, 'imports': 0, 'classes': 0, 'functions': 0},
+            'skipped': [], 'parse_failures': [], 'peak_rss_bytes': None, 'peak_memory_bytes': None}
+
+def _peak_rss():
+    # Process-lifetime peak resident set size in bytes; None where the resource module is missing (Windows)
+    try:
+        import resource
+    except ImportError: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # macOS reports bytes, Linux kilobytes
+
+def _add_phase(stats, name, started):
+    if stats is not None: stats['phases'][name] = stats['phases'].get(name, 0.0) + time.perf_counter() - started
+
+def _format_stats(stats):
+    f, g = stats['files'], stats['graph']
+    lines = ['📊 Visualize stats', '| Phase | Seconds |', '|-------|---------|']
+    lines += [f'| {name} | {stats["phases"][name]:.3f} |' for name in _STAT_PHASES if name in stats['phases']]
+    lines += [
+        f"Files: {f['scanned']} scanned, {f['skipped']} skipped, {f['parse_failures']} parse failures"
+        + (f", {f['prefiltered']} byte-searched for importers" if 'prefiltered' in f else ''),
+        f"Cache: {f['cache_hits']} hits, {f['cache_misses']} misses",
+        f"Graph: {g['nodes']} nodes, {g['edges']} edges ({g['imports']} imports), {g['classes']} classes, {g['functions']} functions",
+    ]
+    if stats['peak_rss_bytes'] is not None: lines.append(f"Peak RSS: {stats['peak_rss_bytes'] / 1048576:.1f} MiB")
+    if stats['peak_memory_bytes'] is not None:
+        lines.append(f"Peak memory (tracemalloc; timings include its overhead): {stats['peak_memory_bytes'] / 1048576:.1f} MiB")
+    for key, label, field in (('parse_failures', 'Parse failures', 'error'), ('skipped', 'Skipped', 'reason')):
+        if stats[key]: lines += [f'{label}:'] + [f"  - {item['path']}: {item[field]}" for item in stats[key]]
+    return nl().join(lines)
+
+# --- WATCH (long-running; keeps per-file facts in memory) ---
+_WATCH_PIDFILE = '.claude/pactkit_cache/visualize_watch.pid'
+_WATCH_RESCAN_EVERY = 20  # polls between full tree rescans, as a safety net for missed new files
+
+def _dir_stamps(root, all_files):
+    # A new or removed file bumps its parent directory's mtime, so polling these
+    # is enough to know when the file list itself needs a rescan.
+    stamps = {}
+    for d in {root, *(p.parent for p in all_files)}:
+        try: stamps[d] = d.stat().st_mtime_ns
+        except OSError: stamps[d] = None
+    return stamps
+
+def watch(target='.', mode='all', interval=0.3, jobs='auto', max_cycles=None):
+    # Poll mtimes (stdlib only) and rewrite the graphs whose content changed.
+    # Stops when the pidfile is removed (see watch_stop) or after max_cycles polls.
+    root = Path(target).resolve()
+    pidfile = root / _WATCH_PIDFILE
+    if pidfile.exists():
+        try:
+            pid = int(pidfile.read_text(encoding='utf-8').strip())
+            if pid != os.getpid():
+                os.kill(pid, 0)
+                return f'❌ Watch already running (pid {pid})'
+        except (ValueError, OSError): pass  # stale pidfile
+    _ensure_cache_dir(root)
+    pidfile.write_text(str(os.getpid()), encoding='utf-8')
+    modes = ('file', 'class', 'call') if mode == 'all' else (mode,)
+    entries = _read_cache(root)
+    written = {}  # {dest: content} last written by this watcher
+    scan, dirs = None, None
+    cycle = 0
+    try:
+        while pidfile.exists():
+            if scan is None or cycle % _WATCH_RESCAN_EVERY == 0 or _dir_stamps(root, scan[0]) != dirs:
+                scan = _scan_files(root)
+                dirs = _dir_stamps(root, scan[0])
+            all_files, module_index, file_to_node = scan
+            entries, facts, dirty = _refresh_facts(root, all_files, entries, jobs, imports_only=mode == 'file')
+            if dirty or not written:
+                for dest, content in _render_graphs(root, modes, all_files, module_index, file_to_node, facts):
+                    if written.get(dest) == content: continue
+                    written[dest] = content
+                    print(_write_graph(dest, content), flush=True)
+            cycle += 1
+            if max_cycles is not None and cycle >= max_cycles: break
+            time.sleep(interval)
+    except KeyboardInterrupt: pass
+    finally:
+        try: _write_cache(root, entries)
+        except OSError: pass
+        try:
+            if pidfile.read_text(encoding='utf-8').strip() == str(os.getpid()): pidfile.unlink()
+        except OSError: pass
+    return '✅ Watch stopped'
+
+def watch_stop(target='.'):
+    pidfile = Path(target).resolve() / _WATCH_PIDFILE
+    if not pidfile.exists(): return '⚠️ Watch is not running'
+    pidfile.unlink()
+    return '✅ Watch stop requested'
+
+# --- QUERY (answers from code_graph.json, no source parsing) ---
+def _load_graph_json(root):
+    path = root / 'docs/architecture/graphs/code_graph.json'
+    if not path.exists(): return None
+    try: return json.loads(path.read_text(encoding='utf-8'))
+    except ValueError: return None
+
+def _match_nodes(nodes, name):
+    # Exact path/module/id first, then path suffix, then substring (same as --focus).
+    exact = [n for n in nodes if name in (n['path'], n['module'], n['id'])]
+    if exact: return exact
+    suffix = [n for n in nodes if n['path'].endswith(name)]
+    return suffix or [n for n in nodes if name in n['path']]
+
+def query(target='.', importers=None, imports=None, fan_in_top=None):
+    root = Path(target).resolve()
+    data = _load_graph_json(root)
+    if data is None: return '❌ No code_graph.json found. Run `visualize` first.'
+    nodes = data['nodes']
+    by_id = {n['id']: n for n in nodes}
+    if fan_in_top is not None:
+        ranked = sorted(nodes, key=lambda n: (-n['fan_in'], n['path']))[:fan_in_top]
+        return nl().join(f"{n['path']} | {n['fan_in']}" for n in ranked)
+    name = importers if importers is not None else imports
+    if name is None: return '❌ Specify --importers, --imports or --fan-in-top'
+    matched = _match_nodes(nodes, name)
+    if not matched: return f"❌ Module '{name}' not found in code_graph.json"
+    ids = {n['id'] for n in matched}
+    if importers is not None:
+        found = {e['source'] for e in data['edges'] if e['target'] in ids}
+    else:
+        found = {e['target'] for e in data['edges'] if e['source'] in ids}
+    return nl().join(sorted(by_id[i]['path'] for i in found if i in by_id))
+
+# --- DIFF (structural comparison of architecture snapshots) ---
+_FLOW_NODE_RE = re.compile(r'^\s*(\S+?)\["(.*)"\]\s*$')
+_FLOW_CLICK_RE = re.compile(r'^\s*click\s+(\S+)\s+href\s+"(.*)"\s*$')
+_FLOW_EDGE_RE = re.compile(r'^\s*(\S+)\s+-->\s+(\S+)\s*$')
+_CLASS_DECL_RE = re.compile(r'^\s*class\s+(\S+)\s*\{')
+_CLASS_INHERIT_RE = re.compile(r'^\s*(\S+)\s+<\|--\s+(\S+)\s*$')
+
+def _snapshot_file(root, version, name):
+    # 'current' compares against the live graphs instead of a saved snapshot.
+    if version == 'current': return root / 'docs/architecture/graphs' / name
+    return root / 'docs/architecture/snapshots' / f'{version}_{name}'
+
+def _parse_flowchart(text):
+    # (nodes, edges) keyed by the most stable name available: click href, then label, then id.
+    labels, hrefs, raw_edges = {}, {}, []
+    for line in text.splitlines():
+        m = _FLOW_CLICK_RE.match(line)
+        if m: hrefs[m.group(1)] = m.group(2); continue
+        m = _FLOW_EDGE_RE.match(line)
+        if m: raw_edges.append((m.group(1), m.group(2))); continue
+        m = _FLOW_NODE_RE.match(line)
+        if m: labels[m.group(1)] = m.group(2)
+    name = lambda nid: hrefs.get(nid) or labels.get(nid) or nid
+    return {name(nid) for nid in labels}, {(name(a), name(b)) for a, b in raw_edges}
+
+def _load_file_graph(root, version):
+    # {'nodes': set(paths), 'edges': set((src, dst)), 'fan_in': {path: n}} from the JSON twin, else the .mmd.
+    path = _snapshot_file(root, version, 'code_graph.json')
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+            by_id = {n['id']: n['path'] for n in data['nodes']}
+            edges = {(by_id.get(e['source'], e['source']), by_id.get(e['target'], e['target'])) for e in data['edges']}
+            return {'nodes': set(by_id.values()), 'edges': edges, 'fan_in': {n['path']: n['fan_in'] for n in data['nodes']}}
+        except (ValueError, KeyError, TypeError): pass
+    path = _snapshot_file(root, version, 'code_graph.mmd')
+    if not path.exists(): return None
+    nodes, edges = _parse_flowchart(path.read_text(encoding='utf-8'))
+    fan_in = dict.fromkeys(nodes, 0)
+    for _, dst in edges: fan_in[dst] = fan_in.get(dst, 0) + 1
+    return {'nodes': nodes, 'edges': edges, 'fan_in': fan_in}
+
+def _load_class_graph(root, version):
+    path = _snapshot_file(root, version, 'class_graph.mmd')
+    if not path.exists(): return None
+    classes, inherits = set(), set()
+    for line in path.read_text(encoding='utf-8').splitlines():
+        m = _CLASS_DECL_RE.match(line)
+        if m: classes.add(m.group(1)); continue
+        m = _CLASS_INHERIT_RE.match(line)
+        if m: inherits.add((m.group(1), m.group(2)))
+    return {'nodes': classes, 'edges': inherits}
+
+def _load_call_graph(root, version):
+    path = _snapshot_file(root, version, 'call_graph.mmd')
+    if not path.exists(): return None
+    nodes, edges = _parse_flowchart(path.read_text(encoding='utf-8'))
+    return {'nodes': nodes, 'edges': edges}
+
+def _diff_section(title, old, new, fmt=str):
+    added, removed = sorted(new - old), sorted(old - new)
+    lines = [f'### {title} (+{len(added)} / -{len(removed)})']
+    lines += [f'+ {fmt(x)}' for x in added] + [f'- {fmt(x)}' for x in removed]
+    return lines
+
+def diff(target='.', old=None, new='current'):
+    # Set differences over nodes and edges, so cost is linear in graph size and
+    # independent of Mermaid line order.
+    root = Path(target).resolve()
+    a, b = _load_file_graph(root, old), _load_file_graph(root, new)
+    if a is None or b is None:
+        return f"❌ No code graph snapshot for '{old if a is None else new}' in docs/architecture/snapshots/"
+    edge = lambda e: f'{e[0]} --> {e[1]}'
+    lines = [f'## Architecture diff: {old} -> {new}', '']
+    lines += _diff_section('Modules', a['nodes'], b['nodes']) + ['']
+    lines += _diff_section('Import edges', a['edges'], b['edges'], edge) + ['']
+    changed = sorted(m for m in a['nodes'] & b['nodes'] if a['fan_in'].get(m, 0) != b['fan_in'].get(m, 0))
+    lines.append(f'### Fan-in changes ({len(changed)})')
+    lines += [f"{m}: {a['fan_in'].get(m, 0)} -> {b['fan_in'].get(m, 0)}" for m in changed]
+    for kind, loader, node_title, edge_title, edge_fmt in (
+            ('class', _load_class_graph, 'Classes', 'Inheritance', lambda e: f'{e[0]} <|-- {e[1]}'),
+            ('call', _load_call_graph, 'Functions', 'Call edges', edge)):
+        ga, gb = loader(root, old), loader(root, new)
+        lines.append('')
+        if ga is None and gb is None: continue
+        if ga is None or gb is None:
+            lines.append(f"⚠️ {kind}_graph.mmd missing for '{old if ga is None else new}'; {kind} diff skipped")
+            continue
+        lines += _diff_section(node_title, ga['nodes'], gb['nodes']) + ['']
+        lines += _diff_section(edge_title, ga['edges'], gb['edges'], edge_fmt)
+    return nl().join(lines).rstrip()
+
+# --- CYCLES (strongly connected components + optional layer order) ---
+_LAYERS_FILE = 'docs/architecture/governance/layers.md'
+_LAYER_ITEM_RE = re.compile(r'^\s*(?:[-*]|\d+\.)\s+`?([\w .-]+?)`?\s*:\s*(.+)$')
+
+def _tarjan_scc(adj):
+    # Iterative Tarjan over {node: {neighbour: None}}; O(V + E), no recursion limit.
+    index, low, on_stack, stack, sccs = {}, {}, set(), [], []
+    counter = 0
+    for start in adj:
+        if start in index: continue
+        work = [(start, iter(adj.get(start, ())))]
+        index[start] = low[start] = counter; counter += 1
+        stack.append(start); on_stack.add(start)
+        while work:
+            node, it = work[-1]
+            for nxt in it:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter; counter += 1
+                    stack.append(nxt); on_stack.add(nxt)
+                    work.append((nxt, iter(adj.get(nxt, ()))))
+                    break
+                if nxt in on_stack: low[node] = min(low[node], index[nxt])
+            else:
+                work.pop()
+                if work: low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    scc = []
+                    while True:
+                        m = stack.pop(); on_stack.discard(m); scc.append(m)
+                        if m == node: break
+                    sccs.append(scc)
+    return sccs
+
+def _back_edges(adj, members):
+    # DFS back edges inside one SCC: removing them all leaves it acyclic.
+    inside, state, cut = set(members), {}, []
+    for start in sorted(members):
+        if start in state: continue
+        state[start] = 1
+        work = [(start, iter(sorted(m for m in adj.get(start, ()) if m in inside)))]
+        while work:
+            node, it = work[-1]
+            for nxt in it:
+                if state.get(nxt) == 1: cut.append((node, nxt))
+                elif nxt not in state:
+                    state[nxt] = 1
+                    work.append((nxt, iter(sorted(m for m in adj.get(nxt, ()) if m in inside))))
+                    break
+            else:
+                state[node] = 2
+                work.pop()
+    return cut
+
+def _read_layers(root):
+    # [(layer name, [path globs])], top layer first; a layer may only import itself or layers below it.
+    path = root / _LAYERS_FILE
+    if not path.exists(): return []
+    layers = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        m = _LAYER_ITEM_RE.match(line)
+        if m: layers.append((m.group(1).strip(), [g.strip().strip('`') for g in m.group(2).split(',') if g.strip()]))
+    return layers
+
+def cycles(target='.'):
+    import fnmatch
+    root = Path(target).resolve()
+    all_files, module_index, file_to_node = _scan_files(root)
+    facts = _load_facts(root, all_files, imports_only=True)
+    graph = _build_import_graph(all_files, module_index, file_to_node, facts)
+    adj = graph.fwd
+    rels = [f.relative_to(root).as_posix() for f in all_files]
+    counts = {(a, b): n for a, b, n in graph.edges()}
+    lines = []
+    found = sorted(sorted(scc) for scc in _tarjan_scc(adj) if len(scc) > 1)  # file index order == path order
+    for i, scc in enumerate(found, 1):
+        lines.append(f'### Cycle {i} ({len(scc)} modules)')
+        lines.extend(f'- {rels[m]}' for m in scc)
+        cut = sorted(_back_edges(adj, scc), key=lambda e: (counts[e], e))
+        lines.append('Suggested cut: ' + ', '.join(f'{rels[a]} --> {rels[b]} ({counts[(a, b)]}x)' for a, b in cut))
+        lines.append('')
+    layers = _read_layers(root)
+    violations = []
+    if layers:
+        def layer_of(rel):
+            for rank, (_, globs) in enumerate(layers):
+                if any(fnmatch.fnmatch(rel, g) for g in globs): return rank
+            return None
+        rank = [layer_of(rel) for rel in rels]
+        for (a, b) in counts:
+            if rank[a] is not None and rank[b] is not None and rank[b] < rank[a]:
+                violations.append(f'- {layers[rank[a]][0]} -> {layers[rank[b]][0]}: {rels[a]} --> {rels[b]}')
+        if violations: lines += [f'### Layer violations ({len(violations)})'] + sorted(violations) + ['']
+    summary = f'{len(rels)} modules, {len(counts)} edges' + (f', {len(layers)} layers' if layers else '')
+    if not found and not violations: return f'✅ No import cycles or layer violations ({summary})'
+    head = f'❌ {len(found)} import cycles, {len(violations)} layer violations ({summary})'
+    return nl().join([head, ''] + lines).rstrip()
+
+# --- IMPACT (test selection from the reverse-import closure) ---
+_TEST_MAP = {  # mirrors test_map_pattern in LANG_PROFILES
+    '.py': 'tests/unit/test_{module}.py',
+    '.ts': '__tests__/{module}.test.ts',
+    '.go': '{package}/{module}_test.go',
+    '.java': 'src/test/java/{package}/{module}Test.java',
+}
+# Changes to these affect every test, so selection gives up and asks for the full suite
+_INFRA_FILES = {'conftest.py', 'pytest.ini', 'tox.ini', 'noxfile.py', 'setup.cfg', 'setup.py', 'pyproject.toml',
+                'package.json', 'go.mod', 'pom.xml', 'build.gradle', 'pactkit.yaml'}
+
+def _git_changed(root, since):
+    # Paths (relative to root) changed since `since`, plus untracked files; None if git fails.
+    try:
+        diff = subprocess.run(['git', 'diff', '--name-only', '--no-renames', '--relative', since], cwd=root,
+                              capture_output=True, text=True)
+        new = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'], cwd=root, capture_output=True, text=True)
+    except OSError: return None
+    if diff.returncode != 0: return None
+    return list(dict.fromkeys(ln for ln in (diff.stdout + new.stdout).splitlines() if ln))
+
+def _is_infra(rel):
+    name = rel.rsplit('/', 1)[-1]
+    return name in _INFRA_FILES or (name.startswith('requirements') and name.endswith('.txt'))
+
+def _is_test_file(rel):
+    name = rel.rsplit('/', 1)[-1]
+    return (name.startswith('test_') and name.endswith('.py')) or name.endswith(('_test.py', '_test.go', 'Test.java', '.test.ts'))
+
+def _mapped_test(root, rel):
+    rel = Path(rel)
+    pattern = _TEST_MAP.get(rel.suffix)
+    if not pattern: return None
+    package = '' if rel.parent == Path('.') else rel.parent.as_posix()
+    if rel.suffix == '.java': package = package.split('src/main/java/', 1)[-1]
+    candidate = pattern.format(module=rel.stem, package=package).lstrip('/')
+    return candidate if (root / candidate).is_file() else None
+
+def _module_names(rel):
+    # Dotted names a Python file is importable as, with and without a leading src/ (see _scan_files).
+    parts = list(Path(rel).with_suffix('').parts)
+    if parts and parts[-1] == '__init__': parts.pop()
+    names = ['.'.join(parts)] if parts else []
+    if len(parts) > 1 and parts[0] == 'src': names.append('.'.join(parts[1:]))
+    return names
+
+def _names_module(imported, names):
+    # imported names the module, a submodule of it, or a package it lives in (`from a import b` records `a`)
+    return any(imported == n or imported.startswith(n + '.') or n.startswith(imported + '.') for n in names)
+
+def impacted(target='.', since='HEAD'):
+    # Tests to run for the changes since `since`: mapped tests of every changed file and of
+    # everything that transitively imports one. Prints ALL when infrastructure files changed.
+    # Errs towards selecting more: callers skip whatever is not printed.
+    root = Path(target).resolve()
+    changed = _git_changed(root, since)
+    if changed is None: return f"❌ git diff against '{since}' failed"
+    if any(_is_infra(c) for c in changed): return 'ALL'
+    deleted = [c for c in changed if Path(c).suffix in _LANG_BY_SUFFIX and not (root / c).exists()]
+    if any(not c.endswith('.py') for c in deleted): return 'ALL'  # path-resolved stacks lose the edge entirely
+    all_files, module_index, file_to_node = _scan_files(root)
+    facts = _load_facts(root, all_files, imports_only=True)
+    graph = _build_import_graph(all_files, module_index, file_to_node, facts)
+    index = {p: i for i, p in enumerate(all_files)}
+    seeds = [index[root / c] for c in changed if (root / c) in index]
+    for c in changed:
+        if not c.endswith('.py'): continue
+        # `from pkg import mod` resolves to pkg/__init__.py, so a module's importers may only reach its packages
+        for parent in (root / c).parents:
+            if parent == root: break
+            if parent / '__init__.py' in index: seeds.append(index[parent / '__init__.py'])
+    if deleted:  # importers of a removed module no longer resolve to it: match them by name
+        names = [n for c in deleted for n in _module_names(c)]
+        seeds += [i for i, p in enumerate(all_files)
+                  if any(_names_module(m, names) for m in (facts.get(p) or {}).get('imports', ()))]
+    closure, _ = _neighbourhood(None, graph.rev, seeds, depth=len(all_files), direction='in')
+    tests = {c for c in changed if _is_test_file(c) and (root / c).is_file()}
+    for rel in changed + [all_files[i].relative_to(root).as_posix() for i in closure]:
+        t = _mapped_test(root, rel)
+        if t: tests.add(t)
+    return ' '.join(sorted(tests))
+
+# --- FLAME (folded stacks + offline SVG flamegraph) ---
+_FLAME_DIR = 'docs/architecture/graphs'
+_FLAME_MIN_SHARE = 0.001  # pstats expansion: drop branches below 0.1% of profiled time
+_FLAME_MAX_DEPTH = 128
+
+# Runs `python <args>` under sys.setprofile and writes exact folded stacks (microseconds of self time)
+# to argv[1]. Passed to `python -c`, so it must stay self-contained.
+_FLAME_BOOTSTRAP = r'''
+import os, runpy, sys, threading, time
+out, argv = sys.argv[1], sys.argv[2:]
+cwd = os.getcwd() + os.sep
+totals, labels, states, armed = {}, {}, {}, [False]
+
+def label(code):
+    name = labels.get(code)
+    if name is None:
+        path = code.co_filename
+        path = path[len(cwd):] if path.startswith(cwd) else '/'.join(path.replace(os.sep, '/').split('/')[-2:])
+        name = labels[code] = f'{code.co_name} ({path}:{code.co_firstlineno})'.replace(';', ':')
+    return name
+
+def hook(frame, event, arg):
+    if not armed[0]: return
+    now = time.perf_counter()
+    state = states.get(threading.get_ident())
+    if state is None: state = states[threading.get_ident()] = [[], now]
+    stack = state[0]
+    if stack: totals[stack[-1]] = totals.get(stack[-1], 0.0) + now - state[1]
+    if event == 'call': stack.append((stack[-1] + ';' if stack else '') + label(frame.f_code))
+    elif event == 'c_call': stack.append((stack[-1] + ';' if stack else '') + getattr(arg, '__qualname__', '?'))
+    elif stack: stack.pop()
+    state[1] = time.perf_counter()
+
+code = 0
+sys.setprofile(hook)
+threading.setprofile(hook)
+try:
+    if argv[0] == '-m':
+        sys.argv = argv[1:]
+        sys.path.insert(0, os.getcwd())
+        armed[0] = True
+        runpy.run_module(argv[1], run_name='__main__', alter_sys=True)
+    else:
+        sys.argv = argv
+        sys.path.insert(0, os.path.dirname(os.path.abspath(argv[0])))
+        armed[0] = True
+        runpy.run_path(argv[0], run_name='__main__')
+except SystemExit as ex:
+    code = ex.code if isinstance(ex.code, int) else (0 if ex.code is None else 1)
+finally:
+    armed[0] = False
+    sys.setprofile(None)
+    threading.setprofile(None)
+    folded = {}
+    for stack, seconds in totals.items():
+        frames = stack.split(';')
+        while frames and 'runpy' in frames[0]: frames.pop(0)  # start at the target, not runpy
+        if not frames: continue
+        key = ';'.join(frames)
+        folded[key] = folded.get(key, 0.0) + seconds
+    with open(out, 'w', encoding='utf-8') as f:
+        for stack, seconds in folded.items():
+            if round(seconds * 1e6): f.write(f'{stack} {round(seconds * 1e6)}\n')
+sys.exit(code)
+'''
+
+def _pstats_frame(key, root):
+    filename, line, name = key
+    if filename == '~': return name.replace(';', ':')
+    p = Path(filename)
+    try: short = p.resolve().relative_to(root).as_posix()
+    except (ValueError, OSError): short = '/'.join(p.parts[-2:])
+    return f'{name} ({short}:{line})'.replace(';', ':')
+
+def _pstats_folded(raw, root):
+    # pstats keeps caller -> callee totals, not stacks: each function's time on a path is its callers'
+    # share of it (the usual gprof-style approximation). Recursion is cut at the first repeat, and
+    # branches below _FLAME_MIN_SHARE stay in their parent's width.
+    children = {}
+    for key, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            if caller in raw and caller != key:
+                children.setdefault(caller, []).append((key, edge[3] if isinstance(edge, tuple) else 0.0))
+    total = sum(v[2] for v in raw.values()) or 1.0
+    folded, frames = {}, {}
+    def frame(key):
+        if key not in frames: frames[key] = _pstats_frame(key, root)
+        return frames[key]
+    def walk(key, path, seconds, on_path):
+        ct = raw[key][3]
+        share = min(1.0, seconds / ct) if ct else 0.0
+        stack = f'{path};{frame(key)}' if path else frame(key)
+        self_time = raw[key][2] * share
+        if len(on_path) < _FLAME_MAX_DEPTH:
+            for child, edge_ct in sorted(children.get(key, ()), key=lambda c: frame(c[0])):
+                t = edge_ct * share
+                if child in on_path or t < total * _FLAME_MIN_SHARE: self_time += t
+                else: walk(child, stack, t, on_path | {child})
+        folded[stack] = folded.get(stack, 0.0) + self_time
+    # Roots are frames with time no caller accounts for: builtins.exec runs the top-level code but is
+    # also called by importlib, so "has no callers" would leave nothing to start from.
+    roots = {}
+    for key, (_, _, _, ct, callers) in raw.items():
+        attributed = sum(e[3] for c, e in callers.items() if c in raw and c != key and isinstance(e, tuple))
+        if ct - attributed >= total * _FLAME_MIN_SHARE: roots[key] = ct - attributed
+    if not roots and raw:
+        top = max(v[3] for v in raw.values())
+        roots = {key: v[3] for key, v in raw.items() if v[3] == top}
+    for key in sorted(roots, key=frame): walk(key, '', roots[key], {key})
+    return [f'{stack} {round(seconds * 1e6)}' for stack, seconds in folded.items() if round(seconds * 1e6)]
+
+def _parse_folded(lines):
+    # {frame: [total, {child frame: ...}]} tree, plus the grand total
+    tree, total = {}, 0
+    for line in lines:
+        stack, _, count = line.rpartition(' ')
+        try: count = int(count)
+        except ValueError: continue
+        if not stack or count <= 0: continue
+        total += count
+        level = tree
+        for name in stack.split(';'):
+            node = level.setdefault(name, [0, {}])
+            node[0] += count
+            level = node[1]
+    return tree, total
+
+def _flame_svg(lines, title):
+    # Self-contained flamegraph: root at the bottom, widths proportional to samples, hover titles.
+    tree, total = _parse_folded(lines)
+    width, pad, row, font = 1200, 10, 16, 11
+    # Stacks can be thousands of frames deep (recursion), so both tree walks use explicit stacks.
+    depth, todo = 0, [(tree, 0)]
+    while todo:
+        level, d = todo.pop()
+        if level: depth = max(depth, d + 1)
+        todo.extend((node[1], d + 1) for node in level.values())
+    height = depth * row + 3 * pad + 2 * row
+    scale = (width - 2 * pad) / (total or 1)
+    esc = lambda s: s.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}"'
+           f' font-family="Verdana, sans-serif" font-size="{font}">',
+           '<rect width="100%" height="100%" fill="#fdfdf6"/>',
+           f'<text x="{width // 2}" y="{pad + row}" text-anchor="middle" font-size="{font + 4}">{esc(title)}</text>']
+    def frames(level, x, d):
+        # (name, value, kids, x, depth) for the frames wide enough to draw, in reverse for the stack
+        items = []
+        for name in sorted(level):
+            value, kids = level[name]
+            if value * scale >= 0.1: items.append((name, value, kids, x, d))
+            x += value * scale
+        return items[::-1]
+    todo = frames(tree, pad, 0)
+    while todo:
+        name, value, kids, x, d = todo.pop()
+        w = value * scale
+        y = height - pad - (d + 1) * row
+        h = int(hashlib.md5(name.encode('utf-8')).hexdigest()[:6], 16)
+        colour = f'rgb({205 + h % 50},{(h >> 8) % 230},{(h >> 16) % 55})'
+        label = f'{name} ({value} us, {value / total:.2%})'
+        out.append(f'<g><title>{esc(label)}</title><rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}"'
+                   f' fill="{colour}" rx="2"/>')
+        chars = int((w - 6) / (font * 0.6))
+        if chars >= 3:
+            text = name if len(name) <= chars else name[:chars - 2] + '..'
+            out.append(f'<text x="{x + 3:.1f}" y="{y + row - 4}">{esc(text)}</text>')
+        out.append('</g>')
+        todo.extend(frames(kids, x, d + 1))
+    out.append('</svg>')
+    return nl().join(out), total
+
+def flame(target='.', pstats_file=None, command=None, folded_file=None):
+    # Folded stacks (flame.folded) and an offline SVG flamegraph (flame.svg) from exactly one source:
+    # a pstats dump, an existing folded file, or a Python command run under sys.setprofile.
+    root = Path(target).resolve()
+    if command and command[0] == '--': command = command[1:]
+    if command and Path(command[0]).name.startswith('python'): command = command[1:]
+    if command and command[0] == 'pytest': command = ['-m'] + command
+    if len([s for s in (pstats_file, command, folded_file) if s]) != 1:
+        return '❌ flame needs exactly one of --pstats FILE, --folded FILE or -- <python args>'
+    dest = root / _FLAME_DIR / 'flame.folded'
+    msgs = []
+    if pstats_file:
+        try: raw = _load_pstats(pstats_file)
+        except Exception as ex: return f'❌ Cannot read profile {pstats_file}: {ex}'
+        lines = _pstats_folded(raw, root)
+        title = f'{Path(pstats_file).name} (pstats, stacks approximated from caller/callee totals)'
+        msgs.append(_write_graph(dest, nl().join(lines) + nl()))
+    elif folded_file:
+        try: lines = Path(folded_file).read_text(encoding='utf-8').splitlines()
+        except OSError as ex: return f'❌ Cannot read {folded_file}: {ex.strerror}'
+        title = Path(folded_file).name
+        if Path(folded_file).resolve() != dest: msgs.append(_write_graph(dest, nl().join(lines) + nl()))
+    else:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists(): dest.unlink()
+        result = subprocess.run([sys.executable, '-c', _FLAME_BOOTSTRAP, str(dest), *command], cwd=root)
+        if not dest.exists(): return f'❌ Command produced no profile (exit code {result.returncode})'
+        if result.returncode: msgs.append(f'⚠️ Command exited with {result.returncode}; stacks cover the run up to that point')
+        lines = dest.read_text(encoding='utf-8').splitlines()
+        title = ' '.join(['python'] + command)
+        msgs.append(f'✅ Graph: {dest}')
+    svg, total = _flame_svg(lines, title)
+    msgs.append(_write_graph(root / _FLAME_DIR / 'flame.svg', svg))
+    msgs.append(f'   {len(lines)} stacks, {total / 1e6:.3f}s')
+    return nl().join(msgs)
+
+# --- IMPORTTIME (python -X importtime timings on the file graph) ---
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)\s*$')
+_IMPORTTIME_ROOT = 'importtime_cmd'
+
+def _parse_importtime(text):
+    # -X importtime prints each module after its imports (post-order), indented 2 spaces per level:
+    # [{'name', 'self', 'cum' (microseconds), 'children': [...]}] for the top-level imports.
+    stack = []  # (level, node)
+    for line in text.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m: continue
+        level = len(m.group(3)) // 2
+        node = {'name': m.group(4), 'self': int(m.group(1)), 'cum': int(m.group(2)), 'children': []}
+        while stack and stack[-1][0] > level: node['children'].append(stack.pop()[1])
+        node['children'].reverse()
+        stack.append((level, node))
+    return [node for _, node in stack]
+
+def _ms(us): return f'{us / 1000:.1f}ms'
+
+def _build_importtime_graph(root, graph, module_index, tree, label, top=20):
+    # Project modules keep their code_graph ids; third-party/stdlib imports made directly by the command
+    # or a project module collapse into one node per top-level package, with everything below them inside.
+    file_ids = {p: graph.ids[i] for i, p in enumerate(graph.files)}
+    total = sum(n['cum'] for n in tree) or 1
+    nodes, edges = {}, {}  # {id: [label, cum, self]}, {(src id, dst id): cum}
+    # Package nodes are tracked by id, never by prefix: ext/util.py is the project node ext_util_py
+    external, taken = set(), set(file_ids.values())
+    def visit(entry, owner):
+        p = _resolve_python(entry['name'], module_index)  # unscanned submodules count towards their package
+        if p in file_ids:
+            nid = file_ids[p]
+            node = nodes.setdefault(nid, [p.relative_to(root).as_posix(), 0, 0])
+            node[2] += entry['self']
+        elif owner not in external:
+            pkg = entry['name'].split('.')[0]
+            nid = 'ext_' + re.sub(r'\W', '_', pkg)
+            while nid in taken: nid += '_'  # a project file id that happens to spell the same
+            external.add(nid)
+            node = nodes.setdefault(nid, [f'{pkg} (ext)', 0, 0])
+        else: nid = None  # inside a third-party import: counted in its top-level node
+        if nid:
+            node[1] += entry['cum']
+            edges[(owner, nid)] = edges.get((owner, nid), 0) + entry['cum']
+        for child in entry['children']: visit(child, nid or owner)
+    for entry in tree: visit(entry, _IMPORTTIME_ROOT)
+
+    static = {(graph.ids[i], graph.ids[j]) for i, j, _ in graph.edges()}
+    def band(us): return next(b for b in _PROFILE_BANDS if us / total >= b[0])
+    project = len(nodes) - len(external)
+    lines = ['graph TD', f'    %% {project} project modules and {len(nodes) - project} external packages imported;'
+                         f' {_ms(total)} total import time',
+             '    %% edges: cumulative import time charged to the first importer; dotted = not in the static import graph',
+             f'    {_IMPORTTIME_ROOT}(["{label}"])']
+    for nid in sorted(nodes, key=lambda n: (-nodes[n][1], n)):
+        name, cum, own = nodes[nid]
+        _, colour, width = band(cum)
+        detail = _ms(cum) if nid in external else f'{_ms(cum)} cum, {_ms(own)} self'
+        lines.append(f'    {nid}["{name}<br/>{detail}"]')
+        lines.append(f'    style {nid} stroke:{colour},stroke-width:{width}px')
+    ranked = sorted(edges.items(), key=lambda e: (-e[1], e[0]))
+    for k, ((src, dst), us) in enumerate(ranked):
+        arrow = '-->' if src == _IMPORTTIME_ROOT or dst in external or (src, dst) in static else '-.->'
+        _, colour, width = band(us)
+        lines.append(f'    {src} {arrow}|{_ms(us)}| {dst}')
+        lines.append(f'    linkStyle {k} stroke:{colour},stroke-width:{width}px')
+    # Static edges between imported project modules that cost nothing (the target was already loaded)
+    for src, dst in sorted(static - set(edges)):
+        if src in nodes and dst in nodes: lines.append(f'    {src} --> {dst}')
+
+    names = {nid: n[0] for nid, n in nodes.items()}
+    names[_IMPORTTIME_ROOT] = label
+    table = ['| # | Importer | Imported | Cumulative | Share |', '|---|----------|----------|------------|-------|']
+    for k, ((src, dst), us) in enumerate(ranked[:top], 1):
+        table.append(f'| {k} | `{names[src]}` | `{names[dst]}` | {_ms(us)} | {us / total:.0%} |')
+    return (root / 'docs/architecture/graphs/importtime_graph.mmd', nl().join(lines),
+            root / 'docs/architecture/graphs/importtime.md', nl().join(table))
+
+def importtime(target='.', command=None, top=20, use_cache=True):
+    # Run a Python command with import timing on (PYTHONPROFILEIMPORTTIME, i.e. -X importtime, which also
+    # reaches console scripts and subprocesses) and join the timings onto the file graph.
+    root = Path(target).resolve()
+    if command and command[0] == '--': command = command[1:]
+    if not command: return '❌ importtime needs a command: importtime -- <command>, e.g. -- -m pactkit --help'
+    if command[0] in ('-m', '-c') or command[0].endswith('.py'): command = [sys.executable] + command
+    env = dict(os.environ, PYTHONPROFILEIMPORTTIME='1')
+    try: result = subprocess.run(command, cwd=root, env=env, capture_output=True, text=True, errors='replace')
+    except OSError as ex: return f'❌ Cannot run {command[0]}: {ex.strerror}'
+    tree = _parse_importtime(result.stderr)
+    if not tree: return f'❌ No import timings in the output of {command[0]} (exit code {result.returncode}); is it a Python program?'
+
+    all_files, module_index, file_to_node = _scan_files(root)
+    facts = _load_facts(root, all_files, use_cache, imports_only=True)
+    graph = _build_import_graph(all_files, module_index, file_to_node, facts)
+    label = ' '.join(Path(command[0]).name if i == 0 else a for i, a in enumerate(command)).replace('"', "'")
+    dest, content, table_dest, table = _build_importtime_graph(root, graph, module_index, tree, label, top)
+    msgs = []
+    if result.returncode: msgs.append(f'⚠️ Command exited with {result.returncode}; timings cover the imports up to that point')
+    msgs.append(_write_graph(dest, content))
+    msgs.append(_write_graph(table_dest, f'# Most expensive imports: {label}' + nl() + nl() + table + nl()))
+    msgs.append(table)
+    return nl().join(msgs)
+
+# --- INDEX (SQLite symbol/reference index for trace queries) ---
+_INDEX_FILE = '.claude/pactkit_cache/index.sqlite'
+_INDEX_VERSION = 2  # PRAGMA user_version; a mismatch rebuilds the database. 2: calls to nested functions qualified
+_INDEX_SCHEMA = '''
+CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, module TEXT, mtime INTEGER, size INTEGER);
+CREATE TABLE symbols (file_id INTEGER NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL, qname TEXT NOT NULL,
+                      line INTEGER, end_line INTEGER);
+CREATE TABLE imports (file_id INTEGER NOT NULL, module TEXT NOT NULL);
+CREATE TABLE calls (file_id INTEGER NOT NULL, caller TEXT NOT NULL, callee TEXT NOT NULL, name TEXT NOT NULL, line INTEGER);
+CREATE INDEX files_module ON files(module);
+CREATE INDEX symbols_name ON symbols(name);
+CREATE INDEX symbols_file ON symbols(file_id);
+CREATE INDEX imports_module ON imports(module);
+CREATE INDEX imports_file ON imports(file_id);
+CREATE INDEX calls_name ON calls(name);
+CREATE INDEX calls_file ON calls(file_id);
+'''
+
+def _open_index(root):
+    import sqlite3
+    path = _ensure_cache_dir(root) / Path(_INDEX_FILE).name
+    db = sqlite3.connect(str(path))
+    if db.execute('PRAGMA user_version').fetchone()[0] != _INDEX_VERSION:
+        db.close()
+        path.unlink()
+        db = sqlite3.connect(str(path))
+        db.executescript(_INDEX_SCHEMA + f'PRAGMA user_version = {_INDEX_VERSION};')
+    return db
+
+def _index_rows(facts):
+    # (symbols, calls) rows for one file. Class facts carry bare names, so nesting comes from line spans.
+    defs = [(line, -(end or line), 'class', name, end) for name, _, _, line, end in facts.get('classes', [])]
+    funcs = {f[0] for f in facts.get('funcs', [])}
+    defs += [(f[2], -(f[4] or f[2]), 'func', f[0], f[4]) for f in facts.get('funcs', [])]
+    symbols, stack = [], []  # stack: (end line, qualified name) of enclosing definitions
+    for line, _, kind, name, end in sorted(defs):
+        while stack and stack[-1][0] < line: stack.pop()
+        if kind == 'class': qname = f'{stack[-1][1]}.{name}' if stack else name
+        else:
+            qname = name
+            parent = name.rpartition('.')[0]
+            kind = 'function' if not parent or parent in funcs else 'method'
+        symbols.append((kind, qname.rsplit('.', 1)[-1], qname, line, end))
+        stack.append((end or line, qname))
+    calls = [(qname, callee, callee.rsplit('.', 1)[-1], line)
+             for qname, callees, _, lines, *_ in facts.get('funcs', []) for callee, line in zip(callees, lines)]
+    return symbols, calls
+
+def build_index(target='.', use_cache=True, jobs='auto'):
+    # Incremental: only files whose mtime or size changed since the last run are re-indexed, and their
+    # facts come from the visualize cache when the content is unchanged.
+    started = time.perf_counter()
+    root = Path(target).resolve()
+    try: db = _open_index(root)
+    except ImportError: return '❌ This Python was built without sqlite3'
+    known = {path: (fid, mtime, size) for fid, path, mtime, size in db.execute('SELECT id, path, mtime, size FROM files')}
+    prefix = len(str(root)) + 1
+    changed, on_disk = [], set()
+    for p in _discover_files(root):
+        rel = str(p)[prefix:].replace(os.sep, '/')  # Path.relative_to dominates a no-op refresh
+        on_disk.add(rel)
+        try: st = p.stat()
+        except OSError: continue
+        row = known.get(rel)
+        if not row or row[1:] != (st.st_mtime_ns, st.st_size): changed.append((p, rel, st))
+    removed = [rel for rel in known if rel not in on_disk]
+    facts = {}
+    if changed:  # reading the JSON cache is the slow part of a no-op refresh
+        facts, load, flush = _fact_loader(root, use_cache, _resolve_jobs(jobs, len(changed)))
+        load([p for p, _, _ in changed])
+        flush()
+    symbols = 0
+    with db:
+        for rel in removed + [rel for _, rel, _ in changed if rel in known]:
+            fid = known[rel][0]
+            for table in ('symbols', 'imports', 'calls'): db.execute(f'DELETE FROM {table} WHERE file_id = ?', (fid,))
+            db.execute('DELETE FROM files WHERE id = ?', (fid,))
+        for p, rel, st in changed:
+            f = facts.get(p) or {}
+            module = _module_name(Path(rel)) if p.suffix == '.py' else f.get('package') or None
+            fid = db.execute('INSERT INTO files (path, module, mtime, size) VALUES (?, ?, ?, ?)',
+                             (rel, module, st.st_mtime_ns, st.st_size)).lastrowid
+            sym_rows, call_rows = _index_rows(f)
+            symbols += len(sym_rows)
+            db.executemany('INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?)', [(fid, *r) for r in sym_rows])
+            db.executemany('INSERT INTO imports VALUES (?, ?)', [(fid, m) for m in dict.fromkeys(f.get('imports', []))])
+            db.executemany('INSERT INTO calls VALUES (?, ?, ?, ?, ?)', [(fid, *r) for r in call_rows])
+    total = db.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+    db.close()
+    ms = (time.perf_counter() - started) * 1000
+    return (f'✅ Index: {root / _INDEX_FILE} ({total} files; {len(changed)} updated, {len(removed)} removed,'
+            f' {symbols} symbols added) in {ms:.0f}ms')
+
+def _index_db(root):
+    # Queries refresh the index first, which costs a stat per file when nothing changed.
+    msg = build_index(root)
+    return (None, msg) if msg.startswith('❌') else (_open_index(root), None)
+
+def _find_symbols(db, name, kinds=None):
+    # Exact qualified name or dotted suffix (`login`, `Auth.login`, `auth.Auth.login`), matched via the name index.
+    bare = name.rsplit('.', 1)[-1]
+    rows = db.execute('SELECT f.path, f.module, s.kind, s.qname, s.line, s.end_line FROM symbols s'
+                      ' JOIN files f ON f.id = s.file_id WHERE s.name = ? ORDER BY f.path, s.line', (bare,)).fetchall()
+    hits = [r for r in rows if (kinds is None or r[2] in kinds) and
+            (r[3] == name or r[3].endswith('.' + name) or
+             (r[1] and (f'{r[1]}.{r[3]}' == name or f'{r[1]}.{r[3]}'.endswith('.' + name))))]
+    return hits
+
+def find_def(target='.', name=None):
+    root = Path(target).resolve()
+    db, err = _index_db(root)
+    if err: return err
+    lines = [f'{path}:{line}-{end}  {kind} {qname}' for path, _, kind, qname, line, end in _find_symbols(db, name)]
+    # substr, not LIKE: '_' and '%' are wildcards there and common in Python names
+    mods = db.execute('SELECT path, module FROM files WHERE module = ? OR substr(module, -?) = ? ORDER BY path',
+                      (name, len(name) + 1, '.' + name)).fetchall()
+    lines += [f'{path}  module {module}' for path, module in mods]
+    db.close()
+    return nl().join(lines) if lines else f"❌ No definition of '{name}' in the index"
+
+def find_refs(target='.', name=None):
+    # Call sites whose callee ends with the name (`obj.login()` counts for `login`), plus importing files.
+    root = Path(target).resolve()
+    db, err = _index_db(root)
+    if err: return err
+    bare = name.rsplit('.', 1)[-1]
+    rows = db.execute('SELECT f.path, c.line, c.caller, c.callee FROM calls c JOIN files f ON f.id = c.file_id'
+                      ' WHERE c.name = ? ORDER BY f.path, c.line', (bare,)).fetchall()
+    lines = [f'{path}:{line}  {caller} -> {callee}' for path, line, caller, callee in rows
+             if '.' not in name or callee == name or callee.endswith('.' + name) or name.endswith('.' + callee)]
+    imports = db.execute('SELECT DISTINCT f.path, i.module FROM imports i JOIN files f ON f.id = i.file_id'
+                         ' WHERE i.module = ? OR substr(i.module, 1, ?) = ? ORDER BY f.path',
+                         (name, len(name) + 1, name + '.')).fetchall()
+    lines += [f'{path}  import {module}' for path, module in imports]
+    db.close()
+    return nl().join(lines) if lines else f"❌ No references to '{name}' in the index"
+
+def callers(target='.', name=None, depth=1):
+    # Same resolution as `--mode call --callers`: a call site counts when its callee resolves to the target.
+    # Every name that can resolve to `x.f` ends in `f`, so only symbols and calls named `f` are read.
+    root = Path(target).resolve()
+    db, err = _index_db(root)
+    if err: return err
+    targets = sorted({r[3] for r in _find_symbols(db, name, ('function', 'method'))})
+    if not targets:
+        db.close()
+        return f"❌ No function '{name}' in the index"
+    lines, seen, frontier = [], set(targets), targets
+    for hop in range(1, max(1, depth or 1) + 1):
+        found = []
+        for qname in frontier:
+            bare = qname.rsplit('.', 1)[-1]
+            rows = db.execute("SELECT qname, kind FROM symbols WHERE name = ? AND kind != 'class'", (bare,)).fetchall()
+            names = {q for q, _ in rows}
+            index = _build_callee_index(names, {q for q, kind in rows if kind == 'function' and '.' in q})
+            rows = db.execute('SELECT f.path, c.line, c.caller, c.callee FROM calls c JOIN files f ON f.id = c.file_id'
+                              ' WHERE c.name = ? ORDER BY f.path, c.line', (bare,)).fetchall()
+            for path, line, caller, callee in rows:
+                if _resolve_callee(callee, names, index) != qname: continue
+                lines.append(f"{'  ' * (hop - 1)}{path}:{line}  {caller} -> {qname}")
+                if caller not in seen: seen.add(caller); found.append(caller)
+        frontier = found
+        if not frontier: break
+    db.close()
+    return nl().join(lines) if lines else f"No callers of {', '.join(targets)}"
+
 def list_rules(): return 'Rules defined in ~/.claude/CLAUDE.md'
 
 # --- CLI ---
@@ -303,10 +2086,82 @@ if __name__ == '__main__':
     sub.add_parser('list_rules')
     p_viz = sub.add_parser('visualize')
     p_viz.add_argument('--focus')
-    p_viz.add_argument('--mode', choices=['file', 'class', 'call'], default='file')
-    p_viz.add_argument('--entry')
+    p_viz.add_argument('--mode', choices=['file', 'class', 'call', 'all', 'profile'], default='file')
+    p_viz.add_argument('--entry', action='append', help='start function for call tracing (repeatable)')
+    p_viz.add_argument('--callers', action='store_true', help='trace who reaches --entry instead of what it calls')
+    p_viz.add_argument('--max-depth', type=int, help='stop call tracing after N hops')
+    p_viz.add_argument('--no-cache', action='store_true')
+    p_viz.add_argument('--jobs', default='auto', help="worker processes for parsing: N or 'auto'")
+    p_viz.add_argument('--depth', type=int, default=1, help='hops around --focus (file mode)')
+    p_viz.add_argument('--direction', choices=['in', 'out', 'both'], default='both')
+    p_viz.add_argument('--collapse-depth', type=int, metavar='N', help='file mode: one node per N-component package prefix')
+    p_viz.add_argument('--shard', action='store_true', help='file mode: also write shards/<package>.mmd plus shards/index.mmd')
+    p_viz.add_argument('--pstats', metavar='FILE', help='profile mode: cProfile/pstats dump to map onto the call graph')
+    p_viz.add_argument('--top', type=int, metavar='N', help='profile mode: keep the N heaviest caller -> callee edges')
+    p_viz.add_argument('--stats', action='store_true', help='print phase timings, cache and parse statistics')
+    p_viz.add_argument('--stats-json', metavar='PATH', help="write the same statistics as JSON to PATH ('-' for stdout)")
+    p_viz.add_argument('--trace-memory', action='store_true',
+                       help='add the tracemalloc peak to the statistics (slows the timed phases several times over)')
+    p_query = sub.add_parser('query')
+    p_query.add_argument('--importers', metavar='MODULE', help='files that import MODULE')
+    p_query.add_argument('--imports', metavar='MODULE', help='files imported by MODULE')
+    p_query.add_argument('--fan-in-top', type=int, metavar='N', help='N most-imported files')
+    p_diff = sub.add_parser('diff')
+    p_diff.add_argument('old', help='snapshot version, e.g. v1.0.0')
+    p_diff.add_argument('new', nargs='?', default='current', help="snapshot version, or 'current' for the live graphs")
+    sub.add_parser('cycles')
+    p_imp = sub.add_parser('impacted')
+    p_imp.add_argument('--since', default='HEAD', help='git revision to diff against')
+    p_flame = sub.add_parser('flame', help='folded stacks + SVG flamegraph from pstats, a folded file or a traced run')
+    p_flame.add_argument('--pstats', metavar='FILE', help='cProfile/pstats dump (stacks approximated from caller totals)')
+    p_flame.add_argument('--folded', metavar='FILE', help='existing folded-stack file to render')
+    p_flame.add_argument('command', nargs=argparse.REMAINDER, help='-- <python args>: run under sys.setprofile, e.g. -- -m pytest -q')
+    p_itime = sub.add_parser('importtime', help='import timings (-X importtime) of a command on the file graph')
+    p_itime.add_argument('--top', type=int, default=20, metavar='N', help='rows in the ranked import-edge table')
+    p_itime.add_argument('--no-cache', action='store_true')
+    p_itime.add_argument('command', nargs=argparse.REMAINDER, help='-- <command>: a console script, script.py or -m module')
+    p_index = sub.add_parser('index', help='build/refresh the SQLite symbol index (.claude/pactkit_cache/index.sqlite)')
+    p_index.add_argument('--no-cache', action='store_true')
+    p_index.add_argument('--jobs', default='auto')
+    p_fdef = sub.add_parser('find-def', help='where NAME is defined (function, method, class or module)')
+    p_fdef.add_argument('name')
+    p_frefs = sub.add_parser('find-refs', help='call sites and imports that mention NAME')
+    p_frefs.add_argument('name')
+    p_callers = sub.add_parser('callers', help='functions whose calls resolve to NAME')
+    p_callers.add_argument('name')
+    p_callers.add_argument('--depth', type=int, default=1, help='follow callers of callers up to N hops')
+    p_watch = sub.add_parser('watch')
+    p_watch.add_argument('--mode', choices=['file', 'class', 'call', 'all'], default='all')
+    p_watch.add_argument('--interval', type=float, default=0.3, help='seconds between polls')
+    p_watch.add_argument('--jobs', default='auto')
+    p_watch.add_argument('--stop', action='store_true', help='stop a running watcher')
 
     a = parser.parse_args()
     if a.cmd == 'init_arch': print(init_architecture())
-    elif a.cmd == 'visualize': print(visualize('.', a.focus, a.mode, a.entry))
+    elif a.cmd == 'visualize':
+        if a.trace_memory and not a.stats_json: a.stats = True
+        stats = {} if a.stats or a.stats_json else None
+        print(visualize('.', a.focus, a.mode, a.entry, use_cache=not a.no_cache, jobs=a.jobs, depth=a.depth, direction=a.direction,
+                        callers=a.callers, max_depth=a.max_depth, collapse_depth=a.collapse_depth, shard=a.shard,
+                        pstats_file=a.pstats, top=a.top, stats=stats, trace_memory=a.trace_memory))
+        if a.stats: print(_format_stats(stats))
+        if a.stats_json == '-': print(json.dumps(stats, indent=1))
+        elif a.stats_json: Path(a.stats_json).write_text(json.dumps(stats, indent=1), encoding='utf-8')
+    elif a.cmd == 'query': print(query('.', a.importers, a.imports, a.fan_in_top))
+    elif a.cmd == 'diff': print(diff('.', a.old, a.new))
+    elif a.cmd == 'cycles':
+        result = cycles('.')
+        print(result)
+        if result.startswith('❌'): sys.exit(1)
+    elif a.cmd == 'impacted':
+        result = impacted('.', a.since)
+        print(result)
+        if result.startswith('❌'): sys.exit(1)  # scripted as `pytest $(... impacted)`: never hand it the error
+    elif a.cmd == 'flame': print(flame('.', a.pstats, a.command, a.folded))
+    elif a.cmd == 'importtime': print(importtime('.', a.command, a.top, use_cache=not a.no_cache))
+    elif a.cmd == 'index': print(build_index('.', use_cache=not a.no_cache, jobs=a.jobs))
+    elif a.cmd == 'find-def': print(find_def('.', a.name))
+    elif a.cmd == 'find-refs': print(find_refs('.', a.name))
+    elif a.cmd == 'callers': print(callers('.', a.name, a.depth))
+    elif a.cmd == 'watch': print(watch_stop('.') if a.stop else watch('.', a.mode, a.interval, a.jobs))
     elif a.cmd == 'list_rules': print(list_rules())
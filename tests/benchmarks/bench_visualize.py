@@ -0,0 +1,149 @@
+"""Benchmark the visualize engine on synthetic projects and write comparable JSON results.
+
+Usage:
+    python tests/benchmarks/bench_visualize.py --sizes 1000,10000,50000 --out bench.json
+    python tests/benchmarks/bench_visualize.py --sizes 1000 --compare bench.json
+
+Projects are generated once per size under --workdir and reused by later runs.
+Parsing is serial (--jobs 1) so numbers compare across machines with different core counts.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent.parent / 'src'))
+
+from synthetic import focus_target, generate_project  # noqa: E402
+
+CASES = ('file', 'file_warm', 'class', 'call', 'focus', 'entry')
+RESULTS_VERSION = 1
+
+
+def load_visualize():
+    """Exec the deployed visualize script (same as the unit tests) and return its namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def run_case(g, root, case, params, stats=None):
+    """Run one case against root and return the visualize() result message."""
+    viz = g['visualize']
+    target = str(root)
+    if case == 'file_warm':
+        return viz(target, mode='file', use_cache=True, jobs=1, stats=stats)
+    if case == 'focus':
+        return viz(target, focus=focus_target(params), depth=2, use_cache=False, jobs=1, stats=stats)
+    if case == 'entry':
+        return viz(target, mode='call', entry='main', max_depth=3, use_cache=False, jobs=1, stats=stats)
+    return viz(target, mode=case, use_cache=False, jobs=1, stats=stats)
+
+
+def bench_size(g, workdir, size, cases, repeat, with_stats=False):
+    """Time every case at one project size; the fastest of `repeat` runs is reported."""
+    root = Path(workdir) / f'synth-{size}'
+    started = time.perf_counter()
+    params = generate_project(root, modules=size)
+    generate_s = time.perf_counter() - started
+    if 'file_warm' in cases:
+        g['visualize'](str(root), mode='file', use_cache=True, jobs=1)  # prime the cache
+    results = []
+    for case in cases:
+        runs = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            message = run_case(g, root, case, params)
+            runs.append(time.perf_counter() - started)
+            if message.startswith('❌'):
+                raise RuntimeError(f'{case} @ {size}: {message}')
+        row = {'size': size, 'case': case, 'seconds': min(runs), 'runs': runs}
+        if with_stats:
+            stats = {}
+            run_case(g, root, case, params, stats)
+            row['stats'] = stats
+        results.append(row)
+        print(f'{size:>7} {case:<10} {min(runs):9.3f}s', flush=True)
+    return {'size': size, 'generate_seconds': generate_s, 'params': params}, results
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def run(sizes, cases=CASES, repeat=1, workdir=None, with_stats=False):
+    """Benchmark all sizes and return the results document."""
+    g = load_visualize()
+    workdir = Path(workdir or Path(tempfile.gettempdir()) / 'pactkit-bench')
+    workdir.mkdir(parents=True, exist_ok=True)
+    projects, results = [], []
+    for size in sizes:
+        project, rows = bench_size(g, workdir, size, cases, repeat, with_stats)
+        projects.append(project)
+        results.extend(rows)
+    return {
+        'version': RESULTS_VERSION,
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'projects': projects,
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=1.25):
+    """Return (report lines, regressions) for cases present in both documents."""
+    base = {(r['size'], r['case']): r['seconds'] for r in baseline['results']}
+    lines = [f"{'size':>7} {'case':<10} {'base':>9} {'now':>9} {'ratio':>6}"]
+    regressions = []
+    for r in current['results']:
+        key = (r['size'], r['case'])
+        if key not in base:
+            continue
+        ratio = r['seconds'] / base[key] if base[key] else float('inf')
+        flag = ' <-- regression' if ratio > threshold else ''
+        lines.append(f"{r['size']:>7} {r['case']:<10} {base[key]:9.3f} {r['seconds']:9.3f} {ratio:6.2f}{flag}")
+        if flag:
+            regressions.append(key)
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,50000', help='comma-separated module counts')
+    parser.add_argument('--cases', default=','.join(CASES), help=f"comma-separated subset of {', '.join(CASES)}")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--workdir', help='where synthetic projects are generated and reused')
+    parser.add_argument('--out', help='write JSON results here')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio reported as a regression')
+    parser.add_argument('--stats', action='store_true', help='add one extra run per case with visualize --stats data')
+    a = parser.parse_args(argv)
+    cases = [c for c in a.cases.split(',') if c]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    doc = run([int(s) for s in a.sizes.split(',')], cases, a.repeat, a.workdir, a.stats)
+    if a.out:
+        Path(a.out).write_text(json.dumps(doc, indent=1), encoding='utf-8')
+    if a.compare:
+        lines, regressions = compare(json.loads(Path(a.compare).read_text(encoding='utf-8')), doc, a.threshold)
+        print('\n'.join(lines))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Deterministic synthetic Python projects for benchmarking the visualize engine."""
+import json
+import random
+import shutil
+from pathlib import Path
+
+PACKAGE = 'synth'
+
+
+def module_name(i, package_size):
+    return f'{PACKAGE}.pkg{i // package_size}.mod{i}'
+
+
+def generate_project(root, modules=1000, fanout=4, classes=2, methods=2, funcs=3, calls=3, package_size=100, seed=0):
+    """Write a synthetic project under root/src/synth and return its parameters.
+
+    Module i imports `fanout` random modules, defines `funcs` functions and `classes` classes
+    with `methods` methods each; every function and method calls `calls` functions of the
+    modules it imports. `synth/main.py` defines `main()`, the entry point for call tracing.
+    The same arguments always produce byte-identical trees.
+    """
+    params = dict(modules=modules, fanout=fanout, classes=classes, methods=methods, funcs=funcs, calls=calls,
+                  package_size=package_size, seed=seed)
+    root = Path(root)
+    marker = root / 'synthetic.json'
+    if marker.exists() and json.loads(marker.read_text(encoding='utf-8')) == params:
+        return params
+    if marker.exists():
+        shutil.rmtree(root)  # a stale synthetic tree from other parameters
+    elif root.exists() and any(root.iterdir()):
+        raise ValueError(f'{root} is not empty and was not generated by synthetic.py')
+    rng = random.Random(seed)
+    src = root / 'src' / PACKAGE
+    for pkg in range((modules + package_size - 1) // package_size):
+        (src / f'pkg{pkg}').mkdir(parents=True)
+        (src / f'pkg{pkg}' / '__init__.py').write_text('', encoding='utf-8')
+    (src / '__init__.py').write_text('', encoding='utf-8')
+    for i in range(modules):
+        others = [j for j in rng.sample(range(modules), min(fanout + 1, modules)) if j != i][:fanout]
+        lines = []
+        for n, j in enumerate(others):
+            if n % 2:
+                lines.append(f'from {module_name(j, package_size)} import f{j}_0')
+            else:
+                lines.append(f'import {module_name(j, package_size)}')
+        callees = [f'f{j}_{rng.randrange(funcs)}' for j in others] or ['print']
+
+        def body(indent):
+            picks = [rng.choice(callees) for _ in range(calls)]
+            return [f'{indent}{c}(x)' for c in picks] + [f'{indent}return x']
+
+        for k in range(funcs):
+            lines += ['', '', f'def f{i}_{k}(x):'] + body('    ')
+        for c in range(classes):
+            base = f'(C{i}_{c - 1})' if c else ''
+            lines += ['', '', f'class C{i}_{c}{base}:']
+            for m in range(methods):
+                lines += [f'    def m{m}(self, x):'] + body('        ') + ['']
+        path = src / f'pkg{i // package_size}' / f'mod{i}.py'
+        path.write_text('\n'.join(lines).rstrip() + '\n', encoding='utf-8')
+    entry = [module_name(i, package_size) for i in range(min(funcs, modules))]
+    main = [f'import {m}' for m in entry] + ['', '', 'def main():'] + [f'    f{i}_0(1)' for i in range(len(entry))]
+    (src / 'main.py').write_text('\n'.join(main) + '\n', encoding='utf-8')
+    marker.write_text(json.dumps(params), encoding='utf-8')
+    return params
+
+
+def focus_target(params):
+    """Path fragment of a module in the middle of the project, for --focus cases."""
+    i = params['modules'] // 2
+    return f'pkg{i // params["package_size"]}/mod{i}.py'
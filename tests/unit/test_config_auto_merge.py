@@ -377,3 +377,31 @@ class TestDeployerIntegration:
 
         output = capsys.readouterr().out
         assert 'Auto-added' not in output
+
+
+# ===========================================================================
+# Visualize section survives auto-merge rewrite
+# ===========================================================================
+
+class TestVisualizeSectionPreserved:
+    def test_visualize_exclude_kept_on_rewrite(self, tmp_path):
+        cfg = _config()
+        path = tmp_path / 'pactkit.yaml'
+        _write_yaml(path, {
+            'version': '0.0.1',
+            'agents': ['system-architect'],
+            'visualize': {'exclude': ['vendor', 'gen']},
+        })
+        assert cfg.auto_merge_config_file(path)
+        data = yaml.safe_load(path.read_text())
+        assert data['visualize'] == {'exclude': ['vendor', 'gen']}
+
+    def test_invalid_visualize_exclude_warns(self):
+        import warnings
+        cfg = _config()
+        config = cfg.get_default_config()
+        config['visualize'] = {'exclude': 'vendor'}
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            cfg.validate_config(config)
+        assert any('visualize.exclude' in str(w.message) for w in caught)
@@ -58,6 +58,24 @@ class TestSnapshotSavesGraphs:
         finally:
             os.chdir(old_cwd)
 
+    def test_snapshot_copies_graph_json_twin(self, tmp_path):
+        graphs = tmp_path / 'docs/architecture/graphs'
+        graphs.mkdir(parents=True)
+        (graphs / 'code_graph.mmd').write_text('graph TD', encoding='utf-8')
+        (graphs / 'code_graph.json').write_text('{}', encoding='utf-8')
+
+        import os
+        old_cwd = os.getcwd()
+        os.chdir(tmp_path)
+        try:
+            g = _exec_board()
+            result = g['snapshot_graph']('v3.0.0')
+            snap_dir = tmp_path / 'docs/architecture/snapshots'
+            assert (snap_dir / 'v3.0.0_code_graph.json').exists()
+            assert '1 graphs' in result
+        finally:
+            os.chdir(old_cwd)
+
 
 # ==============================================================================
 # Scenario 2: snapshot creates directory automatically
@@ -0,0 +1,163 @@
+"""Tests for `pactkit serve` and the script-side forwarding in _SHARED_HEADER."""
+import os
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from pactkit import server  # noqa: E402
+from pactkit.skills import load_script  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='needs Unix domain sockets')
+
+BOARD = (
+    '# Sprint Board\n\n## 📋 Backlog\n\n### [STORY-001] First\n> Spec: docs/specs/STORY-001.md\n\n- [ ] a\n\n'
+    '## 🔄 In Progress\n\n## ✅ Done\n'
+)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    # Short runtime dir: Unix socket paths are limited to ~100 bytes
+    runtime = Path(os.environ.get('TMPDIR', '/tmp')) / f'pk-serve-{os.getpid()}'
+    runtime.mkdir(exist_ok=True)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(runtime))
+    root = (tmp_path / 'proj').resolve()
+    (root / 'docs/product').mkdir(parents=True)
+    (root / 'docs/product/sprint_board.md').write_text(BOARD, encoding='utf-8')
+    scripts = tmp_path / 'scripts'
+    scripts.mkdir()
+    for name in server.SCRIPTS:
+        (scripts / f'{name}.py').write_text(load_script(f'{name}.py'), encoding='utf-8')
+    yield root, scripts
+    for leftover in runtime.glob('*'):
+        leftover.unlink()
+    runtime.rmdir()
+
+
+@pytest.fixture
+def running(project, monkeypatch):
+    root, scripts = project
+    calls = []
+    original = server._Script.run
+    monkeypatch.setattr(server._Script, 'run', lambda self, argv, cwd: calls.append(argv) or original(self, argv, cwd))
+    ready = threading.Event()
+    thread = threading.Thread(target=server.serve, args=(root,), kwargs={'ready': ready.set}, daemon=True)
+    thread.start()
+    assert ready.wait(10)
+    yield root, scripts, calls
+    server.stop(root)
+    thread.join(10)
+
+
+def _run(scripts, root, name, *args, env=None):
+    return subprocess.run([sys.executable, str(scripts / f'{name}.py'), *args], cwd=root, capture_output=True,
+                          text=True, env={**os.environ, **(env or {})})
+
+
+class TestForwarding:
+    def test_served_output_matches_in_process(self, running):
+        root, scripts, calls = running
+        served = _run(scripts, root, 'board', 'list_stories')
+        local = _run(scripts, root, 'board', 'list_stories', env={'PACTKIT_NO_SERVE': '1'})
+        assert calls == [['list_stories']]
+        assert served.stdout == local.stdout == 'STORY-001 | First | 0/1 | BACKLOG\n'
+        assert served.returncode == 0
+
+    def test_writes_land_in_the_project(self, running):
+        root, scripts, calls = running
+        out = _run(scripts, root, 'board', 'update_task', 'STORY-001', 'a')
+        assert out.stdout.startswith('✅ Task STORY-001 updated') and calls
+        assert '- [x] a' in (root / 'docs/product/sprint_board.md').read_text(encoding='utf-8')
+        assert Path.cwd() != root  # the server restores its own working directory
+
+    def test_exit_code_and_stderr(self, running):
+        root, scripts, calls = running
+        out = _run(scripts, root, 'visualize', 'no-such-command')
+        assert calls == [['no-such-command']]
+        assert out.returncode == 2 and 'invalid choice' in out.stderr
+
+    def test_script_is_loaded_once(self, running, monkeypatch):
+        root, scripts, calls = running
+        loaded = []
+        original = server._Script.__init__
+        monkeypatch.setattr(server._Script, '__init__', lambda self, name: loaded.append(name) or original(self, name))
+        (root / 'app.py').write_text('import os\n', encoding='utf-8')
+        assert _run(scripts, root, 'visualize', 'visualize').stdout.startswith('✅')
+        assert _run(scripts, root, 'visualize', 'visualize', '--mode', 'call').stdout.startswith('✅')
+        assert loaded == ['visualize'] and len(calls) == 2
+
+
+class TestFallback:
+    def test_other_script_version_runs_in_process(self, running):
+        root, scripts, calls = running
+        board = scripts / 'board.py'
+        board.write_text(board.read_text(encoding='utf-8') + '\n# local edit\n', encoding='utf-8')
+        out = _run(scripts, root, 'board', 'list_stories')
+        assert out.stdout.startswith('STORY-001') and calls == []
+
+    def test_long_running_commands_stay_local(self, running):
+        root, _, calls = running
+        reply = server._handle({'script': 'visualize', 'argv': ['watch', '--stop'], 'cwd': str(root)}, root, {})
+        assert reply == {'fallback': True} and calls == []
+
+    def test_other_directory_runs_in_process(self, running):
+        root, scripts, calls = running
+        other = root / 'docs'
+        out = _run(scripts, other, 'board', 'list_stories')
+        assert out.stdout.startswith('❌ No Board') and calls == []
+
+    def test_no_server(self, project):
+        root, scripts = project
+        assert not server.is_running(root)
+        assert _run(scripts, root, 'board', 'list_stories').stdout.startswith('STORY-001')
+        assert server.stop(root).startswith('⚠️')
+
+
+class TestLifecycle:
+    def test_stale_socket_is_replaced(self, project):
+        root, _ = project
+        path = server.socket_path(root)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as dead:
+            dead.bind(str(path))  # closed without unlink, like a killed server
+        done = []
+        thread = threading.Thread(target=lambda: done.append(server.serve(root, idle_timeout=0.2)), daemon=True)
+        thread.start()
+        thread.join(10)
+        assert done == ['✅ pactkit serve stopped'] and not path.exists()
+
+    def test_second_server_refuses(self, running):
+        root, _, _ = running
+        assert server.is_running(root)
+        assert server.serve(root).startswith('⚠️ pactkit serve already running')
+
+    def test_foreign_path_is_left_alone(self, project):
+        root, _ = project
+        path = server.socket_path(root)
+        path.write_text('not a socket', encoding='utf-8')
+        assert server.serve(root).startswith('❌') and path.read_text(encoding='utf-8') == 'not a socket'
+        assert not server.is_running(root)
+
+    def test_socket_of_another_user_is_left_alone(self, project, monkeypatch):
+        root, _ = project
+        other_uid = os.getuid() + 1
+        monkeypatch.setattr(server.os, 'getuid', lambda: other_uid)
+        path = server.socket_path(root)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as other:
+            other.bind(str(path))
+            assert server.serve(root).startswith('❌') and path.exists()
+
+
+class TestClientChecks:
+    def test_non_socket_at_the_path_runs_in_process(self, project):
+        root, scripts = project
+        server.socket_path(root).write_text('planted', encoding='utf-8')
+        out = _run(scripts, root, 'board', 'list_stories')
+        assert out.stdout.startswith('STORY-001') and out.returncode == 0
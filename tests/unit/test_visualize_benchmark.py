@@ -0,0 +1,73 @@
+"""Tests for the synthetic-project generator and benchmark harness in tests/benchmarks."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+bench_dir = project_root / 'tests' / 'benchmarks'
+if str(bench_dir) not in sys.path:
+    sys.path.insert(0, str(bench_dir))
+
+import bench_visualize  # noqa: E402
+import synthetic  # noqa: E402
+
+
+def _tree(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in sorted(root.rglob('*')) if p.is_file()}
+
+
+class TestGenerator:
+    def test_same_parameters_give_identical_trees(self, tmp_path):
+        synthetic.generate_project(tmp_path / 'a', modules=30, package_size=10)
+        synthetic.generate_project(tmp_path / 'b', modules=30, package_size=10)
+        assert _tree(tmp_path / 'a') == _tree(tmp_path / 'b')
+
+    def test_shape_follows_parameters(self, tmp_path):
+        params = synthetic.generate_project(tmp_path, modules=25, fanout=3, package_size=10)
+        mods = sorted((tmp_path / 'src/synth').glob('pkg*/mod*.py'))
+        assert len(mods) == 25
+        assert len(list((tmp_path / 'src/synth').glob('pkg*'))) == 3
+        source = (tmp_path / 'src/synth/pkg1/mod12.py').read_text()
+        assert source.count('import ') == 3
+        assert (tmp_path / 'src/synth' / synthetic.focus_target(params)).exists()
+
+    def test_regenerates_when_parameters_change(self, tmp_path):
+        synthetic.generate_project(tmp_path, modules=20, package_size=10)
+        synthetic.generate_project(tmp_path, modules=5, package_size=10)
+        assert len(list((tmp_path / 'src/synth').glob('pkg*/mod*.py'))) == 5
+
+    def test_refuses_foreign_directory(self, tmp_path):
+        (tmp_path / 'keep.txt').write_text('mine')
+        with pytest.raises(ValueError):
+            synthetic.generate_project(tmp_path, modules=5)
+        assert (tmp_path / 'keep.txt').exists()
+
+
+class TestHarness:
+    def test_writes_comparable_results(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+        out = tmp_path / 'bench.json'
+        code = bench_visualize.main(['--sizes', '40', '--workdir', str(tmp_path / 'work'), '--out', str(out)])
+        assert code == 0
+        doc = json.loads(out.read_text())
+        assert doc['version'] == bench_visualize.RESULTS_VERSION
+        assert [r['case'] for r in doc['results']] == list(bench_visualize.CASES)
+        assert all(r['size'] == 40 and r['seconds'] > 0 for r in doc['results'])
+        graphs = tmp_path / 'work/synth-40/docs/architecture/graphs'
+        assert 'f0_0' in (graphs / 'call_graph.mmd').read_text()
+
+    def test_compare_flags_regressions(self):
+        base = {'results': [{'size': 10, 'case': 'file', 'seconds': 1.0},
+                            {'size': 10, 'case': 'class', 'seconds': 1.0}]}
+        now = {'results': [{'size': 10, 'case': 'file', 'seconds': 1.1},
+                           {'size': 10, 'case': 'class', 'seconds': 2.0},
+                           {'size': 99, 'case': 'file', 'seconds': 5.0}]}
+        lines, regressions = bench_visualize.compare(base, now, threshold=1.25)
+        assert regressions == [(10, 'class')]
+        assert len(lines) == 3
+
+    def test_unknown_case_is_rejected(self):
+        with pytest.raises(SystemExit):
+            bench_visualize.main(['--cases', 'file,nope'])
@@ -0,0 +1,159 @@
+"""Tests for the persistent incremental extraction cache in visualize.py."""
+import json
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+CACHE_REL = '.claude/pactkit_cache/visualize.json'
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _count_parses(g):
+    """Wrap the full and import-only extractors so tests can see which sources were parsed."""
+    calls = []
+    for name in ('_extract_source', '_extract_imports'):
+        original = g[name]
+
+        def wrapper(source, original=original):
+            calls.append(source)
+            return original(source)
+        g[name] = wrapper
+    return calls
+
+
+def _create_project(tmp_path):
+    pkg = tmp_path / 'pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('', encoding='utf-8')
+    (pkg / 'a.py').write_text('from pkg import b\n\ndef fa():\n    return b.fb()\n', encoding='utf-8')
+    (pkg / 'b.py').write_text('class B:\n    def fb(self):\n        return 1\n', encoding='utf-8')
+    return tmp_path
+
+
+class TestCacheWritten:
+    def test_cache_file_created(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        data = json.loads((proj / CACHE_REL).read_text(encoding='utf-8'))
+        assert set(data['files']) == {'pkg/__init__.py', 'pkg/a.py', 'pkg/b.py'}
+
+    def test_cache_entry_has_key_fields(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        entry = json.loads((proj / CACHE_REL).read_text(encoding='utf-8'))['files']['pkg/a.py']
+        assert {'mtime', 'size', 'sha1', 'facts'} <= set(entry)
+        assert entry['facts']['imports'] == ['pkg']
+
+    def test_no_cache_skips_write(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), use_cache=False)
+        assert not (proj / CACHE_REL).exists()
+
+
+class TestIncrementalReparse:
+    def test_second_run_parses_nothing(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), mode='all')
+        calls = _count_parses(g)
+        g['visualize'](str(proj), mode='class')
+        g['visualize'](str(proj))
+        assert calls == []
+
+    def test_import_only_facts_upgraded_once(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        entry = json.loads((proj / CACHE_REL).read_text(encoding='utf-8'))['files']['pkg/a.py']
+        assert entry['facts']['imports_only'] is True
+        calls = _count_parses(g)
+        g['visualize'](str(proj), mode='class')
+        assert len(calls) == 3
+        assert 'B' in (proj / 'docs/architecture/graphs/class_graph.mmd').read_text()
+        calls.clear()
+        g['visualize'](str(proj), mode='call')
+        assert calls == []
+
+    def test_only_changed_file_reparsed(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), mode='all')
+        calls = _count_parses(g)
+        (proj / 'pkg' / 'b.py').write_text('class B:\n    def fb(self):\n        return 2\n\nclass C(B):\n    pass\n', encoding='utf-8')
+        g['visualize'](str(proj), mode='class')
+        assert len(calls) == 1
+        assert 'class C(B)' in calls[0]
+        output = (proj / 'docs/architecture/graphs/class_graph.mmd').read_text()
+        assert 'B <|-- C' in output
+
+    def test_touched_but_unchanged_file_not_reparsed(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        calls = _count_parses(g)
+        target = proj / 'pkg' / 'a.py'
+        st = target.stat()
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        g['visualize'](str(proj))
+        assert calls == []
+
+    def test_deleted_file_dropped(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        (proj / 'pkg' / 'b.py').unlink()
+        g['visualize'](str(proj))
+        data = json.loads((proj / CACHE_REL).read_text(encoding='utf-8'))
+        assert 'pkg/b.py' not in data['files']
+
+    def test_version_mismatch_invalidates(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        path = proj / CACHE_REL
+        data = json.loads(path.read_text(encoding='utf-8'))
+        data['version'] = -1
+        path.write_text(json.dumps(data), encoding='utf-8')
+        calls = _count_parses(g)
+        g['visualize'](str(proj))
+        assert len(calls) == 3
+
+    def test_corrupt_cache_ignored(self, tmp_path):
+        proj = _create_project(tmp_path)
+        (proj / CACHE_REL).parent.mkdir(parents=True)
+        (proj / CACHE_REL).write_text('{not json', encoding='utf-8')
+        g = _exec_visualize()
+        result = g['visualize'](str(proj))
+        assert 'code_graph.mmd' in result
+
+
+class TestCachedOutputMatches:
+    def test_cached_and_uncached_output_identical(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        for mode, name in (('file', 'code_graph'), ('class', 'class_graph'), ('call', 'call_graph')):
+            g['visualize'](str(proj), mode=mode, use_cache=False)
+            fresh = (proj / f'docs/architecture/graphs/{name}.mmd').read_text()
+            g['visualize'](str(proj), mode=mode)
+            g['visualize'](str(proj), mode=mode)
+            cached = (proj / f'docs/architecture/graphs/{name}.mmd').read_text()
+            assert fresh == cached
+
+    def test_multi_name_import_records_every_module(self, tmp_path):
+        g = _exec_visualize()
+        facts = g['_extract_source']('import os, json\n')
+        assert facts['imports'] == ['os', 'json']
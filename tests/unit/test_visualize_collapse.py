@@ -0,0 +1,115 @@
+"""Tests for package collapsing (--collapse-depth) and sharded output (--shard)."""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+GRAPHS = 'docs/architecture/graphs'
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _write(root, rel, body=''):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding='utf-8')
+
+
+def _create_project(tmp_path):
+    """src/app/{api,core,db} packages; api imports core three times, core imports db."""
+    for pkg in ('api', 'core', 'db'):
+        _write(tmp_path, f'src/app/{pkg}/__init__.py')
+    _write(tmp_path, 'src/app/__init__.py')
+    _write(tmp_path, 'src/app/api/routes.py', 'import app.core.service\nimport app.api.schemas\n')
+    _write(tmp_path, 'src/app/api/schemas.py', 'import app.core.models\nfrom app.core.models import M\n')
+    _write(tmp_path, 'src/app/core/service.py', 'import app.core.models\nimport app.db.session\n')
+    _write(tmp_path, 'src/app/core/models.py')
+    _write(tmp_path, 'src/app/db/session.py')
+    return tmp_path
+
+
+class TestCollapse:
+    def test_nodes_are_package_prefixes(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), collapse_depth=2)
+        output = (proj / GRAPHS / 'code_graph.mmd').read_text()
+        assert 'pkg_app_api["app.api (3 files)"]' in output
+        assert 'pkg_app_core["app.core (3 files)"]' in output
+        assert 'routes_py' not in output
+
+    def test_edge_weights_are_summed(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), collapse_depth=2)
+        output = (proj / GRAPHS / 'code_graph.mmd').read_text()
+        assert 'pkg_app_api -->|3| pkg_app_core' in output
+        assert 'pkg_app_core -->|1| pkg_app_db' in output
+        assert 'pkg_app_api -->|1| pkg_app_api' not in output
+
+    def test_depth_one_collapses_to_top_package(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), collapse_depth=1)
+        output = (proj / GRAPHS / 'code_graph.mmd').read_text()
+        assert output.splitlines()[1:] == ['    pkg_app["app (9 files)"]']
+
+    def test_json_stays_file_level(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), collapse_depth=2)
+        assert 'src/app/api/routes.py' in (proj / GRAPHS / 'code_graph.json').read_text()
+
+    def test_rejected_with_focus(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        assert g['visualize'](str(proj), focus='routes', collapse_depth=1).startswith('❌')
+
+
+class TestShard:
+    def test_writes_index_and_one_file_per_package(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        result = g['visualize'](str(proj), collapse_depth=2, shard=True)
+        shards = proj / GRAPHS / 'shards'
+        assert sorted(p.name for p in shards.glob('*.mmd')) == [
+            'app.api.mmd', 'app.core.mmd', 'app.db.mmd', 'app.mmd', 'index.mmd']
+        assert '4 packages' in result
+        index = (shards / 'index.mmd').read_text()
+        assert 'click pkg_app_core href "app.core.mmd"' in index
+
+    def test_shard_has_internal_and_boundary_edges(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), collapse_depth=2, shard=True)
+        core = (proj / GRAPHS / 'shards/app.core.mmd').read_text()
+        assert 'src_app_core_service_py --> src_app_core_models_py' in core
+        assert 'pkg_app_api -->|2| src_app_core_models_py' in core
+        assert 'src_app_core_service_py -->|1| pkg_app_db' in core
+        assert 'routes_py' not in core
+
+    def test_stale_shards_removed(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), collapse_depth=2, shard=True)
+        for name in ('__init__.py', 'session.py'):
+            (proj / 'src/app/db' / name).unlink()
+        _write(proj, 'src/app/core/service.py', 'import app.core.models\n')
+        g['visualize'](str(proj), collapse_depth=2, shard=True)
+        assert not (proj / GRAPHS / 'shards/app.db.mmd').exists()
+
+    def test_shard_size_bounded_by_package(self, tmp_path):
+        for i in range(30):
+            _write(tmp_path, f'pkg{i}/__init__.py', f'import pkg{(i + 1) % 30}\n')
+        g = _exec_visualize()
+        g['visualize'](str(tmp_path), shard=True)
+        shard = (tmp_path / GRAPHS / 'shards/pkg0.mmd').read_text()
+        assert len(shard.splitlines()) < 12
@@ -0,0 +1,80 @@
+"""Tests for the interned, array-backed import graph core in visualize.py."""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _graph(g, root):
+    all_files, module_index, file_to_node = g['_scan_files'](root)
+    facts = g['_load_facts'](root, all_files, use_cache=False)
+    return g['_build_import_graph'](all_files, module_index, file_to_node, facts)
+
+
+def _create_project(tmp_path):
+    (tmp_path / 'a.py').write_text('import b\n' * 500 + 'from c import x\n', encoding='utf-8')
+    (tmp_path / 'b.py').write_text('import c\n', encoding='utf-8')
+    (tmp_path / 'c.py').write_text('', encoding='utf-8')
+    return tmp_path
+
+
+class TestImportGraph:
+    def test_edges_are_deduplicated_with_counts(self, tmp_path):
+        g = _exec_visualize()
+        graph = _graph(g, _create_project(tmp_path))
+        assert graph.ids == ['a_py', 'b_py', 'c_py']
+        assert list(graph.edges()) == [(0, 1, 500), (0, 2, 1), (1, 2, 1)]
+        assert len(graph.fwd.targets) == 3
+
+    def test_adjacency_is_array_backed(self, tmp_path):
+        from array import array
+        g = _exec_visualize()
+        graph = _graph(g, _create_project(tmp_path))
+        assert isinstance(graph.fwd.targets, array)
+        assert isinstance(graph.fwd.counts, array)
+
+    def test_reverse_adjacency(self, tmp_path):
+        g = _exec_visualize()
+        graph = _graph(g, _create_project(tmp_path))
+        assert list(graph.rev.get(2)) == [0, 1]
+        assert list(graph.rev.items(1)) == [(0, 500)]
+        assert list(graph.rev.get(0)) == []
+        assert graph.rev.get(99) == ()
+
+    def test_transpose_round_trips(self):
+        from array import array
+        g = _exec_visualize()
+        csr = g['_CSR'](array('I', [0, 2, 3, 3]), array('I', [1, 2, 0]), array('I', [4, 5, 6]))
+        back = csr.transpose().transpose()
+        assert list(back.offsets) == [0, 2, 3, 3]
+        assert list(back.targets) == [1, 2, 0]
+        assert list(back.counts) == [4, 5, 6]
+
+
+class TestRenderersUseCore:
+    def test_full_graph_renders_each_edge_once(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        output = (proj / 'docs/architecture/graphs/code_graph.mmd').read_text()
+        assert output.count('a_py --> b_py') == 1
+
+    def test_json_keeps_import_counts(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        data = json.loads((proj / 'docs/architecture/graphs/code_graph.json').read_text())
+        assert {'source': 'a_py', 'target': 'b_py', 'count': 500} in data['edges']
+        fan_in = {n['path']: n['fan_in'] for n in data['nodes']}
+        assert fan_in == {'a.py': 0, 'b.py': 1, 'c.py': 2}
@@ -0,0 +1,96 @@
+"""Tests for `visualize cycles` (SCC import cycles and layer order)."""
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _write(root, rel, body=''):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding='utf-8')
+
+
+class TestTarjan:
+    def test_finds_components(self):
+        g = _exec_visualize()
+        adj = {'a': {'b': None}, 'b': {'c': None}, 'c': {'a': None, 'd': None}, 'd': {}, 'e': {'e': None}}
+        sccs = sorted(sorted(c) for c in g['_tarjan_scc'](adj))
+        assert sccs == [['a', 'b', 'c'], ['d'], ['e']]
+
+    def test_long_chain_does_not_recurse(self):
+        g = _exec_visualize()
+        n = 20000
+        adj = {i: {i + 1: None} for i in range(n)}
+        adj[n] = {0: None}
+        assert len(g['_tarjan_scc'](adj)) == 1
+
+    def test_back_edges_break_every_cycle(self):
+        g = _exec_visualize()
+        adj = {'a': {'b': None, 'c': None}, 'b': {'a': None, 'c': None}, 'c': {'a': None}}
+        cut = set(g['_back_edges'](adj, ['a', 'b', 'c']))
+        pruned = {n: {m: None for m in nbrs if (n, m) not in cut} for n, nbrs in adj.items()}
+        assert all(len(c) == 1 for c in g['_tarjan_scc'](pruned))
+
+
+class TestCycles:
+    def test_acyclic_project(self, tmp_path):
+        _write(tmp_path, 'a.py', 'import b\n')
+        _write(tmp_path, 'b.py')
+        g = _exec_visualize()
+        assert g['cycles'](str(tmp_path)).startswith('✅')
+
+    def test_reports_cycle_and_weakest_cut(self, tmp_path):
+        _write(tmp_path, 'a.py', 'import b\nfrom b import x\n')
+        _write(tmp_path, 'b.py', 'import c\n')
+        _write(tmp_path, 'c.py', 'import a\n')
+        _write(tmp_path, 'd.py', 'import a\n')
+        g = _exec_visualize()
+        out = g['cycles'](str(tmp_path))
+        assert out.startswith('❌ 1 import cycles')
+        assert '### Cycle 1 (3 modules)' in out
+        assert '- d.py' not in out
+        assert 'Suggested cut: c.py --> a.py (1x)' in out
+
+    def test_layer_violation(self, tmp_path):
+        _write(tmp_path, 'docs/architecture/governance/layers.md',
+               '# Layers\n\n- ui: app/ui/*\n- `core`: app/core/*, app/util.py\n')
+        _write(tmp_path, 'app/__init__.py')
+        _write(tmp_path, 'app/ui/__init__.py')
+        _write(tmp_path, 'app/ui/view.py', 'import app.core.model\n')
+        _write(tmp_path, 'app/core/__init__.py')
+        _write(tmp_path, 'app/core/model.py', 'import app.util\n')
+        _write(tmp_path, 'app/util.py', 'import app.ui.view\n')
+        g = _exec_visualize()
+        out = g['cycles'](str(tmp_path))
+        assert '### Layer violations (1)' in out
+        assert '- core -> ui: app/util.py --> app/ui/view.py' in out
+
+    def test_layers_respected(self, tmp_path):
+        _write(tmp_path, 'docs/architecture/governance/layers.md', '1. ui: ui.py\n2. core: core.py\n')
+        _write(tmp_path, 'ui.py', 'import core\n')
+        _write(tmp_path, 'core.py')
+        g = _exec_visualize()
+        assert '2 layers' in g['cycles'](str(tmp_path))
+
+    def test_cli_exit_code(self, tmp_path):
+        from pactkit.prompts import VISUALIZE_SOURCE
+        script = tmp_path / 'visualize.py'
+        script.write_text(VISUALIZE_SOURCE, encoding='utf-8')
+        proj = tmp_path / 'proj'
+        _write(proj, 'a.py', 'import b\n')
+        _write(proj, 'b.py', 'import a\n')
+        result = subprocess.run([sys.executable, str(script), 'cycles'], cwd=proj, capture_output=True, text=True)
+        assert result.returncode == 1
+        assert 'Cycle 1' in result.stdout
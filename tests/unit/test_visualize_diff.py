@@ -0,0 +1,91 @@
+"""Tests for `visualize diff` between architecture snapshots."""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _snapshot(g, proj, version):
+    """Render all graphs and copy them the way `board.py snapshot` does."""
+    g['visualize'](str(proj), mode='all')
+    graphs = proj / 'docs/architecture/graphs'
+    snaps = proj / 'docs/architecture/snapshots'
+    snaps.mkdir(parents=True, exist_ok=True)
+    for name in ('code_graph.mmd', 'code_graph.json', 'class_graph.mmd', 'call_graph.mmd'):
+        (snaps / f'{version}_{name}').write_text((graphs / name).read_text(), encoding='utf-8')
+
+
+def _two_versions(tmp_path):
+    g = _exec_visualize()
+    (tmp_path / 'core.py').write_text('class Base:\n    pass\n', encoding='utf-8')
+    (tmp_path / 'api.py').write_text('import core\n\ndef serve():\n    helper()\n\ndef helper():\n    pass\n', encoding='utf-8')
+    (tmp_path / 'old.py').write_text('import core\n', encoding='utf-8')
+    _snapshot(g, tmp_path, 'v1')
+    (tmp_path / 'old.py').unlink()
+    (tmp_path / 'cli.py').write_text('import api\nimport core\n\nclass Cmd(core.Base):\n    pass\n', encoding='utf-8')
+    (tmp_path / 'api.py').write_text('import core\n\ndef serve():\n    pass\n\ndef helper():\n    pass\n', encoding='utf-8')
+    _snapshot(g, tmp_path, 'v2')
+    return g
+
+
+class TestDiff:
+    def test_reports_modules_edges_and_fan_in(self, tmp_path):
+        g = _two_versions(tmp_path)
+        out = g['diff'](str(tmp_path), 'v1', 'v2')
+        assert '### Modules (+1 / -1)' in out
+        assert '+ cli.py' in out
+        assert '- old.py' in out
+        assert '+ cli.py --> api.py' in out
+        assert '- old.py --> core.py' in out
+        assert 'api.py: 0 -> 1' in out
+
+    def test_reports_classes_and_call_edges(self, tmp_path):
+        g = _two_versions(tmp_path)
+        out = g['diff'](str(tmp_path), 'v1', 'v2')
+        assert '+ Cmd' in out
+        assert '+ Base <|-- Cmd' in out
+        assert '- serve --> helper' in out
+
+    def test_mmd_only_snapshots_give_same_structure(self, tmp_path):
+        g = _two_versions(tmp_path)
+        with_json = g['diff'](str(tmp_path), 'v1', 'v2')
+        for version in ('v1', 'v2'):
+            (tmp_path / f'docs/architecture/snapshots/{version}_code_graph.json').unlink()
+        assert g['diff'](str(tmp_path), 'v1', 'v2') == with_json
+
+    def test_line_order_does_not_matter(self, tmp_path):
+        g = _two_versions(tmp_path)
+        snap = tmp_path / 'docs/architecture/snapshots/v2_code_graph.mmd'
+        (tmp_path / 'docs/architecture/snapshots/v2_code_graph.json').unlink()
+        (tmp_path / 'docs/architecture/snapshots/v1_code_graph.json').unlink()
+        lines = snap.read_text().splitlines()
+        snap.write_text('\n'.join([lines[0]] + lines[:0:-1]), encoding='utf-8')
+        out = g['diff'](str(tmp_path), 'v1', 'v2')
+        assert '### Import edges (+2 / -1)' in out
+
+    def test_identical_versions_have_empty_diff(self, tmp_path):
+        g = _two_versions(tmp_path)
+        out = g['diff'](str(tmp_path), 'v2', 'current')
+        assert '+ ' not in out and '- ' not in out
+        assert '### Fan-in changes (0)' in out
+
+    def test_missing_snapshot(self, tmp_path):
+        g = _two_versions(tmp_path)
+        assert g['diff'](str(tmp_path), 'v0', 'v2').startswith('❌')
+
+    def test_missing_class_graph_is_skipped(self, tmp_path):
+        g = _two_versions(tmp_path)
+        (tmp_path / 'docs/architecture/snapshots/v1_class_graph.mmd').unlink()
+        out = g['diff'](str(tmp_path), 'v1', 'v2')
+        assert "⚠️ class_graph.mmd missing for 'v1'" in out
+        assert 'Call edges' in out
@@ -0,0 +1,172 @@
+"""Tests for `visualize flame` (folded stacks and the offline SVG flamegraph)."""
+import cProfile
+import pstats
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _raw(root):
+    # main -> heavy -> light, main -> run -> light, light -> len (a C call)
+    f = str(root / 'app/work.py')
+    main, heavy, light, run = (f, 5, 'main'), (f, 11, 'heavy'), (f, 15, 'light'), (f, 19, 'run')
+    return {
+        main: (1, 1, 2.0, 10.0, {}),
+        heavy: (1, 1, 1.0, 6.0, {main: (1, 1, 1.0, 6.0)}),
+        light: (2, 2, 5.0, 6.0, {heavy: (1, 1, 5.0, 5.0), run: (1, 1, 1.0, 1.0)}),
+        run: (1, 1, 1.0, 2.0, {main: (1, 1, 1.0, 2.0)}),
+        ('~', 0, '<built-in method builtins.len>'): (1, 1, 1.0, 1.0, {light: (1, 1, 1.0, 1.0)}),
+    }
+
+
+def _folded(lines):
+    return {line.rpartition(' ')[0]: int(line.rpartition(' ')[2]) for line in lines}
+
+
+SCRIPT = (
+    'import sys\n'
+    '\n'
+    'def spin(n):\n'
+    '    return sum(range(n))\n'
+    '\n'
+    'def outer():\n'
+    '    for _ in range(50):\n'
+    '        spin(20000)\n'
+    '\n'
+    'outer()\n'
+    'sys.exit(int(sys.argv[1]) if len(sys.argv) > 1 else 0)\n'
+)
+
+
+class TestPstatsFolded:
+    def test_splits_time_along_call_paths(self, tmp_path):
+        g = _exec_visualize()
+        folded = _folded(g['_pstats_folded'](_raw(tmp_path), tmp_path))
+        main, heavy = 'main (app/work.py:5)', 'heavy (app/work.py:11)'
+        light, run = 'light (app/work.py:15)', 'run (app/work.py:19)'
+        len_frame = '<built-in method builtins.len>'
+        assert folded[main] == 2_000_000
+        assert folded[f'{main};{heavy}'] == 1_000_000
+        # light took 6s in total: 5/6 of it under heavy, 1/6 under run
+        assert folded[f'{main};{heavy};{light}'] == round(5.0 * 5 / 6 * 1e6)
+        assert folded[f'{main};{heavy};{light};{len_frame}'] == round(5 / 6 * 1e6)
+        assert folded[f'{main};{run};{light}'] == round(5.0 / 6 * 1e6)
+        assert sum(folded.values()) == 10_000_000
+
+    def test_recursion_is_cut(self, tmp_path):
+        g = _exec_visualize()
+        f = str(tmp_path / 'r.py')
+        top, rec = (f, 1, 'top'), (f, 4, 'rec')
+        raw = {top: (1, 1, 1.0, 4.0, {}), rec: (3, 1, 3.0, 3.0, {top: (1, 1, 1.0, 3.0), rec: (2, 2, 2.0, 2.0)})}
+        folded = _folded(g['_pstats_folded'](raw, tmp_path))
+        assert folded == {'top (r.py:1)': 1_000_000, 'top (r.py:1);rec (r.py:4)': 3_000_000}
+
+    def test_external_paths_keep_last_two_parts(self, tmp_path):
+        g = _exec_visualize()
+        raw = {('/usr/lib/python3/json/decoder.py', 7, 'decode'): (1, 1, 1.0, 1.0, {})}
+        assert g['_pstats_folded'](raw, tmp_path) == ['decode (json/decoder.py:7) 1000000']
+
+
+    def test_real_dump_with_imports(self, tmp_path, monkeypatch):
+        # builtins.exec runs the top-level code and is also called by importlib, so it has callers
+        (tmp_path / 'flame_helper_mod.py').write_text('def spin(n):\n    return sum(range(n))\n', encoding='utf-8')
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, 'flame_helper_mod', raising=False)
+        code = compile('import flame_helper_mod\nfor _ in range(100):\n    flame_helper_mod.spin(20000)\n',
+                       str(tmp_path / 'run.py'), 'exec')
+        prof = cProfile.Profile()
+        prof.enable()
+        exec(code, {})
+        prof.disable()
+        pstats.Stats(prof).dump_stats(str(tmp_path / 'prof.out'))
+        g = _exec_visualize()
+        msg = g['flame'](str(tmp_path), pstats_file=str(tmp_path / 'prof.out'))
+        folded = _folded((tmp_path / 'docs/architecture/graphs/flame.folded').read_text().splitlines())
+        spin = sum(n for stack, n in folded.items() if '<module> (run.py:1);spin (flame_helper_mod.py:1)' in stack)
+        assert msg.startswith('✅') and spin > 0.5 * sum(folded.values())
+
+    def test_falls_back_to_largest_cumulative_time(self, tmp_path):
+        g = _exec_visualize()
+        f = str(tmp_path / 'c.py')
+        a, b = (f, 1, 'a'), (f, 2, 'b')
+        # every frame's time is claimed by a caller: start from the one with the most cumulative time
+        raw = {a: (1, 1, 1.0, 3.0, {b: (1, 1, 1.0, 3.0)}), b: (1, 1, 2.0, 2.0, {a: (1, 1, 2.0, 2.0)})}
+        folded = _folded(g['_pstats_folded'](raw, tmp_path))
+        assert {stack.split(';')[0] for stack in folded} == {'a (c.py:1)'}
+        assert folded['a (c.py:1);b (c.py:2)'] > 0
+
+
+class TestSvg:
+    def test_frames_titles_and_escaping(self):
+        g = _exec_visualize()
+        svg, total = g['_flame_svg'](['main;a<b> 30', 'main;c&d 10', 'main 10', 'junk'], 'run "x"')
+        assert total == 50
+        assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg"') and svg.endswith('</svg>')
+        assert svg.count('<rect ') == 4  # background + main + two children
+        assert '<title>main (50 us, 100.00%)</title>' in svg
+        assert '<title>a&lt;b&gt; (30 us, 60.00%)</title>' in svg
+        assert 'c&amp;d' in svg and 'run &quot;x&quot;' in svg
+
+    def test_deep_stacks(self):
+        g = _exec_visualize()
+        stack = ';'.join(f'r{i}' for i in range(3000))
+        svg, total = g['_flame_svg']([f'{stack} 10', 'main 10'], 't')
+        assert total == 20 and svg.count('<rect ') == 3002
+
+    def test_tiny_frames_are_skipped(self):
+        g = _exec_visualize()
+        svg, _ = g['_flame_svg'](['big 1000000', 'big;tiny 1'], 't')
+        assert 'tiny' not in svg
+
+
+class TestFlameCommand:
+    def test_traces_a_script(self, tmp_path):
+        (tmp_path / 'work.py').write_text(SCRIPT, encoding='utf-8')
+        g = _exec_visualize()
+        msg = g['flame'](str(tmp_path), command=['--', 'python', 'work.py'])
+        assert msg.startswith('✅') and '⚠️' not in msg
+        graphs = tmp_path / 'docs/architecture/graphs'
+        folded = _folded((graphs / 'flame.folded').read_text().splitlines())
+        spin = [stack for stack in folded if stack.endswith('outer (work.py:6);spin (work.py:3)')]
+        assert spin and spin[0].startswith('exec;<module> (work.py:1)')
+        assert not any('runpy' in stack for stack in folded)
+        assert 'spin (work.py:3)' in (graphs / 'flame.svg').read_text()
+
+    def test_deep_recursion_in_a_traced_script(self, tmp_path):
+        (tmp_path / 'd.py').write_text('import sys\nsys.setrecursionlimit(5000)\n'
+                                       'def r(n): return 0 if n == 0 else r(n - 1)\nr(900)\n', encoding='utf-8')
+        g = _exec_visualize()
+        msg = g['flame'](str(tmp_path), command=['d.py'])
+        assert msg.startswith('✅')
+        assert 'r (d.py:3)' in (tmp_path / 'docs/architecture/graphs/flame.svg').read_text()
+
+    def test_nonzero_exit_warns(self, tmp_path):
+        (tmp_path / 'work.py').write_text(SCRIPT, encoding='utf-8')
+        g = _exec_visualize()
+        msg = g['flame'](str(tmp_path), command=['work.py', '3'])
+        assert 'exited with 3' in msg
+        assert (tmp_path / 'docs/architecture/graphs/flame.svg').exists()
+
+    def test_renders_folded_file(self, tmp_path):
+        (tmp_path / 'in.folded').write_text('a;b 5\na 5\n', encoding='utf-8')
+        g = _exec_visualize()
+        msg = g['flame'](str(tmp_path), folded_file=str(tmp_path / 'in.folded'))
+        assert '2 stacks' in msg
+        assert (tmp_path / 'docs/architecture/graphs/flame.folded').read_text() == 'a;b 5\na 5\n'
+
+    def test_needs_exactly_one_source(self, tmp_path):
+        g = _exec_visualize()
+        assert g['flame'](str(tmp_path)).startswith('❌')
+        assert g['flame'](str(tmp_path), pstats_file='p', command=['x.py']).startswith('❌')
+        assert 'Cannot read profile' in g['flame'](str(tmp_path), pstats_file=str(tmp_path / 'nope'))
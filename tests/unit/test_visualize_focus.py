@@ -0,0 +1,108 @@
+"""Tests for adjacency-indexed focus graphs (--focus / --depth / --direction)."""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _create_chain(tmp_path):
+    """app -> svc -> repo -> db, plus unrelated data.py and a.py."""
+    files = {
+        'app.py': 'import svc\n',
+        'svc.py': 'import repo\n',
+        'repo.py': 'import db\nimport db\n',
+        'db.py': '',
+        'a.py': '',
+        'data.py': '',
+        'b.py': 'import a\n',
+    }
+    for name, body in files.items():
+        (tmp_path / name).write_text(body, encoding='utf-8')
+    return tmp_path
+
+
+def _focus(g, proj, focus, **kw):
+    g['visualize'](str(proj), focus=focus, **kw)
+    return (proj / 'docs/architecture/graphs/focus_graph.mmd').read_text()
+
+
+class TestFocusExactMembership:
+    def test_no_substring_false_matches(self, tmp_path):
+        proj = _create_chain(tmp_path)
+        g = _exec_visualize()
+        output = _focus(g, proj, 'b.py')
+        assert 'a_py["a.py"]' in output
+        assert 'data_py' not in output
+
+    def test_default_is_one_hop_both_directions(self, tmp_path):
+        proj = _create_chain(tmp_path)
+        g = _exec_visualize()
+        output = _focus(g, proj, 'svc.py')
+        assert 'app_py --> svc_py' in output
+        assert 'svc_py --> repo_py' in output
+        assert 'db_py' not in output
+
+    def test_duplicate_imports_render_one_edge(self, tmp_path):
+        proj = _create_chain(tmp_path)
+        g = _exec_visualize()
+        output = _focus(g, proj, 'repo.py')
+        assert output.count('repo_py --> db_py') == 1
+
+
+class TestFocusDepthAndDirection:
+    def test_depth_two_out(self, tmp_path):
+        proj = _create_chain(tmp_path)
+        g = _exec_visualize()
+        output = _focus(g, proj, 'app.py', depth=2, direction='out')
+        assert 'app_py --> svc_py' in output
+        assert 'svc_py --> repo_py' in output
+        assert 'repo_py --> db_py' not in output
+
+    def test_direction_in_only(self, tmp_path):
+        proj = _create_chain(tmp_path)
+        g = _exec_visualize()
+        output = _focus(g, proj, 'repo.py', depth=5, direction='in')
+        assert 'svc_py --> repo_py' in output
+        assert 'app_py --> svc_py' in output
+        assert 'db_py' not in output
+
+    def test_depth_zero_is_just_the_target(self, tmp_path):
+        proj = _create_chain(tmp_path)
+        g = _exec_visualize()
+        output = _focus(g, proj, 'svc.py', depth=0)
+        assert 'svc_py["svc.py"]' in output
+        assert '-->' not in output
+
+    def test_missing_focus_reports_error(self, tmp_path):
+        proj = _create_chain(tmp_path)
+        g = _exec_visualize()
+        result = g['visualize'](str(proj), focus='nope.py')
+        assert result.startswith('❌')
+
+
+class TestNeighbourhood:
+    def test_hops_recorded(self):
+        g = _exec_visualize()
+        fwd = {'a': {'b': None}, 'b': {'c': None}}
+        rev = {'b': {'a': None}, 'c': {'b': None}}
+        dist, edges = g['_neighbourhood'](fwd, rev, ['a'], depth=3, direction='out')
+        assert dist == {'a': 0, 'b': 1, 'c': 2}
+        assert edges == [('a', 'b'), ('b', 'c')]
+
+    def test_cycle_terminates(self):
+        g = _exec_visualize()
+        fwd = {'a': {'b': None}, 'b': {'a': None}}
+        rev = {'a': {'b': None}, 'b': {'a': None}}
+        dist, edges = g['_neighbourhood'](fwd, rev, ['a'], depth=100)
+        assert dist == {'a': 0, 'b': 1}
+        assert set(edges) == {('a', 'b'), ('b', 'a')}
@@ -0,0 +1,218 @@
+"""Tests for test-impact selection: `visualize impacted --since <rev>`."""
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git not available')
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _git(root, *args):
+    subprocess.run(['git', '-c', 'user.email=t@example.com', '-c', 'user.name=t', *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+def _create_repo(tmp_path):
+    """cli -> service -> model; util is standalone. Each has a mapped unit test."""
+    files = {
+        'pkg/__init__.py': '',
+        'pkg/model.py': 'class Model:\n    pass\n',
+        'pkg/service.py': 'from pkg.model import Model\n',
+        'pkg/cli.py': 'from pkg.service import run\n',
+        'pkg/util.py': '',
+        'pyproject.toml': '[project]\nname = "x"\n',
+        'tests/unit/test_model.py': '',
+        'tests/unit/test_service.py': '',
+        'tests/unit/test_cli.py': '',
+        'tests/unit/test_util.py': '',
+        'tests/unit/test_other.py': '',
+    }
+    for rel, body in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding='utf-8')
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-qm', 'init')
+    return tmp_path
+
+
+class TestImpacted:
+    def test_no_changes_selects_nothing(self, tmp_path):
+        repo = _create_repo(tmp_path)
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD') == ''
+
+    def test_leaf_change_pulls_in_transitive_importers(self, tmp_path):
+        repo = _create_repo(tmp_path)
+        (repo / 'pkg/model.py').write_text('class Model:\n    x = 1\n', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD').split() == [
+            'tests/unit/test_cli.py', 'tests/unit/test_model.py', 'tests/unit/test_service.py']
+
+    def test_top_level_change_selects_only_its_test(self, tmp_path):
+        repo = _create_repo(tmp_path)
+        (repo / 'pkg/cli.py').write_text('from pkg.service import run\nrun()\n', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD') == 'tests/unit/test_cli.py'
+
+    def test_changed_test_file_included(self, tmp_path):
+        repo = _create_repo(tmp_path)
+        (repo / 'tests/unit/test_other.py').write_text('def test_x(): pass\n', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD') == 'tests/unit/test_other.py'
+
+    def test_untracked_file_counts_as_changed(self, tmp_path):
+        repo = _create_repo(tmp_path)
+        (repo / 'pkg/extra.py').write_text('import pkg.util\n', encoding='utf-8')
+        (repo / 'tests/unit/test_extra.py').write_text('', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD').split() == ['tests/unit/test_extra.py']
+
+    def test_since_older_revision(self, tmp_path):
+        repo = _create_repo(tmp_path)
+        (repo / 'pkg/util.py').write_text('X = 1\n', encoding='utf-8')
+        _git(repo, 'commit', '-qam', 'util')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD') == ''
+        assert g['impacted'](str(repo), 'HEAD~1') == 'tests/unit/test_util.py'
+
+    def test_cache_dir_is_self_ignoring(self, tmp_path):
+        repo = _create_repo(tmp_path)
+        g = _exec_visualize()
+        g['impacted'](str(repo), 'HEAD')
+        assert (repo / '.claude/pactkit_cache/.gitignore').read_text() == '*\n'
+        assert g['_git_changed'](repo, 'HEAD') == []
+
+
+
+def _create_src_repo(tmp_path):
+    """src layout: core imports util through its package (`from app import util`); ns has no __init__."""
+    files = {
+        'src/app/__init__.py': '',
+        'src/app/util.py': 'X = 1\n',
+        'src/app/core.py': 'from app import util\n',
+        'src/app/api.py': 'import app.core\n',
+        'src/other/__init__.py': '',
+        'src/other/solo.py': '',
+        'src/ns/mod.py': 'def f():\n    pass\n',
+        'src/ns/user.py': 'from ns.mod import f\n',
+        'tests/unit/test_util.py': '',
+        'tests/unit/test_core.py': '',
+        'tests/unit/test_api.py': '',
+        'tests/unit/test_solo.py': '',
+        'tests/unit/test_user.py': '',
+    }
+    for rel, body in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding='utf-8')
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, 'commit', '-qm', 'init')
+    return tmp_path
+
+
+class TestImpactedConservative:
+    def test_import_through_package_init(self, tmp_path):
+        repo = _create_src_repo(tmp_path)
+        (repo / 'src/app/util.py').write_text('X = 2\n', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD').split() == [
+            'tests/unit/test_api.py', 'tests/unit/test_core.py', 'tests/unit/test_util.py']
+
+    def test_deleted_module_selects_its_importers(self, tmp_path):
+        repo = _create_src_repo(tmp_path)
+        _git(repo, 'rm', '-q', 'src/app/util.py')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD').split() == [
+            'tests/unit/test_api.py', 'tests/unit/test_core.py', 'tests/unit/test_util.py']
+
+    def test_deleted_module_in_namespace_package(self, tmp_path):
+        repo = _create_src_repo(tmp_path)
+        _git(repo, 'rm', '-q', 'src/ns/mod.py')  # no __init__.py, so nothing resolves to ns any more
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD') == 'tests/unit/test_user.py'
+
+    def test_renamed_module_keeps_the_old_path(self, tmp_path):
+        repo = _create_src_repo(tmp_path)
+        _git(repo, 'mv', 'src/app/util.py', 'src/app/helpers.py')
+        g = _exec_visualize()
+        assert 'tests/unit/test_core.py' in g['impacted'](str(repo), 'HEAD').split()
+
+    def test_deleted_non_python_source_selects_all(self, tmp_path):
+        repo = _create_src_repo(tmp_path)
+        (repo / 'web').mkdir()
+        (repo / 'web/a.ts').write_text('export const a = 1\n', encoding='utf-8')
+        _git(repo, 'add', '.')
+        _git(repo, 'commit', '-qm', 'ts')
+        _git(repo, 'rm', '-q', 'web/a.ts')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD') == 'ALL'
+
+
+class TestImpactedInfra:
+    @pytest.mark.parametrize('rel', ['pyproject.toml', 'tests/conftest.py', 'requirements-dev.txt'])
+    def test_infra_change_selects_all(self, tmp_path, rel):
+        repo = _create_repo(tmp_path)
+        (repo / rel).write_text('# changed\n', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'HEAD') == 'ALL'
+
+    def test_bad_revision(self, tmp_path):
+        repo = _create_repo(tmp_path)
+        g = _exec_visualize()
+        assert g['impacted'](str(repo), 'no-such-rev').startswith('❌')
+
+    def test_cli_exits_nonzero_on_error(self, tmp_path):
+        from pactkit.prompts import VISUALIZE_SOURCE
+        repo = _create_repo(tmp_path / 'repo')
+        script = tmp_path / 'visualize.py'
+        script.write_text(VISUALIZE_SOURCE, encoding='utf-8')
+        env = {**os.environ, 'PACTKIT_NO_SERVE': '1'}
+        for rev, code in (('no-such-rev', 1), ('HEAD', 0)):
+            result = subprocess.run([sys.executable, str(script), 'impacted', '--since', rev], cwd=repo,
+                                    capture_output=True, text=True, env=env)
+            assert result.returncode == code, result.stdout
+
+
+class TestTestMapping:
+    def test_map_matches_lang_profiles(self):
+        from pactkit.prompts.workflows import LANG_PROFILES
+        g = _exec_visualize()
+        assert g['_TEST_MAP'] == {p['file_ext']: p['test_map_pattern'] for p in LANG_PROFILES.values()}
+
+    def test_python_pattern(self, tmp_path):
+        (tmp_path / 'tests/unit').mkdir(parents=True)
+        (tmp_path / 'tests/unit/test_foo.py').write_text('', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['_mapped_test'](tmp_path, 'src/pkg/foo.py') == 'tests/unit/test_foo.py'
+        assert g['_mapped_test'](tmp_path, 'src/pkg/bar.py') is None
+
+    def test_go_pattern_uses_package_dir(self, tmp_path):
+        (tmp_path / 'internal/auth').mkdir(parents=True)
+        (tmp_path / 'internal/auth/login_test.go').write_text('', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['_mapped_test'](tmp_path, 'internal/auth/login.go') == 'internal/auth/login_test.go'
+
+    def test_java_pattern_strips_main_root(self, tmp_path):
+        (tmp_path / 'src/test/java/com/acme').mkdir(parents=True)
+        (tmp_path / 'src/test/java/com/acme/UserTest.java').write_text('', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['_mapped_test'](tmp_path, 'src/main/java/com/acme/User.java') == 'src/test/java/com/acme/UserTest.java'
+
@@ -0,0 +1,95 @@
+"""Tests for the import-only extractor used by visualize.py file mode (_extract_imports)."""
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _fast_and_full(g, source):
+    fallbacks = []
+    original = g['_extract_source']
+    g['_extract_source'] = lambda src: fallbacks.append(src) or original(src)
+    fast = g['_extract_imports'](source)
+    g['_extract_source'] = original
+    return fast, original(source), bool(fallbacks)
+
+
+CASES = {
+    'plain': 'import os, json\nfrom pkg.mod import a as b\n',
+    'relative': 'from . import x\nfrom .sibling import y\nfrom ..pkg import z\n',
+    'parenthesized': 'from pkg import (\n    a,  # first\n    b,\n)\nimport c\n',
+    'backslash': 'from pkg import a, \\\n    b\nimport c\n',
+    'nested_order': (
+        'import first\n'
+        'def f():\n'
+        '    import inner\n'
+        '    if x:\n'
+        '        from deep import y\n'
+        'import last\n'
+    ),
+    'docstring': (
+        '"""Module docs.\n\nimport not_code\nfrom nowhere import x\n"""\n'
+        "s = '''\nimport also_not_code\n'''\n"
+        'x = "from fake import y"  # import comment\n'
+        'import real\n'
+    ),
+    'escaped_quotes': 's = """a \\""" b\nimport hidden\n"""\nimport shown\n',
+    'no_imports': 'x = 1\n',
+}
+
+
+class TestSameImportsAsFullParse:
+    @pytest.mark.parametrize('name', sorted(CASES))
+    def test_case(self, name):
+        g = _exec_visualize()
+        fast, full, _ = _fast_and_full(g, CASES[name])
+        assert fast['imports'] == full['imports']
+        assert fast['imports_only'] is True
+
+    def test_repo_sources(self):
+        g = _exec_visualize()
+        checked = 0
+        for path in sorted((project_root / 'src').rglob('*.py')) + sorted((project_root / 'tests').rglob('*.py')):
+            source = path.read_text(encoding='utf-8')
+            fast, full, _ = _fast_and_full(g, source)
+            assert fast['imports'] == full['imports'], path
+            checked += 1
+        assert checked > 50
+
+
+class TestFallback:
+    @pytest.mark.parametrize('source', [
+        'try: import ujson as json\nexcept ImportError: import json\n',
+        'x = 1; import os\n',
+        'if TYPE_CHECKING: from a import b\n',
+    ])
+    def test_inline_imports_use_full_parse(self, source):
+        g = _exec_visualize()
+        fast, full, fell_back = _fast_and_full(g, source)
+        assert fell_back
+        assert fast == full
+
+    def test_unparseable_statement_reports_error(self):
+        g = _exec_visualize()
+        fast, _, fell_back = _fast_and_full(g, 'from a import (b,\n')
+        assert fell_back
+        assert fast['error'].startswith('SyntaxError')
+
+    def test_import_keyword_in_expression_is_not_mistaken(self):
+        g = _exec_visualize()
+        source = 'import os\n\ndef gen():\n    x = (yield\n         from other())\n'
+        fast, full, fell_back = _fast_and_full(g, source)
+        assert fell_back
+        assert fast['imports'] == full['imports'] == ['os']
@@ -0,0 +1,137 @@
+"""Tests for `visualize importtime` (-X importtime timings joined onto the file graph)."""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+STDERR = (
+    'import time: self [us] | cumulative | imported package\n'
+    'import time:       100 |        100 |   _io\n'
+    'import time:       200 |        300 | io\n'
+    'some warning printed by the program\n'
+    'import time:      1000 |       1000 |         yaml.reader\n'
+    'import time:      3000 |       4000 |       yaml\n'
+    'import time:       500 |        500 |       app.util\n'
+    'import time:      2000 |       6500 |     app.core\n'
+    'import time:       500 |        500 |     app.util.extra\n'
+    'import time:       100 |       7100 |   app\n'
+    'import time:       100 |       7200 | app.cli\n'
+)
+
+
+def _write(root, rel, body=''):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding='utf-8')
+
+
+def _project(root):
+    _write(root, 'app/__init__.py', 'import app.core\n')
+    _write(root, 'app/core.py', 'import yaml\nimport app.util\n')
+    _write(root, 'app/util.py')
+    _write(root, 'app/cli.py', 'import app\nimport app.util\n')
+    return root
+
+
+def _graph(g, root, text, top=20):
+    all_files, module_index, file_to_node = g['_scan_files'](root)
+    facts = g['_load_facts'](root, all_files, use_cache=False, imports_only=True)
+    graph = g['_build_import_graph'](all_files, module_index, file_to_node, facts)
+    _, mmd, _, table = g['_build_importtime_graph'](root, graph, module_index, g['_parse_importtime'](text), 'run', top)
+    return mmd, table
+
+
+class TestParse:
+    def test_builds_tree_from_post_order(self):
+        g = _exec_visualize()
+        tree = g['_parse_importtime'](STDERR)
+        assert [n['name'] for n in tree] == ['io', 'app.cli']
+        app = tree[1]['children'][0]
+        assert app['name'] == 'app' and app['cum'] == 7100
+        assert [c['name'] for c in app['children']] == ['app.core', 'app.util.extra']
+        core = app['children'][0]
+        assert [c['name'] for c in core['children']] == ['yaml', 'app.util']
+        assert core['children'][0]['children'][0] == {'name': 'yaml.reader', 'self': 1000, 'cum': 1000, 'children': []}
+
+    def test_ignores_other_output(self):
+        g = _exec_visualize()
+        assert g['_parse_importtime']('hello\nTraceback (most recent call last):\n') == []
+
+
+class TestGraph:
+    def test_joins_timings_onto_file_nodes(self, tmp_path):
+        g = _exec_visualize()
+        mmd, _ = _graph(g, _project(tmp_path), STDERR)
+        lines = [line.strip() for line in mmd.split('\n')]
+        assert 'app_core_py["app/core.py<br/>6.5ms cum, 2.0ms self"]' in lines
+        assert 'ext_yaml["yaml (ext)<br/>4.0ms"]' in lines  # yaml.reader is inside it
+        assert 'app___init___py -->|6.5ms| app_core_py' in lines
+        assert 'app_core_py -->|0.5ms| app_util_py' in lines
+        assert 'app_core_py -->|4.0ms| ext_yaml' in lines
+        assert 'importtime_cmd -->|0.3ms| ext_io' in lines
+        assert 'app_util_py["app/util.py<br/>1.0ms cum, 1.0ms self"]' in lines  # app.util + app.util.extra
+        assert 'app___init___py -.->|0.5ms| app_util_py' in lines  # submodule import, not a static edge
+        assert 'app_cli_py --> app_util_py' in lines  # static edge, util was already loaded
+
+    def test_project_package_named_ext(self, tmp_path):
+        _write(tmp_path, 'ext/__init__.py')
+        _write(tmp_path, 'ext/util.py', 'import json\nimport email.mime.text\n')
+        _write(tmp_path, 'main.py', 'import ext.util\n')
+        text = (
+            'import time:        50 |         50 |     ext\n'
+            'import time:       400 |        400 |       json\n'
+            'import time:       100 |        100 |         email.charset\n'
+            'import time:       300 |        400 |       email.mime.text\n'
+            'import time:       200 |       1000 |     ext.util\n'
+            'import time:       100 |       1150 |   main\n'
+        )
+        g = _exec_visualize()
+        mmd, _ = _graph(g, tmp_path, text)
+        lines = [line.strip() for line in mmd.split('\n')]
+        assert lines[1].startswith('%% 3 project modules and 2 external packages')
+        assert 'ext_util_py["ext/util.py<br/>1.0ms cum, 0.2ms self"]' in lines
+        assert 'ext_util_py -->|0.4ms| ext_json' in lines
+        assert 'ext_util_py -->|0.4ms| ext_email' in lines
+
+    def test_ranked_table(self, tmp_path):
+        g = _exec_visualize()
+        _, table = _graph(g, _project(tmp_path), STDERR, top=3)
+        rows = table.split('\n')[2:]
+        assert rows == ['| 1 | `run` | `app/cli.py` | 7.2ms | 96% |',
+                        '| 2 | `app/cli.py` | `app/__init__.py` | 7.1ms | 95% |',
+                        '| 3 | `app/__init__.py` | `app/core.py` | 6.5ms | 87% |']
+
+
+class TestImporttimeCommand:
+    def test_runs_python_command(self, tmp_path):
+        _project(tmp_path)
+        _write(tmp_path, 'app/core.py', 'import json\nimport app.util\n')
+        g = _exec_visualize()
+        msg = g['importtime'](str(tmp_path), ['--', '-c', 'import app.cli'], use_cache=False)
+        assert msg.startswith('✅') and '| 1 |' in msg
+        mmd = (tmp_path / 'docs/architecture/graphs/importtime_graph.mmd').read_text()
+        assert 'app_core_py -->|' in mmd and 'ext_json' in mmd
+        assert (tmp_path / 'docs/architecture/graphs/importtime.md').read_text().startswith('# Most expensive imports')
+
+    def test_failing_command_warns(self, tmp_path):
+        _project(tmp_path)
+        g = _exec_visualize()
+        msg = g['importtime'](str(tmp_path), ['-c', 'import app.cli; raise SystemExit(2)'], use_cache=False)
+        assert msg.startswith('⚠️') and 'exited with 2' in msg
+
+    def test_errors(self, tmp_path):
+        g = _exec_visualize()
+        assert g['importtime'](str(tmp_path), []).startswith('❌')
+        assert g['importtime'](str(tmp_path), ['true']).startswith('❌ No import timings')
+        assert g['importtime'](str(tmp_path), ['no-such-command-xyz']).startswith('❌ Cannot run')
@@ -0,0 +1,148 @@
+"""Tests for the SQLite symbol index behind `index`, `find-def`, `find-refs` and `callers`."""
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+AUTH = (
+    'import json\n'                       # 1
+    '\n'                                  # 2
+    '\n'                                  # 3
+    'class Auth:\n'                       # 4
+    '    class Token:\n'                  # 5
+    '        def encode(self):\n'         # 6
+    '            return json.dumps(1)\n'  # 7
+    '\n'                                  # 8
+    '    def login(self, user):\n'        # 9
+    '        def check():\n'              # 10
+    '            return user\n'           # 11
+    '        check()\n'                   # 12
+    '        return self.issue()\n'       # 13
+    '\n'                                  # 14
+    '    def issue(self):\n'              # 15
+    '        return Auth.Token()\n'       # 16
+)
+
+API = (
+    'from app.auth import Auth\n'         # 1
+    '\n'                                  # 2
+    '\n'                                  # 3
+    'def handler(req):\n'                 # 4
+    '    auth = Auth()\n'                 # 5
+    '    return auth.login(req)\n'        # 6
+    '\n'                                  # 7
+    '\n'                                  # 8
+    'def route(req):\n'                   # 9
+    '    return handler(req)\n'           # 10
+)
+
+
+def _write(root, rel, body=''):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding='utf-8')
+    return path
+
+
+def _project(root):
+    _write(root, 'app/__init__.py')
+    _write(root, 'app/auth.py', AUTH)
+    _write(root, 'app/api.py', API)
+    return root
+
+
+class TestRows:
+    def test_kinds_spans_and_nested_classes(self):
+        g = _exec_visualize()
+        symbols, calls = g['_index_rows'](g['_extract_source'](AUTH))
+        assert symbols == [
+            ('class', 'Auth', 'Auth', 4, 16),
+            ('class', 'Token', 'Auth.Token', 5, 7),
+            ('method', 'encode', 'Auth.Token.encode', 6, 7),
+            ('method', 'login', 'Auth.login', 9, 13),
+            ('function', 'check', 'Auth.login.check', 10, 11),
+            ('method', 'issue', 'Auth.issue', 15, 16),
+        ]
+        assert ('Auth.login', 'Auth.issue', 'issue', 13) in calls
+        assert ('Auth.Token.encode', 'json.dumps', 'dumps', 7) in calls
+
+
+class TestBuild:
+    def test_incremental_by_mtime(self, tmp_path):
+        root = _project(tmp_path)
+        g = _exec_visualize()
+        assert '3 files; 3 updated, 0 removed' in g['build_index'](str(root))
+        assert '0 updated, 0 removed' in g['build_index'](str(root))
+        api = _write(root, 'app/api.py', API + '\n\ndef extra():\n    pass\n')
+        os.utime(api, ns=(1, 1))
+        (root / 'app/__init__.py').unlink()
+        assert '2 files; 1 updated, 1 removed' in g['build_index'](str(root))
+        db = sqlite3.connect(str(root / '.claude/pactkit_cache/index.sqlite'))
+        assert db.execute("SELECT COUNT(*) FROM symbols WHERE qname = 'extra'").fetchone() == (1,)
+        assert db.execute('SELECT COUNT(*) FROM symbols WHERE file_id NOT IN (SELECT id FROM files)').fetchone() == (0,)
+        db.close()
+
+    def test_version_mismatch_rebuilds(self, tmp_path):
+        root = _project(tmp_path)
+        g = _exec_visualize()
+        g['build_index'](str(root))
+        db = sqlite3.connect(str(root / '.claude/pactkit_cache/index.sqlite'))
+        db.execute('PRAGMA user_version = 999')
+        db.close()
+        assert '3 updated' in g['build_index'](str(root))
+
+
+class TestQueries:
+    def test_find_def(self, tmp_path):
+        root = _project(tmp_path)
+        g = _exec_visualize()
+        assert g['find_def'](str(root), 'login') == 'app/auth.py:9-13  method Auth.login'
+        assert g['find_def'](str(root), 'auth.Auth.Token') == 'app/auth.py:5-7  class Auth.Token'
+        assert g['find_def'](str(root), 'api') == 'app/api.py  module app.api'
+        assert g['find_def'](str(root), 'nope').startswith('❌')
+
+    def test_names_match_on_dot_boundaries_without_wildcards(self, tmp_path):
+        root = _project(tmp_path)
+        _write(root, 'app/my_util.py')
+        _write(root, 'app/myXutil.py', 'import app.myXutil.sub\n')
+        g = _exec_visualize()
+        assert g['find_def'](str(root), 'h.Auth.login').startswith('❌')
+        assert g['find_def'](str(root), 'app.auth.Auth.login') == 'app/auth.py:9-13  method Auth.login'
+        assert g['find_def'](str(root), 'my_util') == 'app/my_util.py  module app.my_util'
+        assert g['find_refs'](str(root), 'app.my_util').startswith('❌')  # '_' is not a wildcard
+        assert g['find_refs'](str(root), 'app.myXutil') == 'app/myXutil.py  import app.myXutil.sub'
+
+    def test_find_refs(self, tmp_path):
+        root = _project(tmp_path)
+        g = _exec_visualize()
+        assert g['find_refs'](str(root), 'login').split('\n') == ['app/api.py:6  handler -> auth.login']
+        assert g['find_refs'](str(root), 'app.auth').split('\n') == ['app/api.py  import app.auth']
+        assert g['find_refs'](str(root), 'json').split('\n') == ['app/auth.py  import json']
+
+    def test_callers_resolve_like_the_call_graph(self, tmp_path):
+        root = _project(tmp_path)
+        g = _exec_visualize()
+        assert g['callers'](str(root), 'issue') == 'app/auth.py:13  Auth.login -> Auth.issue'
+        assert g['callers'](str(root), 'handler', depth=2).split('\n') == ['app/api.py:10  route -> handler']
+        assert g['callers'](str(root), 'check') == 'app/auth.py:12  Auth.login -> Auth.login.check'
+        assert g['callers'](str(root), 'route') == 'No callers of route'
+
+    def test_bare_call_elsewhere_is_not_a_caller_of_a_nested_function(self, tmp_path):
+        root = _project(tmp_path)
+        _write(root, 'app/util.py', 'def tidy():\n    check()\n')
+        g = _exec_visualize()
+        assert g['callers'](str(root), 'check') == 'app/auth.py:12  Auth.login -> Auth.login.check'
+        assert g['callers'](str(root), 'Auth').startswith('❌')
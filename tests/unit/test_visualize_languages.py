@@ -0,0 +1,166 @@
+"""Tests for TS/JS, Go and Java import extraction in visualize.py."""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _write(root, rel, body=''):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding='utf-8')
+
+
+def _edges(g, root):
+    all_files, module_index, file_to_node = g['_scan_files'](root)
+    facts = g['_load_facts'](root, all_files, use_cache=False)
+    graph = g['_build_import_graph'](all_files, module_index, file_to_node, facts)
+    rel = [f.relative_to(root).as_posix() for f in graph.files]
+    return {(rel[a], rel[b]) for a, b, _ in graph.edges()}
+
+
+class TestExtractors:
+    def test_js_import_forms(self):
+        g = _exec_visualize()
+        source = (
+            "import React from 'react';\n"
+            "import { a,\n  b } from './ab';\n"
+            "import type { T } from \"./types\";\n"
+            "import './side-effect';\n"
+            "export * from './reexport';\n"
+            "const x = require('./cjs');\n"
+            "const lazy = () => import('./lazy');\n"
+            "// import { gone } from './commented';\n"
+            "/* import old from './old'; */\n"
+            "const s = 'import nothing';\n"
+        )
+        imports = g['_extract_js'](source)['imports']
+        assert imports == ['react', './ab', './types', './side-effect', './reexport', './cjs', './lazy']
+
+    def test_js_comments_and_strings(self):
+        g = _exec_visualize()
+        source = (
+            "foo(); // import x from './old'\n"
+            "const s = 'require(\"./y\")';\n"
+            "const glob = 'src/**/*.js'; import a from './a'; /* import b from './b' */\n"
+            "const url = 'http://example.com'; const z = require('./z');\n"
+        )
+        assert g['_extract_js'](source)['imports'] == ['./a', './z']
+
+    def test_go_import_forms(self):
+        g = _exec_visualize()
+        source = (
+            'package main\n\n'
+            'import "fmt"\n'
+            'import (\n'
+            '\t"example.com/app/store"\n'
+            '\tlog "example.com/app/internal/log" // aliased\n'
+            '\t_ "example.com/app/plugins"\n'
+            ')\n'
+        )
+        imports = g['_extract_go'](source)['imports']
+        assert imports == ['fmt', 'example.com/app/store', 'example.com/app/internal/log', 'example.com/app/plugins']
+
+    def test_go_parenthesis_in_comment_does_not_end_the_block(self):
+        g = _exec_visualize()
+        source = (
+            'package main\n\n'
+            'import (\n'
+            '\t"a/b" // see f()\n'
+            '\t_ "net/http/pprof" // debug (pprof)\n'
+            '\t/* old: "a/d" ) */\n'
+            '\t"a/c"\n'
+            ')\n'
+        )
+        assert g['_extract_go'](source)['imports'] == ['a/b', 'net/http/pprof', 'a/c']
+
+    def test_java_package_and_imports(self):
+        g = _exec_visualize()
+        source = (
+            'package com.acme.web;\n\n'
+            'import java.util.List;\n'
+            'import com.acme.core.*;\n'
+            'import static com.acme.util.Strings.join;\n'
+        )
+        facts = g['_extract_java'](source)
+        assert facts['package'] == 'com.acme.web'
+        assert facts['imports'] == ['java.util.List', 'com.acme.core.*', 'com.acme.util.Strings.join']
+
+    def test_every_profile_extension_is_scanned(self):
+        from pactkit.prompts import LANG_PROFILES
+        g = _exec_visualize()
+        for profile in LANG_PROFILES.values():
+            assert profile['file_ext'] in g['_SOURCE_SUFFIXES']
+
+
+class TestResolution:
+    def test_js_relative_specifiers(self, tmp_path):
+        _write(tmp_path, 'web/app.ts', "import { h } from './lib/helpers';\nimport ui from './ui';\nimport x from 'lodash';\n")
+        _write(tmp_path, 'web/lib/helpers.ts')
+        _write(tmp_path, 'web/ui/index.tsx', "const h = require('../lib/helpers.js');\n")
+        g = _exec_visualize()
+        assert _edges(g, tmp_path) == {
+            ('web/app.ts', 'web/lib/helpers.ts'),
+            ('web/app.ts', 'web/ui/index.tsx'),
+            ('web/ui/index.tsx', 'web/lib/helpers.ts'),
+        }
+
+    def test_go_package_imports_use_module_path(self, tmp_path):
+        _write(tmp_path, 'svc/go.mod', 'module example.com/svc\n\ngo 1.22\n')
+        _write(tmp_path, 'svc/main.go', 'package main\n\nimport (\n\t"fmt"\n\t"example.com/svc/store"\n)\n')
+        _write(tmp_path, 'svc/store/db.go', 'package store\n')
+        _write(tmp_path, 'svc/store/cache.go', 'package store\n')
+        _write(tmp_path, 'svc/store/db_test.go', 'package store\n')
+        g = _exec_visualize()
+        assert _edges(g, tmp_path) == {
+            ('svc/main.go', 'svc/store/cache.go'),
+            ('svc/main.go', 'svc/store/db.go'),
+        }
+
+    def test_java_class_wildcard_and_static_imports(self, tmp_path):
+        base = 'src/main/java/com/acme'
+        _write(tmp_path, f'{base}/web/Api.java',
+               'package com.acme.web;\nimport com.acme.core.Service;\nimport static com.acme.util.Strings.join;\n')
+        _write(tmp_path, f'{base}/web/Admin.java', 'package com.acme.web;\nimport com.acme.core.*;\n')
+        _write(tmp_path, f'{base}/core/Service.java', 'package com.acme.core;\n')
+        _write(tmp_path, f'{base}/core/Repo.java', 'package com.acme.core;\n')
+        _write(tmp_path, f'{base}/util/Strings.java', 'package com.acme.util;\n')
+        g = _exec_visualize()
+        assert _edges(g, tmp_path) == {
+            (f'{base}/web/Api.java', f'{base}/core/Service.java'),
+            (f'{base}/web/Api.java', f'{base}/util/Strings.java'),
+            (f'{base}/web/Admin.java', f'{base}/core/Repo.java'),
+            (f'{base}/web/Admin.java', f'{base}/core/Service.java'),
+        }
+
+    def test_mixed_repo_renders_one_graph(self, tmp_path):
+        _write(tmp_path, 'backend/api.py', 'import backend.models\n')
+        _write(tmp_path, 'backend/models.py')
+        _write(tmp_path, 'frontend/main.js', "import './util.js';\n")
+        _write(tmp_path, 'frontend/util.js')
+        g = _exec_visualize()
+        g['visualize'](str(tmp_path))
+        output = (tmp_path / 'docs/architecture/graphs/code_graph.mmd').read_text()
+        assert 'backend_api_py --> backend_models_py' in output
+        assert 'frontend_main_js --> frontend_util_js' in output
+
+    def test_foreign_facts_are_cached(self, tmp_path):
+        _write(tmp_path, 'a.ts', "import './b';\n")
+        _write(tmp_path, 'b.ts')
+        g = _exec_visualize()
+        g['visualize'](str(tmp_path))
+        calls = []
+        original = g['_extract_js']
+        g['_EXTRACTORS']['.ts'] = lambda source: calls.append(source) or original(source)
+        g['visualize'](str(tmp_path))
+        assert calls == []
@@ -0,0 +1,125 @@
+"""Tests for lazy --focus scanning in visualize.py (parse the neighbourhood, not the repo)."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+bench_dir = project_root / 'tests' / 'benchmarks'
+if str(bench_dir) not in sys.path:
+    sys.path.insert(0, str(bench_dir))
+
+from synthetic import generate_project  # noqa: E402
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _write(root, rel, body=''):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding='utf-8')
+
+
+def _eager_and_lazy(g, root, focus, depth, direction):
+    all_files, module_index, file_to_node = g['_scan_files'](root)
+    facts = g['_load_facts'](root, all_files, use_cache=False)
+    graph = g['_build_import_graph'](all_files, module_index, file_to_node, facts)
+    eager = g['_build_file_graph'](root, graph, focus, depth, direction)
+    lazy_facts, load, _ = g['_fact_loader'](root, use_cache=False)
+    lazy = g['_lazy_file_focus'](root, all_files, module_index, file_to_node, focus, depth, direction, lazy_facts, load)
+    return eager, lazy, lazy_facts
+
+
+def _count_parses(g):
+    parsed = []
+    original = g['_extract_any']
+    g['_extract_any'] = lambda suffix, source, imports_only=False: parsed.append(source) or original(suffix, source, imports_only)
+    return parsed
+
+
+@pytest.fixture(scope='module')
+def synth(tmp_path_factory):
+    root = tmp_path_factory.mktemp('synth')
+    generate_project(root, modules=200, package_size=20)
+    return root
+
+
+class TestMatchesEagerGraph:
+    @pytest.mark.parametrize('direction', ['both', 'in', 'out'])
+    @pytest.mark.parametrize('depth', [1, 2, 3])
+    def test_synthetic_project(self, synth, depth, direction):
+        g = _exec_visualize()
+        eager, lazy, facts = _eager_and_lazy(g, synth, 'pkg5/mod100.py', depth, direction)
+        assert lazy == eager
+        if depth == 1:
+            assert len(facts) < 20
+
+    def test_mixed_languages(self, tmp_path):
+        _write(tmp_path, 'app/core.py', 'X = 1\n')
+        _write(tmp_path, 'app/__init__.py')
+        _write(tmp_path, 'app/cli.py', 'from app import VERSION\n')
+        _write(tmp_path, 'app/api.py', 'import app.core\n')
+        _write(tmp_path, 'app/other.py', 'import json\n')
+        _write(tmp_path, 'web/index.ts', "export const x = 1;\n")
+        _write(tmp_path, 'web/ui/button.ts', "import { x } from '..';\n")
+        _write(tmp_path, 'web/main.ts', "import './index';\n")
+        _write(tmp_path, 'svc/go.mod', 'module example.com/svc\n')
+        _write(tmp_path, 'svc/store/db.go', 'package store\n')
+        _write(tmp_path, 'svc/main.go', 'package main\n\nimport "example.com/svc/store"\n')
+        _write(tmp_path, 'j/com/acme/core/Service.java', 'package com.acme.core;\n')
+        _write(tmp_path, 'j/com/acme/web/Api.java', 'package com.acme.web;\nimport com.acme.core.*;\n')
+        g = _exec_visualize()
+        importers = {'app/core.py': 1, 'app/__init__.py': 1, 'web/index.ts': 2, 'store/db.go': 1, 'Service.java': 1}
+        for focus, count in importers.items():
+            eager, lazy, _ = _eager_and_lazy(g, tmp_path, focus, 1, 'in')
+            assert lazy == eager, focus
+            assert lazy[1].count('-->') == count, focus
+
+    def test_focus_not_found(self, synth):
+        g = _exec_visualize()
+        _, lazy, _ = _eager_and_lazy(g, synth, 'nope.py', 1, 'both')
+        assert lazy[0] is None and 'not found' in lazy[1]
+
+
+class TestParsesOnlyNeighbourhood:
+    def test_file_focus_skips_unrelated_files(self, synth):
+        g = _exec_visualize()
+        parsed = _count_parses(g)
+        msg = g['visualize'](str(synth), focus='pkg5/mod100.py', use_cache=False, jobs=1)
+        assert msg.startswith('✅')
+        assert 0 < len(parsed) < 20
+
+    def test_class_focus_parses_matching_files(self, synth):
+        g = _exec_visualize()
+        parsed = _count_parses(g)
+        g['visualize'](str(synth), focus='pkg5/mod100.py', mode='class', use_cache=False, jobs=1)
+        assert len(parsed) == 1
+        assert 'class C100_0' in (synth / 'docs/architecture/graphs/focus_graph.mmd').read_text()
+
+    def test_stats_report_prefilter(self, synth):
+        g = _exec_visualize()
+        stats = {}
+        g['visualize'](str(synth), focus='pkg5/mod100.py', use_cache=False, jobs=1, stats=stats)
+        assert stats['files']['prefiltered'] > stats['files']['scanned']
+        assert 'byte-searched' in g['_format_stats'](stats)
+
+
+class TestCache:
+    def test_focus_run_keeps_other_entries(self, tmp_path):
+        generate_project(tmp_path, modules=30, package_size=10)
+        g = _exec_visualize()
+        g['visualize'](str(tmp_path))
+        cache = tmp_path / '.claude/pactkit_cache/visualize.json'
+        before = set(json.loads(cache.read_text())['files'])
+        _write(tmp_path, 'src/synth/pkg0/mod0.py', 'import synth.pkg0.mod1\n')
+        g['visualize'](str(tmp_path), focus='pkg0/mod0.py')
+        after = json.loads(cache.read_text())['files']
+        assert set(after) == before
+        assert after['src/synth/pkg0/mod0.py']['facts']['imports'] == ['synth.pkg0.mod1']
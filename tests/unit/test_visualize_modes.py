@@ -217,3 +217,182 @@ class TestCLIParameters:
         import inspect
         sig = inspect.signature(g['visualize'])
         assert sig.parameters['mode'].default == 'file'
+
+
+# ==============================================================================
+# Mode all: single extraction pass writes every graph
+# ==============================================================================
+class TestModeAll:
+    def test_all_writes_three_graphs(self, tmp_path):
+        proj = _create_test_project(tmp_path)
+        g = _exec_visualize()
+        result = g['visualize'](str(proj), mode='all')
+        graphs = proj / 'docs/architecture/graphs'
+        for name in ('code_graph.mmd', 'class_graph.mmd', 'call_graph.mmd'):
+            assert (graphs / name).exists()
+            assert name in result
+
+    def test_all_matches_individual_modes(self, tmp_path):
+        proj = _create_test_project(tmp_path)
+        g = _exec_visualize()
+        graphs = proj / 'docs/architecture/graphs'
+        expected = {}
+        for mode, name in (('file', 'code_graph.mmd'), ('class', 'class_graph.mmd'), ('call', 'call_graph.mmd')):
+            g['visualize'](str(proj), mode=mode, use_cache=False)
+            expected[name] = (graphs / name).read_text()
+            (graphs / name).unlink()
+        g['visualize'](str(proj), mode='all', use_cache=False)
+        for name, content in expected.items():
+            assert (graphs / name).read_text() == content
+
+    def test_all_parses_each_file_once(self, tmp_path):
+        proj = _create_test_project(tmp_path)
+        g = _exec_visualize()
+        calls = []
+        original = g['_extract_source']
+        g['_extract_source'] = lambda source: calls.append(source) or original(source)
+        g['visualize'](str(proj), mode='all', use_cache=False)
+        assert len(calls) == 4
+
+    def test_all_rejects_focus(self, tmp_path):
+        proj = _create_test_project(tmp_path)
+        g = _exec_visualize()
+        result = g['visualize'](str(proj), mode='all', focus='models')
+        assert result.startswith('❌')
+
+
+# ==============================================================================
+# Indexed callee resolution
+# ==============================================================================
+class TestCalleeIndex:
+    def test_index_groups_by_last_component(self):
+        g = _exec_visualize()
+        index = g['_build_callee_index'](['run', 'Dog.speak', 'Animal.speak'])
+        assert index == {'run': ['run'], 'speak': ['Animal.speak', 'Dog.speak']}
+
+    def test_exact_match_wins(self):
+        g = _exec_visualize()
+        names = {'speak', 'Dog.speak'}
+        index = g['_build_callee_index'](names)
+        assert g['_resolve_callee']('speak', names, index) == 'speak'
+
+    def test_suffix_match(self):
+        g = _exec_visualize()
+        names = {'Dog.bark', 'run'}
+        index = g['_build_callee_index'](names)
+        assert g['_resolve_callee']('bark', names, index) == 'Dog.bark'
+        assert g['_resolve_callee']('missing', names, index) is None
+
+    def test_partial_component_is_not_a_match(self):
+        g = _exec_visualize()
+        names = {'Dog.rebark'}
+        index = g['_build_callee_index'](names)
+        assert g['_resolve_callee']('bark', names, index) is None
+
+    def test_ambiguous_resolves_deterministically_and_is_reported(self):
+        g = _exec_visualize()
+        names = {'Dog.speak', 'Animal.speak', 'Cat.speak'}
+        index = g['_build_callee_index'](names)
+        ambiguous = {}
+        assert g['_resolve_callee']('speak', names, index, ambiguous) == 'Animal.speak'
+        assert ambiguous == {'speak': ['Animal.speak', 'Cat.speak', 'Dog.speak']}
+
+    def test_ambiguity_rendered_as_comment(self, tmp_path):
+        proj = _create_test_project(tmp_path)
+        (proj / 'src' / 'talk.py').write_text('def chat():\n    speak()\n', encoding='utf-8')
+        g = _exec_visualize()
+        g['visualize'](str(proj), mode='call')
+        output = (proj / 'docs/architecture/graphs/call_graph.mmd').read_text()
+        assert '%% ambiguous: speak -> Animal.speak, Dog.speak (using Animal.speak)' in output
+        assert 'chat --> Animal_speak' in output
+
+
+class TestScopedCallExtraction:
+    SOURCE = (
+        'import os\n'
+        '\n'
+        '@register(name())\n'
+        'def outer(x=default()):\n'
+        '    setup()\n'
+        '    def inner():\n'
+        '        helper()\n'
+        '    return inner()\n'
+        '\n'
+        'class Shape:\n'
+        '    def area(self):\n'
+        '        def unit():\n'
+        '            return self.scale()\n'
+        '        return unit()\n'
+        '\n'
+        '    class Meta:\n'
+        '        def info(self):\n'
+        '            return self.describe()\n'
+    )
+
+    def _funcs(self):
+        g = _exec_visualize()
+        facts = g['_extract_source'](self.SOURCE)
+        return facts, {qname: (callees, line, lines) for qname, callees, line, lines, _ in facts['funcs']}
+
+    def test_nested_functions_are_qualified(self):
+        _, funcs = self._funcs()
+        assert list(funcs) == ['outer', 'outer.inner', 'Shape.area', 'Shape.area.unit', 'Shape.Meta.info']
+
+    def test_calls_go_to_innermost_function_once(self):
+        _, funcs = self._funcs()
+        assert funcs['outer'][0] == ['setup', 'outer.inner']
+        assert funcs['outer.inner'][0] == ['helper']
+        assert funcs['Shape.area'][0] == ['Shape.area.unit']
+
+    def test_bare_calls_to_nested_functions_use_enclosing_scopes(self):
+        g = _exec_visualize()
+        source = (
+            'def outer():\n'
+            '    if True:\n'
+            '        def helper():\n'
+            '            pass\n'
+            '    def inner():\n'
+            '        helper()\n'
+            '        other()\n'
+            '    class Local:\n'
+            '        def other(self):\n'
+            '            pass\n'
+            '    inner()\n'
+        )
+        funcs = {qname: callees for qname, callees, *_ in g['_extract_source'](source)['funcs']}
+        assert funcs['outer.inner'] == ['outer.helper', 'other']  # methods of a local class are not in scope
+        assert funcs['outer'] == ['outer.inner']
+
+    def test_bare_call_does_not_resolve_to_a_nested_function_elsewhere(self, tmp_path):
+        (tmp_path / 'a.py').write_text('def build():\n    def band():\n        pass\n    band()\n', encoding='utf-8')
+        (tmp_path / 'b.py').write_text('def render():\n    band()\n', encoding='utf-8')
+        g = _exec_visualize()
+        g['visualize'](str(tmp_path), mode='call')
+        output = (tmp_path / 'docs/architecture/graphs/call_graph.mmd').read_text()
+        assert 'build --> build_band' in output
+        assert 'render --> build_band' not in output
+
+    def test_decorators_and_defaults_belong_to_enclosing_scope(self):
+        _, funcs = self._funcs()
+        called = [c for callees, _, _ in funcs.values() for c in callees]
+        assert not {'register', 'name', 'default'} & set(called)
+
+    def test_self_resolves_to_nearest_class(self):
+        _, funcs = self._funcs()
+        assert funcs['Shape.area.unit'][0] == ['Shape.scale']
+        assert funcs['Shape.Meta.info'][0] == ['Meta.describe']
+
+    def test_line_numbers(self):
+        facts, funcs = self._funcs()
+        assert funcs['outer'][1:] == (4, [5, 8])
+        assert funcs['outer.inner'][1:] == (6, [7])
+        assert [(c[0], c[3]) for c in facts['classes']] == [('Shape', 10), ('Meta', 16)]
+
+    def test_nested_function_is_a_call_graph_node(self, tmp_path):
+        (tmp_path / 'mod.py').write_text(self.SOURCE, encoding='utf-8')
+        g = _exec_visualize()
+        g['visualize'](str(tmp_path), mode='call', entry='outer')
+        output = (tmp_path / 'docs/architecture/graphs/call_graph.mmd').read_text()
+        assert 'outer --> outer_inner' in output
+        assert 'outer_inner --> helper' in output
+        assert 'outer --> helper' not in output
@@ -0,0 +1,94 @@
+"""Tests for parallel parsing (--jobs) in visualize.py."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+GRAPHS = ('code_graph.mmd', 'class_graph.mmd', 'call_graph.mmd')
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _deploy_script(tmp_path):
+    """Write the deployable script to disk so it runs as a real __main__."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    script = tmp_path / 'visualize.py'
+    script.write_text(VISUALIZE_SOURCE, encoding='utf-8')
+    return script
+
+
+def _create_project(root, n=24):
+    pkg = root / 'pkg'
+    pkg.mkdir(parents=True)
+    (pkg / '__init__.py').write_text('', encoding='utf-8')
+    for i in range(n):
+        deps = ''.join(f'from pkg.m{j} import f{j}\n' for j in range(max(0, i - 3), i))
+        calls = ''.join(f'    f{j}()\n' for j in range(max(0, i - 3), i))
+        (pkg / f'm{i}.py').write_text(
+            f'{deps}\n'
+            f'class C{i}:\n'
+            f'    def go(self):\n'
+            f'        return self.stop()\n'
+            f'    def stop(self):\n'
+            f'        return {i}\n'
+            f'\n'
+            f'def f{i}():\n'
+            f'{calls or "    pass"}\n',
+            encoding='utf-8'
+        )
+
+
+def _run(script, cwd, *args):
+    out = subprocess.run([sys.executable, str(script), 'visualize', '--mode', 'all', '--no-cache', *args],
+                         cwd=cwd, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    graphs = cwd / 'docs/architecture/graphs'
+    return {name: (graphs / name).read_bytes() for name in GRAPHS}
+
+
+class TestResolveJobs:
+    def test_auto_is_serial_for_small_repos(self):
+        g = _exec_visualize()
+        assert g['_resolve_jobs']('auto', 10) == 1
+
+    def test_auto_uses_cpus_for_large_repos(self):
+        g = _exec_visualize()
+        assert g['_resolve_jobs']('auto', g['_PARALLEL_MIN_FILES']) >= 1
+
+    @pytest.mark.parametrize('value,expected', [('4', 4), (3, 3), ('1', 1), ('0', 1), ('bogus', 1), (None, 1)])
+    def test_explicit_values(self, value, expected):
+        g = _exec_visualize()
+        assert g['_resolve_jobs'](value, 1000) == expected
+
+
+class TestExtractMany:
+    def test_falls_back_to_serial_when_pool_unusable(self):
+        g = _exec_visualize()
+        sources = ['import os\n', 'def f():\n    g()\n', 'class A(B):\n    pass\n']
+        assert g['_extract_many'](sources, jobs=2) == [g['_extract_source'](s) for s in sources]
+
+    def test_empty_input(self):
+        g = _exec_visualize()
+        assert g['_extract_many']([], jobs=4) == []
+
+
+class TestParallelOutputIdentical:
+    def test_jobs_output_byte_identical_to_serial(self, tmp_path):
+        script = _deploy_script(tmp_path)
+        proj = tmp_path / 'proj'
+        _create_project(proj)
+        serial = _run(script, proj, '--jobs', '1')
+        parallel = _run(script, proj, '--jobs', '4')
+        assert serial == parallel
+        assert b'pkg_m3_py --> pkg_m2_py' in serial['code_graph.mmd']
@@ -0,0 +1,128 @@
+"""Tests for `visualize --mode profile` (cProfile/pstats data on the static call graph)."""
+import cProfile
+import importlib
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+WORK = (
+    'def deco(fn):\n'          # 1
+    '    return fn\n'          # 2
+    '\n'                       # 3
+    '\n'                       # 4
+    'def main():\n'            # 5
+    '    heavy()\n'            # 6
+    '    run(light)\n'         # 7
+    '\n'                       # 8
+    '\n'                       # 9
+    '@deco\n'                  # 10
+    'def heavy():\n'           # 11
+    '    light()\n'            # 12
+    '\n'                       # 13
+    '\n'                       # 14
+    'def light():\n'           # 15
+    '    return 1\n'           # 16
+    '\n'                       # 17
+    '\n'                       # 18
+    'def run(cb):\n'           # 19
+    '    return cb()\n'        # 20
+)
+
+
+def _project(tmp_path):
+    pkg = tmp_path / 'app'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('', encoding='utf-8')
+    (pkg / 'work.py').write_text(WORK, encoding='utf-8')
+    return tmp_path
+
+
+def _stat(ct, callers=None, tt=None):
+    return (1, 1, ct if tt is None else tt, ct, callers or {})
+
+
+def _raw(prefix):
+    # What pstats would hold for main() in a checkout at `prefix`
+    f = f'{prefix}/app/work.py'
+    main, heavy, light, run = (f, 5, 'main'), (f, 10, 'heavy'), (f, 15, 'light'), (f, 19, 'run')
+    return {
+        main: _stat(10.0, tt=1.0),
+        heavy: _stat(6.0, {main: (1, 1, 1.0, 6.0)}, tt=1.0),
+        light: _stat(6.0, {heavy: (1, 1, 5.0, 5.0), run: (1, 1, 1.0, 1.0)}, tt=6.0),
+        run: _stat(2.0, {main: (1, 1, 1.0, 2.0)}, tt=1.0),
+        ('~', 0, '<built-in method builtins.len>'): _stat(1.0, {light: (1, 1, 1.0, 1.0)}, tt=1.0),
+    }
+
+
+def _graph(g, root, raw, top=None):
+    all_files, _, _ = g['_scan_files'](root)
+    facts = g['_load_facts'](root, all_files, use_cache=False)
+    return g['_build_profile_graph'](root, all_files, facts, raw, top)[1]
+
+
+class TestMapping:
+    def test_nodes_map_across_checkouts(self, tmp_path):
+        root = _project(tmp_path)
+        g = _exec_visualize()
+        out = _graph(g, root, _raw('/ci/build/other-checkout'))
+        assert '4 of 5 profiled functions mapped' in out
+        assert 'main["main<br/>10.000s (100%)"]' in out
+        assert 'heavy["heavy<br/>6.000s (60%)"]' in out  # decorator line 10 maps to def on line 11
+
+    def test_edges_weighted_and_banded(self, tmp_path):
+        root = _project(tmp_path)
+        g = _exec_visualize()
+        lines = _graph(g, root, _raw('/x')).split('\n')
+        edges = [line.strip() for line in lines if '|' in line and 'linkStyle' not in line]
+        assert edges == ['main -->|6.000s| heavy', 'heavy -->|5.000s| light', 'main -->|2.000s| run',
+                         'run -.->|1.000s| light']
+        assert '    linkStyle 0 stroke:#d62728,stroke-width:4px' in lines
+        assert '    linkStyle 3 stroke:#e6c229,stroke-width:2px' in lines
+
+    def test_top_keeps_hottest_edges(self, tmp_path):
+        root = _project(tmp_path)
+        g = _exec_visualize()
+        out = _graph(g, root, _raw('/x'), top=2)
+        assert 'main -->|6.000s| heavy' in out and 'heavy -->|5.000s| light' in out
+        assert 'run' not in out
+
+
+class TestProfileMode:
+    def test_real_cprofile_dump(self, tmp_path, monkeypatch):
+        root = _project(tmp_path)
+        monkeypatch.syspath_prepend(str(root))
+        work = importlib.import_module('app.work')
+        try:
+            profiler = cProfile.Profile()
+            profiler.runcall(work.main)
+            profiler.dump_stats(str(tmp_path / 'out.pstats'))
+        finally:
+            sys.modules.pop('app.work', None)
+            sys.modules.pop('app', None)
+        g = _exec_visualize()
+        msg = g['visualize'](str(root), mode='profile', pstats_file=str(tmp_path / 'out.pstats'))
+        assert msg.startswith('✅')
+        out = (root / 'docs/architecture/graphs/profile_graph.mmd').read_text()
+        for edge in ('main -->', 'heavy -->', 'run -.->'):
+            assert edge in out
+
+    def test_requires_pstats(self, tmp_path):
+        g = _exec_visualize()
+        assert g['visualize'](str(tmp_path), mode='profile').startswith('❌')
+        assert 'Cannot read profile' in g['visualize'](str(tmp_path), mode='profile', pstats_file=str(tmp_path / 'nope'))
+
+    def test_rejects_focus(self, tmp_path):
+        g = _exec_visualize()
+        assert g['visualize'](str(tmp_path), mode='profile', focus='x', pstats_file='p').startswith('❌')
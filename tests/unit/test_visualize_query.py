@@ -0,0 +1,116 @@
+"""Tests for code_graph.json export and the `visualize query` subcommand."""
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _create_project(tmp_path):
+    """core is imported by a, b and c; a imports core twice."""
+    pkg = tmp_path / 'src' / 'pkg'
+    pkg.mkdir(parents=True)
+    (pkg / '__init__.py').write_text('', encoding='utf-8')
+    (pkg / 'core.py').write_text('', encoding='utf-8')
+    (pkg / 'a.py').write_text('import pkg.core\nfrom pkg.core import x\n', encoding='utf-8')
+    (pkg / 'b.py').write_text('from pkg import core\nimport pkg.core\n', encoding='utf-8')
+    (pkg / 'c.py').write_text('import pkg.core\nimport pkg.a\n', encoding='utf-8')
+    return tmp_path
+
+
+def _graph_json(proj):
+    return json.loads((proj / 'docs/architecture/graphs/code_graph.json').read_text(encoding='utf-8'))
+
+
+class TestJsonExport:
+    def test_file_mode_writes_json_twin(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        data = _graph_json(proj)
+        paths = {n['path'] for n in data['nodes']}
+        assert 'src/pkg/core.py' in paths
+
+    def test_nodes_have_module_and_fan_counts(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        core = next(n for n in _graph_json(proj)['nodes'] if n['path'] == 'src/pkg/core.py')
+        assert core['module'] == 'pkg.core'
+        assert core['fan_in'] == 3
+        assert core['fan_out'] == 0
+
+    def test_edges_carry_import_counts(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        edges = {(e['source'], e['target']): e['count'] for e in _graph_json(proj)['edges']}
+        assert edges[('src_pkg_a_py', 'src_pkg_core_py')] == 2
+
+    def test_mode_all_writes_json(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), mode='all')
+        assert _graph_json(proj)['version'] == 1
+
+    def test_focus_does_not_write_json(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), focus='core.py')
+        assert not (proj / 'docs/architecture/graphs/code_graph.json').exists()
+
+
+class TestQuery:
+    def test_importers(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        result = g['query'](str(proj), importers='pkg.core')
+        assert result.splitlines() == ['src/pkg/a.py', 'src/pkg/b.py', 'src/pkg/c.py']
+
+    def test_imports(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        assert g['query'](str(proj), imports='src/pkg/c.py').splitlines() == ['src/pkg/a.py', 'src/pkg/core.py']
+
+    def test_fan_in_top(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        lines = g['query'](str(proj), fan_in_top=2).splitlines()
+        assert lines == ['src/pkg/core.py | 3', 'src/pkg/__init__.py | 1']
+
+    def test_path_fragment_match(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        assert 'src/pkg/c.py' in g['query'](str(proj), importers='a.py')
+
+    def test_query_does_not_parse_sources(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        g['_extract_source'] = lambda source: (_ for _ in ()).throw(AssertionError('parsed'))
+        g['_scan_files'] = lambda root: (_ for _ in ()).throw(AssertionError('scanned'))
+        assert g['query'](str(proj), importers='pkg.core')
+
+    def test_missing_json(self, tmp_path):
+        g = _exec_visualize()
+        assert g['query'](str(tmp_path), importers='x').startswith('❌')
+
+    def test_unknown_module(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        assert g['query'](str(proj), importers='nothing_here').startswith('❌')
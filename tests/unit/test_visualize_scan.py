@@ -0,0 +1,193 @@
+"""Tests for the pruned file discovery used by visualize.py (_scan_files)."""
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _write(root, rel, body=''):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding='utf-8')
+
+
+def _rels(root, files):
+    return sorted(p.relative_to(root).as_posix() for p in files)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_home(tmp_path_factory, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path_factory.mktemp('home')))
+
+
+class TestPrunedWalk:
+    def test_excluded_dirs_never_entered(self, tmp_path):
+        _write(tmp_path, 'app/main.py')
+        _write(tmp_path, '.venv/lib/site.py')
+        _write(tmp_path, 'node_modules/pkg/deep/x.py')
+        g = _exec_visualize()
+        visited = []
+        original = g['_gitignore_rules']
+        g['_gitignore_rules'] = lambda d, rel: visited.append(rel) or original(d, rel)
+        files = g['_walk_files'](tmp_path, set(g['DEFAULT_EXCLUDES']), ('.py',))
+        assert _rels(tmp_path, files) == ['app/main.py']
+        assert not any(v.startswith(('.venv', 'node_modules')) for v in visited)
+
+    def test_root_path_components_do_not_exclude(self, tmp_path):
+        root = tmp_path / 'build' / 'proj'
+        _write(root, 'pkg/a.py')
+        g = _exec_visualize()
+        all_files, _, _ = g['_scan_files'](root)
+        assert _rels(root, all_files) == ['pkg/a.py']
+
+    def test_output_is_sorted(self, tmp_path):
+        for name in ('z.py', 'a.py', 'm/b.py'):
+            _write(tmp_path, name)
+        g = _exec_visualize()
+        files = g['_walk_files'](tmp_path, set(), ('.py',))
+        assert _rels(tmp_path, files) == [p.relative_to(tmp_path).as_posix() for p in files]
+
+
+class TestGitignore:
+    def test_directory_and_glob_patterns(self, tmp_path):
+        _write(tmp_path, '.gitignore', 'generated/\n*_pb2.py\n# comment\n')
+        _write(tmp_path, 'generated/out.py')
+        _write(tmp_path, 'api/service_pb2.py')
+        _write(tmp_path, 'api/service.py')
+        g = _exec_visualize()
+        assert _rels(tmp_path, g['_walk_files'](tmp_path, set(), ('.py',))) == ['api/service.py']
+
+    def test_anchored_pattern_only_matches_at_root(self, tmp_path):
+        _write(tmp_path, '.gitignore', '/scratch.py\n')
+        _write(tmp_path, 'scratch.py')
+        _write(tmp_path, 'pkg/scratch.py')
+        g = _exec_visualize()
+        assert _rels(tmp_path, g['_walk_files'](tmp_path, set(), ('.py',))) == ['pkg/scratch.py']
+
+    def test_negation(self, tmp_path):
+        _write(tmp_path, '.gitignore', 'gen_*.py\n!gen_keep.py\n')
+        _write(tmp_path, 'gen_a.py')
+        _write(tmp_path, 'gen_keep.py')
+        g = _exec_visualize()
+        assert _rels(tmp_path, g['_walk_files'](tmp_path, set(), ('.py',))) == ['gen_keep.py']
+
+    def test_star_does_not_cross_directories(self, tmp_path):
+        _write(tmp_path, '.gitignore', '/src/*.py\n!src/top.py\n')
+        for rel in ('src/top.py', 'src/other.py', 'src/a/d.py', 'src/a/b/c.py'):
+            _write(tmp_path, rel)
+        g = _exec_visualize()
+        assert _rels(tmp_path, g['_walk_files'](tmp_path, set(), ('.py',))) == ['src/a/b/c.py', 'src/a/d.py', 'src/top.py']
+
+    def test_nested_gitignore_scoped_to_its_directory(self, tmp_path):
+        _write(tmp_path, 'a/.gitignore', 'local.py\n')
+        _write(tmp_path, 'a/local.py')
+        _write(tmp_path, 'b/local.py')
+        g = _exec_visualize()
+        assert _rels(tmp_path, g['_walk_files'](tmp_path, set(), ('.py',))) == ['b/local.py']
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git not available')
+class TestGitFastPath:
+    def _repo(self, root):
+        subprocess.run(['git', 'init', '-q'], cwd=root, check=True)
+        _write(root, '.gitignore', 'ignored/\n')
+        _write(root, 'pkg/tracked.py')
+        _write(root, 'pkg/gone.py')
+        subprocess.run(['git', 'add', '.'], cwd=root, check=True)
+        (root / 'pkg/gone.py').unlink()
+        _write(root, 'pkg/untracked.py')
+        _write(root, 'ignored/skip.py')
+        _write(root, 'tests/test_x.py')
+
+    def test_lists_tracked_and_untracked_only(self, tmp_path):
+        self._repo(tmp_path)
+        g = _exec_visualize()
+        files = g['_git_files'](tmp_path, ('.py',))
+        assert _rels(tmp_path, files) == ['pkg/tracked.py', 'pkg/untracked.py', 'tests/test_x.py']
+
+    def test_excludes_still_apply(self, tmp_path):
+        self._repo(tmp_path)
+        g = _exec_visualize()
+        all_files, _, _ = g['_scan_files'](tmp_path)
+        assert _rels(tmp_path, all_files) == ['pkg/tracked.py', 'pkg/untracked.py']
+
+    def test_walker_agrees_with_git(self, tmp_path):
+        _write(tmp_path, '.gitignore', '\n'.join([
+            '/src/*.py', '!src/top.py', '**/gen/', 'docs/**/*.py', 'tmp?.py', '[ab]x.py', '!bx.py',
+            '**/cache/*.py', 'build/**', 'lib/[!k]*.py', '',
+        ]))
+        _write(tmp_path, 'pkg/.gitignore', 'local.py\n/only_here.py\nsub/*.py\n')
+        for rel in ('src/top.py', 'src/other.py', 'src/a/d.py', 'src/a/b/c.py', 'x/gen/g.py', 'gen/h.py',
+                    'docs/conf.py', 'docs/a/b/ex.py', 'tmp1.py', 'tmp12.py', 'ax.py', 'bx.py', 'cx.py',
+                    'cache/c.py', 'deep/cache/c.py', 'deep/cache/more/c.py', 'build/out.py', 'lib/keep.py',
+                    'lib/lose.py', 'pkg/local.py', 'pkg/deeper/local.py', 'pkg/only_here.py',
+                    'pkg/deeper/only_here.py', 'pkg/sub/s.py', 'pkg/sub/inner/s.py', 'pkg/x/sub/s.py'):
+            _write(tmp_path, rel)
+        subprocess.run(['git', 'init', '-q'], cwd=tmp_path, check=True)
+        g = _exec_visualize()
+        walked = _rels(tmp_path, g['_walk_files'](tmp_path, set(), ('.py',)))
+        assert walked == _rels(tmp_path, g['_git_files'](tmp_path, ('.py',)))
+        assert 'src/a/d.py' in walked and 'src/other.py' not in walked
+
+    def test_not_a_repo_returns_none(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('GIT_CEILING_DIRECTORIES', str(tmp_path.parent))
+        g = _exec_visualize()
+        assert g['_git_files'](tmp_path, ('.py',)) is None
+
+
+class TestConfigExcludes:
+    def test_block_list(self, tmp_path):
+        _write(tmp_path, '.claude/pactkit.yaml', 'stack: auto\nvisualize:\n  exclude:\n    - vendor\n    - "third_party"\nrules:\n  - x\n')
+        g = _exec_visualize()
+        assert g['_config_excludes'](tmp_path) == {'vendor', 'third_party'}
+
+    def test_flow_list(self, tmp_path):
+        _write(tmp_path, '.claude/pactkit.yaml', "visualize:\n  exclude: [vendor, 'gen']\n")
+        g = _exec_visualize()
+        assert g['_config_excludes'](tmp_path) == {'vendor', 'gen'}
+
+    def test_comments_are_stripped(self, tmp_path):
+        _write(tmp_path, '.claude/pactkit.yaml',
+               'visualize:\n  # what to skip\n  exclude:  # dirs\n    - gen  # generated\n    # - old\n    - c#lib\n')
+        g = _exec_visualize()
+        assert g['_config_excludes'](tmp_path) == {'gen', 'c#lib'}
+        _write(tmp_path, '.claude/pactkit.yaml', "visualize:\n  exclude: [vendor, 'gen']  # flow list\n")
+        assert g['_config_excludes'](tmp_path) == {'vendor', 'gen'}
+
+    def test_missing_section_uses_defaults(self, tmp_path):
+        _write(tmp_path, '.claude/pactkit.yaml', 'stack: auto\n')
+        g = _exec_visualize()
+        assert g['_config_excludes'](tmp_path) is None
+
+    def test_config_replaces_default_list(self, tmp_path):
+        _write(tmp_path, '.claude/pactkit.yaml', 'visualize:\n  exclude:\n    - vendor\n')
+        _write(tmp_path, 'vendor/lib.py')
+        _write(tmp_path, 'build/gen.py')
+        g = _exec_visualize()
+        all_files, _, _ = g['_scan_files'](tmp_path)
+        assert _rels(tmp_path, all_files) == ['build/gen.py']
+
+    def test_generated_default_yaml_is_understood(self, tmp_path):
+        from pactkit.config import DEFAULT_VISUALIZE_EXCLUDE, generate_default_yaml
+        _write(tmp_path, '.claude/pactkit.yaml', generate_default_yaml())
+        g = _exec_visualize()
+        assert g['_config_excludes'](tmp_path) == set(DEFAULT_VISUALIZE_EXCLUDE)
+
+    def test_script_defaults_match_config_defaults(self):
+        from pactkit.config import DEFAULT_VISUALIZE_EXCLUDE
+        g = _exec_visualize()
+        assert set(g['DEFAULT_EXCLUDES']) == set(DEFAULT_VISUALIZE_EXCLUDE)
@@ -0,0 +1,121 @@
+"""Tests for `visualize --stats` / `--stats-json`."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _create_project(tmp_path):
+    (tmp_path / 'a.py').write_text('import b\nimport b\n\nclass A:\n    def run(self):\n        pass\n', encoding='utf-8')
+    (tmp_path / 'b.py').write_text('def helper():\n    pass\n', encoding='utf-8')
+    (tmp_path / 'broken.py').write_text('def broken(:\n', encoding='utf-8')
+    (tmp_path / 'binary.py').write_bytes(b'\xff\xfe\x00')
+    return tmp_path
+
+
+class TestStats:
+    def test_phases_and_counters(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        stats = {}
+        g['visualize'](str(proj), mode='all', stats=stats)
+        assert set(stats['phases']) >= {'discovery', 'read', 'parse', 'resolve', 'render', 'total'}
+        assert stats['files']['scanned'] == 4
+        assert stats['files']['cache_misses'] == 4
+        assert stats['graph'] == {'nodes': 4, 'edges': 1, 'imports': 2, 'classes': 1, 'functions': 2}
+        assert stats['peak_rss_bytes'] > 0
+        assert stats['peak_memory_bytes'] is None  # tracemalloc is opt-in
+
+    def test_trace_memory_is_opt_in(self, tmp_path):
+        import tracemalloc
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        traced = []
+        original = tracemalloc.start
+        tracemalloc.start = lambda *a: traced.append(True) or original(*a)
+        try:
+            g['visualize'](str(proj), mode='all', stats={})
+            assert traced == []
+            stats = {}
+            g['visualize'](str(proj), mode='all', stats=stats, trace_memory=True)
+        finally:
+            tracemalloc.start = original
+        assert traced == [True] and stats['peak_memory_bytes'] > 0
+        assert not tracemalloc.is_tracing()
+        assert 'Peak memory (tracemalloc' in g['_format_stats'](stats)
+
+    def test_parse_failures_are_reported_with_paths(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        stats = {}
+        g['visualize'](str(proj), mode='all', stats=stats)
+        failures = {f['path']: f['error'] for f in stats['parse_failures']}
+        assert failures['broken.py'].startswith('SyntaxError')
+        assert failures['binary.py'].startswith('UnicodeDecodeError')
+        assert stats['files']['parse_failures'] == 2
+
+    def test_file_mode_reports_broken_import_statements(self, tmp_path):
+        # File mode parses import statements only, so errors elsewhere need --mode all
+        proj = _create_project(tmp_path)
+        (proj / 'bad_import.py').write_text('from a import (b,\n', encoding='utf-8')
+        g = _exec_visualize()
+        stats = {}
+        g['visualize'](str(proj), stats=stats)
+        failures = {f['path']: f['error'] for f in stats['parse_failures']}
+        assert set(failures) == {'bad_import.py', 'binary.py'}
+
+    def test_cached_run_counts_hits_and_keeps_failures(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj), mode='all')
+        stats = {}
+        g['visualize'](str(proj), mode='all', stats=stats)
+        assert stats['files']['cache_hits'] == 4
+        assert stats['files']['cache_misses'] == 0
+        assert stats['files']['parse_failures'] == 2
+
+    def test_no_stats_by_default(self, tmp_path):
+        import tracemalloc
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        g['visualize'](str(proj))
+        assert not tracemalloc.is_tracing()
+
+    def test_format_lists_failures(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        stats = {}
+        g['visualize'](str(proj), mode='all', stats=stats)
+        text = g['_format_stats'](stats)
+        assert '| parse |' in text
+        assert 'Cache: 0 hits, 4 misses' in text
+        assert '  - broken.py: SyntaxError' in text
+        assert 'Peak RSS: ' in text and 'tracemalloc' not in text
+
+
+class TestStatsCli:
+    def test_stats_json_file(self, tmp_path):
+        from pactkit.prompts import VISUALIZE_SOURCE
+        script = tmp_path / 'visualize.py'
+        script.write_text(VISUALIZE_SOURCE, encoding='utf-8')
+        (tmp_path / 'proj').mkdir()
+        proj = _create_project(tmp_path / 'proj')
+        out = tmp_path / 'stats.json'
+        result = subprocess.run([sys.executable, str(script), 'visualize', '--stats', '--stats-json', str(out)],
+                                cwd=proj, capture_output=True, text=True)
+        assert result.returncode == 0
+        assert '📊 Visualize stats' in result.stdout
+        data = json.loads(out.read_text())
+        assert data['files']['scanned'] == 4
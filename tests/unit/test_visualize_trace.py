@@ -0,0 +1,121 @@
+"""Tests for reverse and depth-bounded call tracing (--entry / --callers / --max-depth)."""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _create_project(tmp_path):
+    """main -> handle -> validate -> check; api -> handle; cron -> validate."""
+    (tmp_path / 'app.py').write_text(
+        'def main():\n'
+        '    handle()\n'
+        '    handle()\n'
+        '\n'
+        'def api():\n'
+        '    handle()\n'
+        '\n'
+        'def cron():\n'
+        '    validate()\n'
+        '\n'
+        'def handle():\n'
+        '    validate()\n'
+        '    print("done")\n'
+        '\n'
+        'def validate():\n'
+        '    check()\n'
+        '\n'
+        'def check():\n'
+        '    pass\n',
+        encoding='utf-8'
+    )
+    return tmp_path
+
+
+def _trace(g, proj, entry, **kw):
+    g['visualize'](str(proj), mode='call', entry=entry, **kw)
+    return (proj / 'docs/architecture/graphs/call_graph.mmd').read_text()
+
+
+class TestForwardTrace:
+    def test_forward_reaches_leaves(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, 'main')
+        assert 'validate --> check' in output
+        assert 'handle --> print' in output
+
+    def test_duplicate_calls_render_one_edge(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, 'main')
+        assert output.count('main --> handle') == 1
+
+    def test_max_depth_bounds_forward_walk(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, 'main', max_depth=1)
+        assert 'main --> handle' in output
+        assert 'validate' not in output
+
+    def test_output_is_deterministic(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        first = _trace(g, proj, 'main')
+        assert first == _trace(g, proj, 'main')
+        assert first.splitlines()[1] == '    main["main"]'
+
+
+class TestCallersTrace:
+    def test_callers_walks_reverse_edges(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, 'validate', callers=True)
+        for edge in ('handle --> validate', 'cron --> validate', 'main --> handle', 'api --> handle'):
+            assert edge in output
+        assert 'check' not in output
+
+    def test_callers_with_max_depth(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, 'validate', callers=True, max_depth=1)
+        assert 'handle --> validate' in output
+        assert 'main' not in output
+
+    def test_callers_of_unregistered_callee(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, 'print', callers=True)
+        assert 'handle --> print' in output
+
+
+class TestMultipleEntries:
+    def test_entries_share_visited_set(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, ['main', 'cron'])
+        assert 'main --> handle' in output
+        assert 'cron --> validate' in output
+        assert output.count('validate["validate"]') == 1
+
+    def test_missing_entry_noted(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, ['main', 'nowhere'])
+        assert '%% entry not found: nowhere' in output
+
+    def test_all_missing_reports_not_found(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        output = _trace(g, proj, ['nowhere'])
+        assert 'not found' in output
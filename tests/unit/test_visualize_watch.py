@@ -0,0 +1,155 @@
+"""Tests for the `visualize watch` polling daemon."""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+PIDFILE = '.claude/pactkit_cache/visualize_watch.pid'
+
+
+def _exec_visualize():
+    """Load VISUALIZE_SOURCE into exec globals and return the namespace."""
+    from pactkit.prompts import VISUALIZE_SOURCE
+    g = {}
+    exec(VISUALIZE_SOURCE, g)
+    return g
+
+
+def _create_project(tmp_path):
+    (tmp_path / 'a.py').write_text('import b\n', encoding='utf-8')
+    (tmp_path / 'b.py').write_text('class B:\n    pass\n', encoding='utf-8')
+    return tmp_path
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _start(g, proj, **kw):
+    result = {}
+    t = threading.Thread(target=lambda: result.setdefault('msg', g['watch'](str(proj), interval=0.02, **kw)))
+    t.start()
+    assert _wait_for(lambda: (proj / PIDFILE).exists())
+    return t, result
+
+
+def _bump(path, body):
+    path.write_text(body, encoding='utf-8')
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestWatchLifecycle:
+    def test_initial_render_and_stop_on_pidfile_removal(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        t, result = _start(g, proj)
+        graphs = proj / 'docs/architecture/graphs'
+        assert _wait_for(lambda: (graphs / 'call_graph.mmd').exists())
+        assert (graphs / 'code_graph.mmd').exists()
+        assert (graphs / 'class_graph.mmd').exists()
+        (proj / PIDFILE).unlink()
+        t.join(timeout=5)
+        assert not t.is_alive()
+        assert result['msg'] == '✅ Watch stopped'
+
+    def test_max_cycles_removes_own_pidfile(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        assert g['watch'](str(proj), interval=0, max_cycles=2) == '✅ Watch stopped'
+        assert not (proj / PIDFILE).exists()
+
+    def test_refuses_second_live_watcher(self, tmp_path):
+        proj = _create_project(tmp_path)
+        (proj / PIDFILE).parent.mkdir(parents=True)
+        (proj / PIDFILE).write_text(str(os.getppid()), encoding='utf-8')
+        g = _exec_visualize()
+        assert g['watch'](str(proj), max_cycles=1).startswith('❌')
+
+    def test_stale_pidfile_is_replaced(self, tmp_path):
+        proj = _create_project(tmp_path)
+        (proj / PIDFILE).parent.mkdir(parents=True)
+        (proj / PIDFILE).write_text('not-a-pid', encoding='utf-8')
+        g = _exec_visualize()
+        assert g['watch'](str(proj), interval=0, max_cycles=1) == '✅ Watch stopped'
+
+    def test_watch_stop(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        assert g['watch_stop'](str(proj)).startswith('⚠️')
+        t, _ = _start(g, proj)
+        assert g['watch_stop'](str(proj)) == '✅ Watch stop requested'
+        t.join(timeout=5)
+        assert not t.is_alive()
+
+
+class TestWatchIncremental:
+    def test_changed_file_updates_graph(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        t, _ = _start(g, proj, mode='class')
+        class_graph = proj / 'docs/architecture/graphs/class_graph.mmd'
+        try:
+            assert _wait_for(class_graph.exists)
+            _bump(proj / 'b.py', 'class B:\n    pass\n\nclass C(B):\n    pass\n')
+            assert _wait_for(lambda: 'B <|-- C' in class_graph.read_text())
+        finally:
+            g['watch_stop'](str(proj))
+            t.join(timeout=5)
+
+    def test_new_file_picked_up(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        t, _ = _start(g, proj, mode='file')
+        code_graph = proj / 'docs/architecture/graphs/code_graph.mmd'
+        try:
+            assert _wait_for(code_graph.exists)
+            (proj / 'c.py').write_text('import a\n', encoding='utf-8')
+            assert _wait_for(lambda: 'c_py --> a_py' in code_graph.read_text())
+        finally:
+            g['watch_stop'](str(proj))
+            t.join(timeout=5)
+
+    def test_only_changed_files_reparsed(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        parsed = []
+        original = g['_extract_imports']
+        g['_extract_imports'] = lambda source: parsed.append(source) or original(source)
+        t, _ = _start(g, proj, mode='file')
+        code_graph = proj / 'docs/architecture/graphs/code_graph.mmd'
+        try:
+            assert _wait_for(code_graph.exists)
+            parsed.clear()
+            _bump(proj / 'a.py', 'import b\nimport os\n')
+            assert _wait_for(lambda: len(parsed) == 1)
+            time.sleep(0.1)
+            assert parsed == ['import b\nimport os\n']
+        finally:
+            g['watch_stop'](str(proj))
+            t.join(timeout=5)
+
+    def test_unaffected_graph_not_rewritten(self, tmp_path):
+        proj = _create_project(tmp_path)
+        g = _exec_visualize()
+        t, _ = _start(g, proj)
+        graphs = proj / 'docs/architecture/graphs'
+        try:
+            assert _wait_for(lambda: (graphs / 'call_graph.mmd').exists())
+            before = (graphs / 'code_graph.mmd').stat().st_mtime_ns
+            _bump(proj / 'b.py', 'class B:\n    def go(self):\n        pass\n')
+            assert _wait_for(lambda: 'go' in (graphs / 'class_graph.mmd').read_text())
+            assert (graphs / 'code_graph.mmd').stat().st_mtime_ns == before
+        finally:
+            g['watch_stop'](str(proj))
+            t.join(timeout=5)